@@ -1,4 +1,12 @@
-from typing import Dict
+from typing import Dict, List, Optional
+import json
+import re
+
+
+class InvalidAnswerError(ValueError):
+    """
+    Raised when a generated answer fails AnswerGenerationAgent.validate_answer.
+    """
 
 
 class AnswerGenerationAgent:
@@ -9,20 +17,41 @@ class AnswerGenerationAgent:
 
     This agent is the ONLY place where the LLM is invoked
     for FAQ answer generation.
+
+    Questions can be answered one per call (`generate_answer`) or
+    several per call (`generate_answers_batch`), which sends the
+    product data once for the whole batch.
+
+    Prompt layout: the per-product invariant part (instructions, rules,
+    product data) is sent as a stable `system` prefix so the provider
+    can cache it; only the question-specific tail varies between calls.
+
+    Every answer is checked by `validate_answer` as soon as it comes
+    back, so a bad answer fails only its own question.
     """
 
+    # Output budget per answer in batched calls
+    BATCH_TOKENS_PER_ANSWER = 120
+
+    # Answer length bounds (characters); the prompt asks for 1-2 sentences,
+    # but a correct answer can be as short as "It costs ₹699."
+    MIN_ANSWER_CHARS = 3
+    MAX_ANSWER_CHARS = 1200
+
     def __init__(self, llm_client):
         """
         Parameters
         ----------
         llm_client : object
             Predefined LLM client already available in the system.
-            Must expose a `generate(prompt: str) -> str` method.
+            Must expose a `generate(prompt: str, system: str,
+            cache_if: Callable) -> str` method. Batched mode also passes
+            `max_tokens=<int>`.
         """
         self.llm = llm_client
 
     def generate_answer(self, product: Dict, category: str, question: str, supporting_context: Dict, 
-                        prompt_template: str = "faq_answer_v1",) -> Dict:
+                        prompt_template: str = "faq_answer_v1", refresh: bool = False,) -> Dict:
         """
         Generate an answer for a single FAQ question.
 
@@ -38,6 +67,9 @@ class AnswerGenerationAgent:
             Output from relevant content logic blocks
         prompt_template : str
             Prompt template identifier
+        refresh : bool
+            Ask the provider again instead of serving a cached response
+            (used when re-requesting a rejected answer)
 
         Returns
         -------
@@ -46,35 +78,154 @@ class AnswerGenerationAgent:
                 "question": <question>,
                 "answer": <generated_answer>
             }
+
+        Raises InvalidAnswerError if the answer fails validate_answer.
         """
-        prompt = self._build_prompt(product=product, category=category, question=question,
+        prompt = self._build_prompt(category=category, question=question,
                                     supporting_context=supporting_context,prompt_template=prompt_template,)
 
-        answer_text = self.llm.generate(prompt)
+        options = {"refresh_cache": True} if refresh else {}
+        answer_text = self.llm.generate(
+            prompt,
+            system=self._build_prefix(product),
+            # A rejected answer is not cached, so later runs ask again
+            cache_if=lambda text: self.validate_answer(category, self._postprocess_answer(text)) is None,
+            **options
+        )
+
+        answer = self._postprocess_answer(answer_text)
+        problem = self.validate_answer(category, answer)
+        if problem:
+            raise InvalidAnswerError(f"Invalid answer to '{question}': {problem}")
 
         return {
             "question": question,
-            "answer": self._postprocess_answer(answer_text),
+            "answer": answer,
         }
 
+    def validate_answer(self, category: str, answer: str) -> Optional[str]:
+        """
+        Returns why an answer is unusable, or None if it is fine:
+        - empty, or outside MIN/MAX_ANSWER_CHARS
+        - starts with its category as a label (e.g. "Safety: ..."),
+          which the prompt forbids
+        """
+        if not answer:
+            return "empty answer"
+
+        if len(answer) < self.MIN_ANSWER_CHARS:
+            return f"too short ({len(answer)} chars)"
+
+        if len(answer) > self.MAX_ANSWER_CHARS:
+            return f"too long ({len(answer)} chars)"
+
+        if re.match(rf"\s*{re.escape(category)}\s*:", answer, re.IGNORECASE):
+            return "starts with its category label"
+
+        return None
+
+    def generate_answers_batch(self, product: Dict, items: List[Dict],
+                               prompt_template: str = "faq_answer_batch_v1",) -> Dict:
+        """
+        Answer several FAQ questions with a single structured-output call.
+
+        Parameters
+        ----------
+        product : Dict
+            Normalized product data
+        items : List[Dict]
+            [{ "id": str, "category": str, "question": str,
+               "supporting_context": Dict }]
+        prompt_template : str
+            Prompt template identifier
+
+        Returns
+        -------
+        Dict
+            {
+                "answers": { <id>: {"question": ..., "answer": ...} },
+                "errors": { <id>: <exception> }
+            }
+
+        Questions the batched response skipped or answered invalidly
+        (including answers failing validate_answer) fall back to
+        individual `generate_answer` calls. Their errors are returned as
+        exceptions, so callers can tell fatal errors from retryable ones.
+        """
+        answers = {}
+        errors = {}
+
+        categories = {item["id"]: item["category"] for item in items}
+
+        try:
+            prompt = self._build_batch_prompt(items=items, prompt_template=prompt_template,)
+            raw = self.llm.generate(
+                prompt,
+                system=self._build_prefix(product),
+                max_tokens=self.BATCH_TOKENS_PER_ANSWER * len(items),
+                # A batch with any unusable item is not cached, so the
+                # next run asks again instead of replaying the gaps
+                cache_if=lambda text: len(self._parse_batch_answers(text, categories)) == len(items)
+            )
+            batch_answers = self._parse_batch_answers(raw, categories)
+        except Exception:
+            # Whole batch failed; every item goes through the fallback path
+            batch_answers = {}
+
+        for item in items:
+            if item["id"] in batch_answers:
+                answers[item["id"]] = {
+                    "question": item["question"],
+                    "answer": batch_answers[item["id"]],
+                }
+                continue
+
+            try:
+                answers[item["id"]] = self.generate_answer(
+                    product=product,
+                    category=item["category"],
+                    question=item["question"],
+                    supporting_context=item["supporting_context"],
+                )
+            except Exception as e:
+                errors[item["id"]] = e
+
+        return {"answers": answers, "errors": errors}
+
     # -------------------------
     # Internal Helpers
     # -------------------------
 
-    def _build_prompt(self, product: Dict, category: str, question: str, supporting_context: Dict, prompt_template: str,) -> str:
+    def _build_prefix(self, product: Dict) -> str:
         """
-        Builds a deterministic prompt for the LLM.
+        Builds the stable, cacheable prompt prefix for one product.
+        Must not depend on the question, so every call for the same
+        product shares it byte for byte.
         """
 
-        if prompt_template != "faq_answer_v1":
-            raise ValueError(f"Unknown prompt template: {prompt_template}")
-
         return f"""
-                You are generating an FAQ answer for a skincare product.
+                You are generating FAQ answers for a skincare product.
+
+                Rules:
+                - Use ONLY the provided product data
+                - Do NOT add external facts
+                - Answer in 1 to 2 clear sentences
+                - Be specific to the question
+                - Do NOT mention the category explicitly
 
                 Product data:
-                {product}
+                {json.dumps(product, ensure_ascii=False, indent=2, sort_keys=True)}
+                """.strip()
+
+    def _build_prompt(self, category: str, question: str, supporting_context: Dict, prompt_template: str,) -> str:
+        """
+        Builds the question-specific prompt tail for the LLM.
+        """
 
+        if prompt_template != "faq_answer_v1":
+            raise ValueError(f"Unknown prompt template: {prompt_template}")
+
+        return f"""
                 Additional context:
                 {supporting_context}
 
@@ -83,15 +234,79 @@ class AnswerGenerationAgent:
 
                 Question:
                 {question}
+                """.strip()
 
-                Rules:
-                - Use ONLY the provided product data
-                - Do NOT add external facts
-                - Answer in 1 to 2 clear sentences
-                - Be specific to the question
-                - Do NOT mention the category explicitly
+    def _build_batch_prompt(self, items: List[Dict], prompt_template: str,) -> str:
+        """
+        Builds a deterministic multi-question prompt tail.
+        Context is listed once per category, not once per question.
+        """
+
+        if prompt_template != "faq_answer_batch_v1":
+            raise ValueError(f"Unknown prompt template: {prompt_template}")
+
+        context_by_category = {}
+        for item in items:
+            context_by_category.setdefault(item["category"], item["supporting_context"])
+
+        questions = [
+            {"id": item["id"], "category": item["category"], "question": item["question"]}
+            for item in items
+        ]
+
+        return f"""
+                Additional context by category:
+                {context_by_category}
+
+                Questions:
+                {json.dumps(questions, ensure_ascii=False, indent=2)}
+
+                Answer EVERY question exactly once.
+                Output STRICT JSON only, an array in this format:
+                [{{"id": "<question id>", "answer": "<answer>"}}]
                 """.strip()
 
+    def _parse_batch_answers(self, raw: str, categories: Dict[str, str]) -> Dict[str, str]:
+        """
+        Extracts {id: answer} from a batched response (`categories`
+        maps each expected id to its category). Unknown ids and answers
+        failing validate_answer are dropped so they fall back.
+        """
+        if not raw:
+            return {}
+
+        # Tolerate prose or code fences around the JSON array
+        start = raw.find("[")
+        end = raw.rfind("]")
+        if start == -1 or end <= start:
+            return {}
+
+        try:
+            parsed = json.loads(raw[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+        if not isinstance(parsed, list):
+            return {}
+
+        answers = {}
+
+        for entry in parsed:
+            if not isinstance(entry, dict):
+                continue
+
+            item_id = str(entry.get("id"))
+            answer = entry.get("answer")
+
+            if item_id not in categories or item_id in answers or not isinstance(answer, str):
+                continue
+
+            answer = self._postprocess_answer(answer)
+            if self.validate_answer(categories[item_id], answer) is None:
+                answers[item_id] = answer
+
+        return answers
+
     def _postprocess_answer(self, answer: str) -> str:
         """
         Cleans and normalizes LLM output.
@@ -1,7 +1,12 @@
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import threading
 
+from llm.circuit_breaker import CircuitOpenError
 from llm.comparison_llm import ComparisonClient
+from llm.retry import is_retryable
 from logic_blocks.comparison_block import (
+    COMPARISON_SYSTEM_PROMPT,
     build_field_comparison_prompt,
     build_overall_summary_prompt
 )
@@ -14,6 +19,15 @@ class ComparisonAgent:
     - Field-wise LLM comparisons with verdicts
     - One final overall LLM summary
 
+    The field verdicts and the summary have no data dependency on
+    each other, so all LLM calls are dispatched concurrently.
+
+    If the provider is unavailable (circuit open, or transient errors
+    that outlasted the client's retries) a section falls back to
+    deterministic content: the raw field values with NEUTRAL_VERDICT,
+    or a templated summary. Such sections are listed in
+    `fallback_sections` so they are not reused on later runs.
+
     IMPORTANT:
     This agent assumes BOTH products are already normalized
     by ParserAgent.
@@ -27,14 +41,40 @@ class ComparisonAgent:
         "side_effects_comparison": "side_effects"
     }
 
-    def __init__(self):
+    # Normalized fields (of both products) each LLM section depends on
+    SECTION_FIELDS = {
+        **{section: ("name", field) for section, field in LLM_FIELDS.items()},
+        "summary": None,  # the whole product
+    }
+
+    NEUTRAL_VERDICT = (
+        "An automated verdict is not available; compare the listed values directly."
+    )
+
+    def __init__(self, max_workers: int = 6):
+        """
+        max_workers: cap on concurrent LLM calls (1 = sequential).
+        """
         self.llm = ComparisonClient()
+        self.max_workers = max(1, max_workers)
+
+        # Sections of the last compare() built from fallback content
+        self.fallback_sections = []
+        self._fallback_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def compare(self, product_a: Dict, product_b: Dict) -> Dict:
+    def compare(self, product_a: Dict, product_b: Dict, reuse: Optional[Dict] = None) -> Dict:
+        """
+        reuse: previously generated sections ({section_name: value},
+        including "summary") whose inputs are unchanged. These are
+        returned as-is instead of calling the LLM.
+        """
+        reuse = reuse or {}
+        self.fallback_sections = []
+
         name_a = product_a.get("name")
         name_b = product_b.get("name")
 
@@ -51,19 +91,38 @@ class ComparisonAgent:
             "price_comparison": self._compare_price(product_a, product_b)
         }
 
-        # Field-wise LLM comparisons
-        for section_name, field in self.LLM_FIELDS.items():
-            output[section_name] = self._compare_field(
-                section_name=section_name,
-                field=field,
-                product_a=product_a,
-                product_b=product_b
-            )
-
-        # Overall summary
-        output["summary"] = self._generate_overall_summary(
-            product_a, product_b
-        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Field-wise LLM comparisons
+            field_futures = {
+                section_name: pool.submit(
+                    self._compare_field,
+                    section_name=section_name,
+                    field=field,
+                    product_a=product_a,
+                    product_b=product_b
+                )
+                for section_name, field in self.LLM_FIELDS.items()
+                if section_name not in reuse
+            }
+
+            # Overall summary (depends only on the products)
+            summary_future = None
+            if "summary" not in reuse:
+                summary_future = pool.submit(
+                    self._generate_overall_summary, product_a, product_b
+                )
+
+            # Assemble in LLM_FIELDS order regardless of completion order
+            for section_name in self.LLM_FIELDS:
+                if section_name in reuse:
+                    output[section_name] = reuse[section_name]
+                else:
+                    output[section_name] = field_futures[section_name].result()
+
+            if summary_future is None:
+                output["summary"] = reuse["summary"]
+            else:
+                output["summary"] = summary_future.result()
 
         return output
 
@@ -129,7 +188,7 @@ class ComparisonAgent:
             values_b=values_b
         )
 
-        verdict = self.llm.generate(prompt)
+        verdict = self._generate(section_name, prompt, fallback=self.NEUTRAL_VERDICT)
 
         return {
             name_a: values_a,
@@ -150,4 +209,28 @@ class ComparisonAgent:
             product_a, product_b
         )
 
-        return self.llm.generate(prompt)
+        fallback = (
+            f"{product_a['name']} and {product_b['name']} are compared above "
+            f"on price, ingredients, benefits, skin type, usage and side effects."
+        )
+
+        return self._generate("summary", prompt, fallback=fallback)
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _generate(self, section_name: str, prompt: str, fallback: str) -> str:
+        """
+        LLM call for one section, or `fallback` if the provider is
+        unavailable. Other errors (bad request, auth) still raise.
+        """
+        try:
+            return self.llm.generate(prompt, system=COMPARISON_SYSTEM_PROMPT)
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError) and not is_retryable(e):
+                raise
+
+        with self._fallback_lock:
+            self.fallback_sections.append(section_name)
+        return fallback
@@ -12,6 +12,19 @@ class ContentLogicAgent:
     - ONLY returns structured facts
     """
 
+    # Normalized product fields (ParserAgent._normalize) each FAQ category
+    # depends on. Answers name the product, so every category includes
+    # "name". Used to decide which answers need regenerating when a
+    # product changes (see utils/generation_manifest.py).
+    CATEGORY_FIELDS = {
+        "informational": ("name", "benefits", "skin_type", "concentration"),
+        "usage": ("name", "usage"),
+        "safety": ("name", "side_effects", "skin_type"),
+        "ingredients": ("name", "ingredients", "concentration"),
+        "pricing": ("name", "price"),
+        "comparison": ("name", "price", "ingredients", "benefits"),
+    }
+
     def build_context(self, product_data: Dict, category: str) -> Dict:
         """
         Build supporting factual context for a given FAQ category.
@@ -1,8 +1,31 @@
 import json
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from typing import Dict, List
 
+from utils.catalog_stream import CatalogRecord
+
+
+@dataclass
+class ParsedRecord:
+    """
+    Outcome of parsing one feed record (see ParserAgent.parse_stream).
+    """
+    index: int
+    product_id: str
+    raw: Any = None
+    product: Optional[Dict] = None  # normalized, None on error
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Errors a malformed record can raise during normalization
+RECORD_ERRORS = (ValueError, TypeError, AttributeError, OverflowError)
+
 
 class ParserAgent:
     """
@@ -31,6 +54,57 @@ class ParserAgent:
         self._validate(raw_data)
         return self._normalize(raw_data)
 
+    def parse_batch(self, raw_records: Sequence[Dict]) -> List[Dict]:
+        """
+        Bulk entry point: [parse(r) for r in raw_records], raising what
+        parse() raises for the first bad record.
+
+        Records are normalized one at a time. A column-wise kernel
+        measured 0.7x-1.3x of this (benchmarks/bench_normalize.py), too
+        little for a second normalization path.
+        """
+        return [self.parse(record) for record in raw_records]
+
+    def parse_stream(self, records: Iterable) -> Iterator[ParsedRecord]:
+        """
+        Normalizes a stream of records lazily, one at a time.
+
+        `records` may hold raw dicts or CatalogRecords from
+        utils/catalog_stream.py. A bad record never stops the stream:
+        it is yielded with `error` set and `product` None.
+        """
+        for position, record in enumerate(records):
+            if isinstance(record, CatalogRecord):
+                index, data, error = record.index, record.data, record.error
+            else:
+                index, data, error = position, record, None
+
+            product = None
+            if error is None:
+                if not isinstance(data, dict):
+                    error = f"Record is not an object: {type(data).__name__}"
+                else:
+                    try:
+                        product = self.parse(data)
+                    except RECORD_ERRORS as e:
+                        error = f"{type(e).__name__}: {e}"
+
+            yield ParsedRecord(
+                index=index,
+                product_id=self._record_id(data, index),
+                raw=data,
+                product=product,
+                error=error
+            )
+
+    def _record_id(self, data, index: int) -> str:
+        if isinstance(data, dict):
+            for key in ("id", "product_id", "sku", "product_name"):
+                value = data.get(key)
+                if isinstance(value, (str, int)) and str(value).strip():
+                    return str(value).strip()
+        return f"record-{index}"
+
     # -------------------------
     # Validation
     # -------------------------
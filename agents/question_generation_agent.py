@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
 
 
@@ -52,6 +52,41 @@ class QuestionGenerationAgent:
 
         return self._flatten_questions(base_questions)
 
+    def top_up(self, product: Dict, existing: List[Dict], min_total: int) -> List[Dict]:
+        """
+        Incremental retry: asks the LLM (if configured) for questions in
+        the categories that are short of their share of `min_total`
+        only, and merges them into `existing`.
+
+        Returns `existing` unchanged when nothing is short or no LLM is
+        configured, so callers can detect a no-progress attempt.
+        """
+        grouped = self._group_questions(existing)
+
+        target = max(
+            self.MIN_QUESTIONS_PER_CATEGORY,
+            -(-min_total // len(self.CATEGORIES))  # ceil division
+        )
+        missing = {
+            category: target - len(grouped[category])
+            for category in self.CATEGORIES
+            if len(grouped[category]) < target
+        }
+
+        if not missing or not self.llm_client:
+            return existing
+
+        extra = self._generate_llm_questions(product, missing)
+
+        # Keep only well-formed questions for the categories we asked for
+        extra = {
+            category: [q for q in extra.get(category, []) if isinstance(q, str) and "?" in q]
+            for category in missing
+            if isinstance(extra.get(category), list)
+        }
+
+        return self._flatten_questions(self._merge_questions(grouped, extra))
+
     # ------------------------------------------------------------------
     # Rule-Based Generation (Deterministic)
     # ------------------------------------------------------------------
@@ -96,8 +131,12 @@ class QuestionGenerationAgent:
     # Optional LLM Expansion (Additive Only)
     # ------------------------------------------------------------------
 
-    def _generate_llm_questions(self, product: Dict) -> Dict[str, List[str]]:
-        prompt = self._build_llm_prompt(product)
+    def _generate_llm_questions(
+        self,
+        product: Dict,
+        missing: Optional[Dict[str, int]] = None
+    ) -> Dict[str, List[str]]:
+        prompt = self._build_llm_prompt(product, missing)
         raw = self.llm_client.generate(prompt)
 
         try:
@@ -109,7 +148,25 @@ class QuestionGenerationAgent:
 
         return {}
 
-    def _build_llm_prompt(self, product: Dict) -> str:
+    def _build_llm_prompt(self, product: Dict, missing: Optional[Dict[str, int]] = None) -> str:
+        """
+        missing: {category: count} to request only the short categories
+        (top-up retries). None requests every category.
+        """
+        categories = list(missing) if missing else self.CATEGORIES
+
+        counts = ""
+        if missing:
+            counts = "\n".join(
+                f"                - {category}: {count} new question(s)"
+                for category, count in missing.items()
+            )
+            counts = f"\n\n                Questions needed:\n{counts}"
+
+        output_format = ",\n".join(
+            f'                "{category}": [string]' for category in categories
+        )
+
         return f"""
                 You are generating additional user questions.
 
@@ -118,19 +175,14 @@ class QuestionGenerationAgent:
                 - Do NOT add new facts
                 - Do NOT answer the questions
                 - Output STRICT JSON
-                - Keys must be exactly: {self.CATEGORIES}
+                - Keys must be exactly: {categories}{counts}
 
                 Product Data:
                 {json.dumps(product, indent=2)}
 
                 Output format:
                 {{
-                "informational": [string],
-                "usage": [string],
-                "safety": [string],
-                "ingredients": [string],
-                "pricing": [string],
-                "comparison": [string]
+{output_format}
                 }}
                 """.strip()
 
@@ -176,9 +228,15 @@ class QuestionGenerationAgent:
                     )
 
     # ------------------------------------------------------------------
-    # Flatten for Pipeline Consumption
+    # Flatten / Group for Pipeline Consumption
     # ------------------------------------------------------------------
 
+    def _group_questions(self, questions: List[Dict]) -> Dict[str, List[str]]:
+        grouped = {category: [] for category in self.CATEGORIES}
+        for q in questions:
+            grouped.setdefault(q["category"], []).append(q["question"])
+        return grouped
+
     def _flatten_questions(self, questions: Dict[str, List[str]]) -> List[Dict]:
         return [
             {"category": category, "question": q}
@@ -14,19 +14,56 @@ Inputs:
 
 Outputs:
 - file_path (str)
+
+Pages are encoded with orjson (stdlib json for anything orjson cannot
+encode) and written atomically: to a temp file in the same directory,
+then renamed over the target, so a crash never leaves a truncated page.
+With a BackgroundWriter, the disk write happens on a writer thread and
+the caller only pays for encoding. With a PageStore (utils/page_store.py),
+pages are appended to its shards under `page_id` instead of written as
+files, and output_dir is never created.
+
+Pages identical to what is already on disk are not rewritten (their
+mtime is untouched, so downstream sync sees no change); written and
+skipped pages are counted in pages_written / pages_skipped.
 """
 
 
 import json
+import os
+import queue
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 
 class SerializationAgent:
 
-    def __init__(self, output_dir: str = "data/output"):
+    def __init__(
+        self,
+        output_dir: str = "data/output",
+        compact: bool = False,
+        writer: Optional["BackgroundWriter"] = None,
+        page_store=None,
+        page_id: Optional[str] = None,
+        skip_unchanged: bool = True
+    ):
+        if page_store is not None and not page_id:
+            raise ValueError("page_id is required when writing to a page store")
+
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if page_store is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compact = compact        # no indentation
+        self.writer = writer          # None = write synchronously
+        self.page_store = page_store  # None = one file per page
+        self.page_id = page_id
+        self.skip_unchanged = skip_unchanged
+
+        self.pages_written = 0
+        self.pages_skipped = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -66,19 +103,146 @@ class SerializationAgent:
 
     def _write_json(self, data: Dict, filename: str) -> None:
         """
-        Writes a dictionary as formatted JSON to the output directory.
+        Writes a dictionary as JSON to the output directory.
+        Encoding happens here, so later changes to `data` cannot
+        affect a queued write.
         """
 
         if not isinstance(data, dict):
             raise ValueError("Serialized data must be a dictionary")
 
-        file_path = self.output_dir / filename
-
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                data,
-                f,
-                indent=2,
-                ensure_ascii=False
+        if self.page_store is not None:
+            written = self.page_store.put(
+                self.page_id, Path(filename).stem, data, if_changed=self.skip_unchanged
             )
+            self._count(written)
+            return
 
+        file_path = self.output_dir / filename
+        payload = encode_json(data, compact=self.compact)
+
+        if self.skip_unchanged and is_unchanged(file_path, payload):
+            self._count(False)
+            return
+
+        if self.writer is not None:
+            self.writer.submit(file_path, payload)
+        else:
+            atomic_write(file_path, payload)
+        self._count(True)
+
+    def _count(self, written: bool) -> None:
+        if written:
+            self.pages_written += 1
+        else:
+            self.pages_skipped += 1
+
+
+def is_unchanged(path: Path, payload: bytes) -> bool:
+    """
+    True if `path` already holds exactly `payload`. The file is only
+    read when its size matches, so changed pages usually cost one stat().
+    """
+    try:
+        if os.stat(path).st_size != len(payload):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == payload
+    except FileNotFoundError:
+        return False
+
+
+def encode_json(data, compact: bool = False) -> bytes:
+    """
+    UTF-8 JSON, byte-identical to json.dumps(indent=2, ensure_ascii=False)
+    (or separators=(",", ":") when compact).
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if not compact:
+        option |= orjson.OPT_INDENT_2
+
+    try:
+        return orjson.dumps(data, option=option)
+    except TypeError:
+        # e.g. integers beyond 64 bits
+        if compact:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def atomic_write(path: Path, payload: bytes) -> None:
+    """
+    Writes to a temp file next to `path`, then renames it over `path`.
+    Readers see either the old file or the complete new one.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class BackgroundWriter:
+    """
+    Writes files on a single daemon thread.
+
+    The queue is bounded (`max_pending` files), so a producer that
+    outpaces the disk blocks instead of buffering without limit.
+    Write errors are collected and returned by flush().
+    """
+
+    def __init__(self, max_pending: int = 64):
+        self._queue: "queue.Queue[Optional[Tuple[Path, bytes]]]" = queue.Queue(maxsize=max(1, max_pending))
+        self._errors: List[Tuple[Path, Exception]] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="serialization-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def submit(self, path: Path, payload: bytes) -> None:
+        if not self._thread.is_alive():
+            raise RuntimeError("BackgroundWriter is closed")
+        self._queue.put((Path(path), payload))
+
+    def flush(self) -> List[Tuple[Path, Exception]]:
+        """
+        Waits until every submitted file is written. Returns (and
+        clears) the (path, error) pairs of writes that failed since the
+        last flush.
+        """
+        self._queue.join()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def close(self) -> List[Tuple[Path, Exception]]:
+        errors = self.flush()
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        return errors
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                path, payload = job
+                try:
+                    atomic_write(path, payload)
+                except Exception as e:
+                    with self._lock:
+                        self._errors.append((path, e))
+            finally:
+                self._queue.task_done()
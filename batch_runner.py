@@ -0,0 +1,518 @@
+"""
+Catalog batch runner.
+
+Runs the compiled LangGraph pipeline over many product/competitor
+pairs using a process pool. Each worker imports the SDKs and compiles
+the graph once, then processes items until the batch is drained.
+
+Manifest formats:
+- JSONL file, one pair per line:
+    {"id": "sku-123", "product": "a.json", "competitor": "b.json"}
+  "product" / "competitor" may be a path (relative to the manifest)
+  or an inline product dict.
+- Directory of pair folders, each containing
+  product_data.json and fictitious_product.json (same layout as data/input).
+- Catalog feed (--catalog): NDJSON or a JSON array of products, each
+  paired with one --competitor file. The feed is streamed, so memory
+  stays flat whatever its size; invalid records are reported as failed
+  items without reaching a worker. Valid products are normalized once
+  into a columnar store (utils/catalog_store.py, default
+  <output_dir>/catalog.store) that every worker memory-maps, so items
+  carry only an id.
+
+Outputs:
+- <output_dir>/<item_id>/  faq.json, product_page.json,
+                           comparison_page.json, execution_log.txt,
+                           generation_manifest.json,
+                           trace_events.jsonl, trace.json
+- <output_dir>/batch_report.jsonl  one status line per item
+- With --page-store DIR, everything per item (the three pages,
+  "generation_manifest", "execution_log" and "trace") goes to a
+  sharded, compressed page store in DIR (utils/page_store.py) and no
+  per-item folders are created.
+
+Usage:
+    python batch_runner.py --manifest pairs.jsonl --output-dir data/output/batch --workers 8
+    python batch_runner.py --catalog feed.ndjson.gz --competitor data/input/fictitious_product.json --chunk-size 16
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import argparse
+import json
+import re
+import time
+
+from agents.parser_agent import RECORD_ERRORS, ParserAgent
+from agents.serialization_agent import BackgroundWriter, SerializationAgent
+from config.system_config import OUTPUT_COMPACT_JSON
+from runner import load_json, new_tracer, run_pipeline, write_outputs
+from utils.catalog_store import CatalogStore, CatalogStoreWriter, to_raw_product
+from utils.catalog_stream import chunked, iter_records
+from utils.generation_manifest import load_manifest, load_stored_manifest
+from utils.page_store import PageStore
+
+
+PRODUCT_FILENAME = "product_data.json"
+COMPETITOR_FILENAME = "fictitious_product.json"
+STORE_FILENAME = "catalog.store"
+
+# Compiled graph, one per worker process
+_graph = None
+
+# Open catalog stores, one mapping per store per worker process
+_stores: Dict[str, CatalogStore] = {}
+
+# Page writer thread, one per worker process
+_writer: Optional[BackgroundWriter] = None
+
+# Open page stores, one set of shards per store per worker process
+_page_stores: Dict[str, PageStore] = {}
+
+
+# ----------------------------------------------------------------------
+# Manifest Reading (lazy, so manifest size does not affect memory)
+# ----------------------------------------------------------------------
+
+def iter_manifest(manifest: Path) -> Iterator[Dict]:
+    """
+    Yields batch items: {"id", "product", "competitor"}.
+    Products are left as paths where possible; workers load them.
+    """
+    if manifest.is_dir():
+        for pair_dir in sorted(p for p in manifest.iterdir() if p.is_dir()):
+            yield {
+                "id": pair_dir.name,
+                "product": str(pair_dir / PRODUCT_FILENAME),
+                "competitor": str(pair_dir / COMPETITOR_FILENAME),
+            }
+        return
+
+    base_dir = manifest.parent
+
+    with manifest.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": f"line-{line_no}", "error": f"Invalid manifest line: {e}"}
+                continue
+
+            item = {"id": str(entry.get("id") or f"line-{line_no}")}
+            for key in ("product", "competitor"):
+                value = entry.get(key)
+                if isinstance(value, str) and not Path(value).is_absolute():
+                    value = str(base_dir / value)
+                item[key] = value
+            yield item
+
+
+def iter_catalog(feed: Path, competitor: Path, store: Optional[Path] = None) -> Iterator[Dict]:
+    """
+    Yields batch items for a streamed product feed, all paired with
+    the same competitor. Records that fail parsing become items with
+    an "error", so they are reported without running the graph.
+
+    With `store`, the whole feed is first normalized into a catalog
+    store at that path (failed records are yielded as they are found),
+    then one item per product is yielded that references the store
+    by id instead of carrying the product itself.
+    """
+    if store is None:
+        for item in _iter_feed_items(feed, competitor):
+            item.pop("normalized", None)
+            yield item
+        return
+
+    with CatalogStoreWriter(store) as writer:
+        for item in _iter_feed_items(feed, competitor):
+            if "error" in item:
+                yield item
+                continue
+
+            try:
+                writer.add(item["id"], item.pop("normalized"))
+            except RECORD_ERRORS as e:
+                # Parsed fine but cannot be stored (e.g. out-of-range price)
+                yield {"id": item["id"], "error": f"Cannot store record: {e}"}
+
+    with CatalogStore(store) as catalog:
+        for product_id in catalog.ids():
+            yield {"id": product_id, "store": str(store), "competitor": str(competitor)}
+
+
+def _iter_feed_items(feed: Path, competitor: Path) -> Iterator[Dict]:
+    seen = {}
+
+    for parsed in ParserAgent().parse_stream(iter_records(feed)):
+        # Product ids name output folders and key the store; keep them unique
+        item_id = parsed.product_id
+        while item_id in seen:
+            seen[parsed.product_id] += 1
+            item_id = f"{parsed.product_id}-{seen[parsed.product_id]}"
+        seen[item_id] = 0
+
+        if not parsed.ok:
+            yield {"id": item_id, "error": f"Record {parsed.index}: {parsed.error}"}
+            continue
+
+        yield {
+            "id": item_id,
+            "product": parsed.raw,
+            "normalized": parsed.product,
+            "competitor": str(competitor),
+        }
+
+
+def _safe_dirname(item_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", item_id).strip("._") or "item"
+
+
+# ----------------------------------------------------------------------
+# Worker Side
+# ----------------------------------------------------------------------
+
+def _init_worker(workers: int = 1) -> None:
+    global _graph, _writer
+    from config.system_config import OUTPUT_WRITE_QUEUE_SIZE
+    from runner import build_pipeline_graph
+    from llm.rate_limiter import set_rate_limit_share
+
+    # Provider limits are per account; split them across the pool
+    set_rate_limit_share(1.0 / max(1, workers))
+
+    # One checkpoint connection per worker process (SQLite WAL)
+    _graph = build_pipeline_graph()
+
+    # Page writes overlap with the next item's generation
+    _writer = BackgroundWriter(max_pending=OUTPUT_WRITE_QUEUE_SIZE)
+
+
+def _store_product(path: str, product_id: str) -> Dict:
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = CatalogStore(Path(path))
+    return to_raw_product(store.get(product_id))
+
+
+def _open_page_store(path: str) -> PageStore:
+    store = _page_stores.get(path)
+    if store is None:
+        store = _page_stores[path] = PageStore(Path(path))
+    return store
+
+
+def _resolve_product(value) -> Dict:
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        return load_json(Path(value))
+    raise ValueError(f"Product must be a path or an object, got: {type(value).__name__}")
+
+
+def run_item(
+    item: Dict,
+    output_dir: str,
+    resume: bool = False,
+    writer: Optional[BackgroundWriter] = None,
+    page_store: Optional[PageStore] = None
+) -> Dict:
+    """
+    Runs one pair end to end. Never raises: failures are reported
+    in the returned status dict so one bad item cannot stop the batch.
+
+    With resume=True, items that already completed are served from
+    their checkpoint and interrupted ones continue where they stopped.
+
+    With a writer, pages are queued rather than written; the caller
+    must flush it before reporting the item. With a page store, pages,
+    manifest, log and trace are appended to it under the item id
+    instead (flush it likewise) and no item folder is created.
+    """
+    started = time.perf_counter()
+    result = {"id": item["id"], "status": "failed"}
+
+    try:
+        if "error" in item:
+            raise ValueError(item["error"])
+
+        if _graph is None:
+            _init_worker()
+
+        item_dir = Path(output_dir) / _safe_dirname(item["id"])
+
+        # Workers run one item at a time, so each trace covers one item.
+        # The item's previous manifest lets unchanged answers be reused.
+        tracer = new_tracer()
+        if page_store is not None:
+            previous_manifest = load_stored_manifest(page_store, item["id"])
+        else:
+            previous_manifest = load_manifest(item_dir)
+
+        if "store" in item:
+            product = _store_product(item["store"], item["id"])
+        else:
+            product = _resolve_product(item.get("product"))
+
+        final_state = run_pipeline(
+            _graph,
+            product,
+            _resolve_product(item.get("competitor")),
+            tracer,
+            resume=resume,
+            previous_manifest=previous_manifest,
+        )
+
+        serializer = SerializationAgent(
+            output_dir=item_dir,
+            compact=OUTPUT_COMPACT_JSON,
+            writer=writer,
+            page_store=page_store,
+            page_id=item["id"]
+        )
+        write_outputs(final_state, item_dir, tracer, serializer)
+
+        result["status"] = "ok"
+        if page_store is not None:
+            result["page_store"] = str(page_store.directory)
+        else:
+            result["output_dir"] = str(item_dir)
+        result["pages_written"] = serializer.pages_written
+        result["pages_skipped"] = serializer.pages_skipped
+        result["schema_errors"] = sorted(final_state["schema_validation_errors"])
+        result["faq_answer_errors"] = len(final_state["faq_answer_errors"])
+        result["comparison_fallbacks"] = len(final_state["comparison_fallbacks"])
+
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_chunk(
+    items: List[Dict],
+    output_dir: str,
+    resume: bool = False,
+    page_store: Optional[str] = None
+) -> List[Dict]:
+    """
+    Runs a chunk of items in one task, amortising inter-process
+    hand-off over several small items.
+
+    Pages are written in the background while later items generate,
+    and flushed before the chunk reports, so an "ok" item is on disk.
+    """
+    if _graph is None:
+        _init_worker()
+
+    store = _open_page_store(page_store) if page_store else None
+    results = [run_item(item, output_dir, resume, _writer, store) for item in items]
+
+    failed_dirs = {}
+    for path, error in _writer.flush():
+        failed_dirs.setdefault(str(path.parent), f"{type(error).__name__}: {error}")
+
+    store_error = None
+    if store is not None:
+        try:
+            store.flush()
+        except Exception as e:
+            store_error = f"{type(e).__name__}: {e}"
+
+    for result in results:
+        error = store_error or failed_dirs.get(result.get("output_dir"))
+        if result["status"] == "ok" and error:
+            result["status"] = "failed"
+            result["error"] = f"Write failed: {error}"
+
+    return results
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+
+def run_batch(
+    manifest: Path,
+    output_dir: Path,
+    workers: int = 4,
+    max_in_flight: int = 0,
+    resume: bool = False,
+    chunk_size: int = 1,
+    page_store: Optional[Path] = None
+) -> Dict:
+    """
+    Streams items from the manifest through a process pool.
+    """
+    items = iter_manifest(manifest)
+    return run_items(items, output_dir, workers, max_in_flight, resume, chunk_size, page_store)
+
+
+def run_catalog(
+    feed: Path,
+    competitor: Path,
+    output_dir: Path,
+    workers: int = 4,
+    max_in_flight: int = 0,
+    resume: bool = False,
+    chunk_size: int = 1,
+    store: Optional[Path] = None,
+    page_store: Optional[Path] = None
+) -> Dict:
+    """
+    Streams a product feed (NDJSON / JSON array) through a process pool.
+    Products are shared with the workers through a catalog store
+    (default <output_dir>/catalog.store).
+    """
+    store = store or output_dir / STORE_FILENAME
+    items = iter_catalog(feed, competitor, store)
+    return run_items(items, output_dir, workers, max_in_flight, resume, chunk_size, page_store)
+
+
+def run_items(
+    items: Iterable[Dict],
+    output_dir: Path,
+    workers: int = 4,
+    max_in_flight: int = 0,
+    resume: bool = False,
+    chunk_size: int = 1,
+    page_store: Optional[Path] = None
+) -> Dict:
+    """
+    Runs batch items through a process pool, `chunk_size` items per task.
+
+    At most `max_in_flight` chunks are submitted at a time (default
+    2 x workers), so neither the input nor the results are held
+    in memory. Each result is appended to batch_report.jsonl as it
+    completes.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = output_dir / "batch_report.jsonl"
+    max_in_flight = max_in_flight or workers * 2
+
+    counts = {"ok": 0, "failed": 0, "pages_written": 0, "pages_skipped": 0}
+    chunks = chunked(items, chunk_size)
+    exhausted = False
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,))
+
+    pool = new_pool()
+
+    with report_path.open("w", encoding="utf-8") as report:
+
+        def record(result: Dict) -> None:
+            counts[result["status"]] += 1
+            counts["pages_written"] += result.get("pages_written", 0)
+            counts["pages_skipped"] += result.get("pages_skipped", 0)
+            report.write(json.dumps(result, ensure_ascii=False) + "\n")
+            report.flush()
+            print(f" [{result['status']}] {result['id']} ({result['elapsed_s']}s)")
+
+        in_flight = {}
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    task = pool.submit(
+                        run_chunk, chunk, str(output_dir), resume,
+                        str(page_store) if page_store else None
+                    )
+                    in_flight[task] = chunk
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    try:
+                        for result in future.result():
+                            record(result)
+                    except BrokenProcessPool as e:
+                        # A worker died (e.g. OOM); fail its chunk and start a fresh pool
+                        for item in chunk:
+                            record({"id": item["id"], "status": "failed",
+                                    "error": f"Worker crashed: {e}", "elapsed_s": 0.0})
+
+                        for orphan, orphan_chunk in in_flight.items():
+                            try:
+                                for result in orphan.result(timeout=0):
+                                    record(result)
+                            except Exception:
+                                for item in orphan_chunk:
+                                    record({"id": item["id"], "status": "failed",
+                                            "error": "Worker pool crashed", "elapsed_s": 0.0})
+                        in_flight.clear()
+
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = new_pool()
+                        break
+        finally:
+            pool.shutdown(wait=True)
+
+    counts["report"] = str(report_path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the content pipeline over a catalog of product pairs.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", type=Path,
+                        help="JSONL manifest of pairs, or a directory of pair folders")
+    source.add_argument("--catalog", type=Path,
+                        help="Product feed (NDJSON or JSON array, optionally .gz)")
+    parser.add_argument("--competitor", type=Path,
+                        help="Competitor product paired with every --catalog record")
+    parser.add_argument("--output-dir", type=Path, default=Path("data/output/batch"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-in-flight", type=int, default=0,
+                        help="Max chunks submitted at once (default: 2 x workers)")
+    parser.add_argument("--chunk-size", type=int, default=1,
+                        help="Items handed to a worker per task")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="Catalog store built from --catalog (default: <output-dir>/catalog.store)")
+    parser.add_argument("--page-store", type=Path, default=None,
+                        help="Append pages to a sharded zstd page store in this directory")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse checkpoints: skip completed items, continue interrupted ones")
+    args = parser.parse_args()
+
+    if args.catalog and not args.competitor:
+        parser.error("--catalog requires --competitor")
+
+    options = dict(
+        output_dir=args.output_dir,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        resume=args.resume,
+        chunk_size=args.chunk_size,
+        page_store=args.page_store,
+    )
+
+    if args.catalog:
+        summary = run_catalog(feed=args.catalog, competitor=args.competitor, store=args.store, **options)
+    else:
+        summary = run_batch(manifest=args.manifest, **options)
+
+    print(
+        f"\n Batch finished: {summary['ok']} ok, {summary['failed']} failed"
+        f"\n Pages: {summary['pages_written']} written, {summary['pages_skipped']} unchanged"
+        f"\n Report saved to: {summary['report']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
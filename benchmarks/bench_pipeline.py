@@ -0,0 +1,123 @@
+"""
+Offline pipeline throughput benchmark.
+
+Runs the full LangGraph pipeline against FakeLLMBackend with a
+configurable latency model, so concurrency, batching and retry
+behaviour can be measured without network access or API spend.
+With --cassette, recorded production traffic (see llm/cassette.py)
+is replayed instead, optionally at the recorded latencies.
+
+Usage:
+    python -m benchmarks.bench_pipeline --latency lognormal --latency-ms 400 --runs 5
+    python -m benchmarks.bench_pipeline --workers 1 4 8 --batch-mode off category
+    python -m benchmarks.bench_pipeline --cassette data/cassettes/llm_traffic.jsonl.gz --latency-scale 1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+# Measure the pipeline, not the response cache
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+
+from graph.graph import build_graph  # noqa: E402
+from graph.state import AgentState  # noqa: E402
+from llm.backends import set_default_backend  # noqa: E402
+from llm.cassette import Cassette, ReplayBackend  # noqa: E402
+from llm.fake_backend import FakeLLMBackend  # noqa: E402
+from llm.rate_limiter import set_rate_limiting_enabled  # noqa: E402
+
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "input"
+
+
+def make_backend(args):
+    if args.cassette:
+        return ReplayBackend(
+            Cassette(args.cassette),
+            latency_scale=args.latency_scale,
+            # Prompts the cassette never saw still complete, just instantly
+            fallback=FakeLLMBackend(seed=args.seed),
+        )
+
+    return FakeLLMBackend(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+
+
+def served(backend) -> int:
+    stats = backend.stats()
+    if "calls" in stats:
+        return stats["calls"]
+    return stats["hits"] + stats["misses"]
+
+
+def run(args) -> None:
+    product_a = json.loads((INPUT_DIR / "product_data.json").read_text(encoding="utf-8"))
+    product_b = json.loads((INPUT_DIR / "fictitious_product.json").read_text(encoding="utf-8"))
+
+    # Provider limits are meaningless against the fake backend unless asked for
+    set_rate_limiting_enabled(args.rate_limits)
+
+    graph = build_graph()
+
+    if args.cassette:
+        print(f"cassette={args.cassette} latency_scale={args.latency_scale}")
+    else:
+        print(f"latency={args.latency} latency_ms={args.latency_ms} "
+              f"error_rate={args.error_rate} rate_limit_rate={args.rate_limit_rate}")
+    print(f"{'workers':>8} {'batch':>9} {'p50 s':>8} {'max s':>8} {'calls':>6} {'failed':>7}")
+
+    for batch_mode in args.batch_mode:
+        for workers in args.workers:
+            backend = make_backend(args)
+            set_default_backend(backend)
+
+            timings = []
+            failed = 0
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                state = graph.invoke(AgentState(
+                    raw_product_a=product_a,
+                    raw_product_b=product_b,
+                    max_faq_answer_workers=workers,
+                    faq_answer_batch_mode=batch_mode,
+                ))
+                timings.append(time.perf_counter() - started)
+                failed += len(state["faq_answer_errors"])
+
+            print(f"{workers:>8} {batch_mode:>9} {statistics.median(timings):>8.3f} "
+                  f"{max(timings):>8.3f} {served(backend):>6} {failed:>7}")
+
+    set_default_backend(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument("--latency", choices=["fixed", "lognormal", "pareto"], default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batch-mode", nargs="+", default=["off"],
+                        choices=["off", "category", "page"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cassette", default=None,
+                        help="Replay a recorded cassette instead of the fake backend")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier on recorded latencies when replaying")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="Apply the configured provider rate limits")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Page validation throughput benchmark.
+
+Compares instantiating the page schema per call (the previous
+validate_final_output behaviour, schema only) with the compiled
+schema + template contracts in utils/validators.py, validating from
+dicts, from bytes via json.loads, and directly from the JSON bytes.
+
+Usage:
+    python -m benchmarks.bench_validation --pages 20000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from utils.validators import PAGE_CONTRACTS, validate_page
+
+
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "output"
+
+PAGE_FILES = {
+    "faq": "faq.json",
+    "product": "product_page.json",
+    "comparison": "comparison_page.json",
+}
+
+
+def load_pages():
+    return {
+        page_type: (OUTPUT_DIR / filename).read_bytes()
+        for page_type, filename in PAGE_FILES.items()
+    }
+
+
+def per_call_schema(page_type: str, page: dict) -> None:
+    schema, _ = PAGE_CONTRACTS[page_type]
+    schema(**page)
+
+
+def run(args) -> None:
+    samples = load_pages()
+
+    print(f"pages={args.pages} (per page type)")
+    print(f"{'page':>11} {'path':>16} {'pages/s':>12} {'us/page':>9}")
+
+    for page_type, raw in samples.items():
+        page = json.loads(raw)
+
+        paths = {
+            "schema per call": lambda: per_call_schema(page_type, page),
+            "compiled dict": lambda: validate_page(page_type, page),
+            "loads + dict": lambda: validate_page(page_type, json.loads(raw)),
+            "compiled bytes": lambda: validate_page(page_type, raw),
+        }
+
+        if validate_page(page_type, raw):
+            raise SystemExit(f"Sample {page_type} page does not validate")
+
+        for name, validate in paths.items():
+            started = time.perf_counter()
+            for _ in range(args.pages):
+                validate()
+            elapsed = time.perf_counter() - started
+            print(f"{page_type:>11} {name:>16} {args.pages / elapsed:>12,.0f} "
+                  f"{elapsed / args.pages * 1e6:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page validation benchmark")
+    parser.add_argument("--pages", type=int, default=20_000)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
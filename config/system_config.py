@@ -7,9 +7,134 @@ It serves as a central location for:
 - Agent enable/disable switches
 - Environment-specific defaults
 
-Currently, configuration is handled directly
-inside the orchestrator for simplicity.
+Graph-level knobs (retry caps, thresholds) live on AgentState;
+infrastructure defaults shared by several modules live here.
 """
 
+import os
+
 USE_LLM = True
 DEFAULT_CURRENCY = "INR"
+
+# ------------------
+# LLM backend:
+#   "live"   provider SDKs
+#   "fake"   offline, deterministic
+#   "record" live, appending every response to the cassette
+#   "replay" serve responses from the cassette, no network
+# ------------------
+LLM_BACKEND = os.getenv("LLM_BACKEND", "live")
+
+# Used when LLM_BACKEND is "record" / "replay"; see llm/cassette.py
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "data/cassettes/llm_traffic.jsonl.gz")
+# Replay sleeps for recorded latency x this factor (0 = instant)
+LLM_CASSETTE_LATENCY_SCALE = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0"))
+
+# Used when LLM_BACKEND == "fake"; see llm/fake_backend.py
+FAKE_LLM_SETTINGS = {
+    "latency": "lognormal",
+    "latency_ms": float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+    "sigma": 0.5,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+}
+
+# ------------------
+# Run instrumentation (see utils/instrumentation.py)
+# TRACE_MEMORY adds tracemalloc accounting, which slows runs down
+# ------------------
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") != "0"
+TRACE_MEMORY = os.getenv("TRACE_MEMORY", "0") == "1"
+
+# ------------------
+# Graph checkpoints (see graph/checkpointing.py)
+# Runs untouched for CHECKPOINT_MAX_AGE_DAYS are pruned when the store
+# is opened (0 keeps them forever)
+# ------------------
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "1") != "0"
+CHECKPOINT_PATH = "data/checkpoints/graph_runs.sqlite"
+CHECKPOINT_MAX_AGE_DAYS = float(os.getenv("CHECKPOINT_MAX_AGE_DAYS", "14"))
+
+# ------------------
+# Page output (see agents/serialization_agent.py)
+# OUTPUT_COMPACT_JSON drops indentation; batch workers queue at most
+# OUTPUT_WRITE_QUEUE_SIZE files for their background writer
+# ------------------
+OUTPUT_COMPACT_JSON = os.getenv("OUTPUT_COMPACT_JSON", "0") == "1"
+OUTPUT_WRITE_QUEUE_SIZE = 64
+
+# ------------------
+# LLM response cache
+# ------------------
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = "data/cache/llm_responses.sqlite"
+LLM_CACHE_MEMORY_ENTRIES = 1024
+LLM_CACHE_MAX_ENTRIES = 50_000
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# ------------------
+# LLM call retries (see llm/retry.py)
+# Retryable errors back off with full jitter; timeout is per attempt.
+# Each first attempt earns budget_ratio retries, up to
+# budget_max_retries banked per provider per process.
+# ------------------
+LLM_RETRY = {
+    "max_attempts": int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "4")),
+    "base_delay_seconds": 0.5,
+    "max_delay_seconds": 20.0,
+    "timeout_seconds": float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+    "budget_ratio": 0.2,
+    "budget_max_retries": 20,
+}
+
+# ------------------
+# Hedged LLM requests (see llm/hedging.py), off by default
+# A duplicate fires once a call outlives the provider's recent
+# p<percentile> latency, at most max_hedge_ratio hedges per call.
+# cross_provider sends the duplicate to the other provider.
+# ------------------
+LLM_HEDGING = {
+    "enabled": os.getenv("LLM_HEDGING", "0") == "1",
+    "percentile": 95,
+    "initial_delay_seconds": 5.0,
+    "min_delay_seconds": 0.25,
+    "min_samples": 20,
+    "window": 500,
+    "max_hedge_ratio": 0.05,
+    "cross_provider": os.getenv("LLM_HEDGE_CROSS_PROVIDER", "0") == "1",
+    "max_threads": 64,
+}
+
+# ------------------
+# Per-provider circuit breakers (see llm/circuit_breaker.py)
+# Opens when failure_rate of the last `window` calls (at least
+# min_calls) failed provider-side; fails fast for open_seconds, then
+# lets half_open_probes calls through to test recovery.
+# ------------------
+CIRCUIT_BREAKER = {
+    "enabled": os.getenv("LLM_CIRCUIT_BREAKER", "1") != "0",
+    "failure_rate": 0.5,
+    "min_calls": 10,
+    "window": 20,
+    "open_seconds": 30.0,
+    "half_open_probes": 1,
+    "probe_successes": 2,
+}
+
+# ------------------
+# Provider rate limits (per process, shared by all clients)
+# Set to your account tier; headers returned by the provider
+# tighten these further at runtime.
+# ------------------
+RATE_LIMITS = {
+    "anthropic": {
+        "requests_per_minute": 50,
+        "tokens_per_minute": 50_000,
+        "max_concurrency": 8,
+    },
+    "groq": {
+        "requests_per_minute": 30,
+        "tokens_per_minute": 12_000,
+        "max_concurrency": 6,
+    },
+}
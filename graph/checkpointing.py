@@ -0,0 +1,199 @@
+"""
+Persistent checkpoints for graph runs.
+
+With a checkpointer attached, LangGraph saves AgentState after every
+superstep (and the writes of nodes that finished in a superstep where
+another node failed). A failed run can then be resumed: finished nodes
+are not re-run, so paid-for LLM output is never regenerated.
+
+Runs are keyed by a run id derived from the input hashes, so the same
+product pair always maps to the same checkpoint thread. Editing a
+product therefore starts a new thread and orphans the old one; every
+run's last use is recorded, and runs untouched for
+CHECKPOINT_MAX_AGE_DAYS are pruned when the store is opened.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import sqlite3
+import time
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config.system_config import CHECKPOINT_MAX_AGE_DAYS, CHECKPOINT_PATH
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_id_for(raw_product_a: Dict, raw_product_b: Dict) -> str:
+    """
+    Stable id for a product pair: identical inputs, identical run id.
+    """
+    payload = json.dumps(
+        [raw_product_a, raw_product_b],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return "run-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class RunCheckpointer(SqliteSaver):
+    """
+    SqliteSaver that can compact a finished run down to its final
+    checkpoint and prune runs that have not been used for a while.
+    SqliteSaver stores full channel values in every checkpoint, so the
+    latest one is self-contained.
+
+    Last use per run is kept in a run_activity table next to
+    SqliteSaver's own.
+    """
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS run_activity ("
+            "thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def touch_run(self, run_id: str, now: Optional[float] = None) -> None:
+        """
+        Records `run_id` as used now.
+        """
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO run_activity VALUES (?, ?)",
+                (run_id, time.time() if now is None else now)
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM run_activity WHERE thread_id = ?", (str(thread_id),))
+
+    def prune(self, max_age_seconds: float, now: Optional[float] = None) -> int:
+        """
+        Deletes every run not used for `max_age_seconds` and returns
+        how many were deleted. Runs with no recorded use (checkpointed
+        before run_activity existed) are stamped now and age from there.
+        Freed pages are reused by later checkpoints; the file itself
+        does not shrink.
+        """
+        now = time.time() if now is None else now
+
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR IGNORE INTO run_activity "
+                "SELECT DISTINCT thread_id, ? FROM checkpoints",
+                (now,)
+            )
+            stale = [
+                row[0] for row in cur.execute(
+                    "SELECT thread_id FROM run_activity WHERE updated_at < ?",
+                    (now - max_age_seconds,)
+                ).fetchall()
+            ]
+
+        for run_id in stale:
+            self.delete_thread(run_id)
+        return len(stale)
+
+    def compact_run(self, run_id: str) -> None:
+        """
+        Drops every checkpoint and pending write of `run_id` except the
+        latest top-level checkpoint (subgraph checkpoints included).
+        """
+        with self.cursor() as cur:
+            row = cur.execute(
+                "SELECT MAX(checkpoint_id) FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ''",
+                (run_id,)
+            ).fetchone()
+            if row is None or row[0] is None:
+                return
+
+            latest = row[0]
+            cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? "
+                "AND NOT (checkpoint_ns = '' AND checkpoint_id = ?)",
+                (run_id, latest)
+            )
+            cur.execute("DELETE FROM writes WHERE thread_id = ?", (run_id,))
+
+
+def open_checkpointer(
+    path: Optional[str] = CHECKPOINT_PATH,
+    max_age_days: float = CHECKPOINT_MAX_AGE_DAYS
+) -> RunCheckpointer:
+    """
+    Opens (creating if needed) the SQLite checkpoint store and prunes
+    runs older than `max_age_days` (0 disables pruning).
+    Relative paths resolve against the project root.
+    Each process must open its own checkpointer.
+    """
+    db_path = Path(path)
+    if not db_path.is_absolute():
+        db_path = PROJECT_ROOT / db_path
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Parallel branches finish on worker threads; the saver serialises access
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    checkpointer = RunCheckpointer(conn)
+    if max_age_days > 0:
+        checkpointer.prune(max_age_days * 86400.0)
+    return checkpointer
+
+
+def run_config(run_id: str) -> Dict:
+    return {"configurable": {"thread_id": run_id}}
+
+
+def run_status(graph, run_id: str) -> str:
+    """
+    "new"         no checkpoint for this run
+    "interrupted" checkpointed, but nodes are still pending
+    "completed"   ran to END
+    """
+    snapshot = graph.get_state(run_config(run_id))
+
+    if not snapshot.values:
+        return "new"
+    if snapshot.next:
+        return "interrupted"
+    return "completed"
+
+
+def invoke_checkpointed(graph, initial_state, run_id: str, resume: bool = False):
+    """
+    Runs `graph` under `run_id`. Returns (final_state, status before the run).
+
+    resume=True continues an interrupted run from its last checkpoint
+    and returns a completed run's final state without re-running it.
+    Otherwise any earlier checkpoints for the run are discarded first.
+    """
+    config = run_config(run_id)
+    status = run_status(graph, run_id)
+    graph.checkpointer.touch_run(run_id)
+
+    if resume and status == "completed":
+        return graph.get_state(config).values, status
+
+    if resume and status == "interrupted":
+        final_state = graph.invoke(None, config)
+    else:
+        graph.checkpointer.delete_thread(run_id)
+        final_state = graph.invoke(initial_state, config)
+
+    # Only the final checkpoint is needed to serve later resumes
+    graph.checkpointer.compact_run(run_id)
+
+    return final_state, status
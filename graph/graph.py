@@ -10,35 +10,33 @@ from graph.nodes.generate_faq_answers import generate_faq_answers_node
 from graph.nodes.assemble_faq_page import assemble_faq_page_node
 from graph.nodes.assemble_product_page import assemble_product_page_node
 from graph.nodes.generate_comparison import generate_comparison_node
+from graph.nodes.run_faq_branch import make_faq_branch_node
 from graph.nodes.validate_final_output import validate_final_output_node
+from utils.instrumentation import instrument_node
 
 
-def build_graph():
+def build_faq_graph():
     """
-    Builds and returns the LangGraph execution graph.
+    Builds the FAQ branch: question generation (with retry guard),
+    context, answers and page assembly.
     """
 
     graph = StateGraph(AgentState)
 
     # --------------------------------------------------
-    # Register nodes
+    # Register nodes (each timed when a tracer is active)
     # --------------------------------------------------
-    graph.add_node("parse_products", parse_products_node)
-    graph.add_node("generate_questions", generate_questions_node)
-    graph.add_node("validate_question_count", validate_question_count_node)
-    graph.add_node("build_faq_context", build_faq_context_node)
-    graph.add_node("generate_faq_answers", generate_faq_answers_node)
-    graph.add_node("assemble_faq_page", assemble_faq_page_node)
-    graph.add_node("assemble_product_page", assemble_product_page_node)
-    graph.add_node("generate_comparison", generate_comparison_node)
-    graph.add_node("validate_final_output", validate_final_output_node)
+    graph.add_node("generate_questions", instrument_node("generate_questions", generate_questions_node))
+    graph.add_node("validate_question_count", instrument_node("validate_question_count", validate_question_count_node))
+    graph.add_node("build_faq_context", instrument_node("build_faq_context", build_faq_context_node))
+    graph.add_node("generate_faq_answers", instrument_node("generate_faq_answers", generate_faq_answers_node))
+    graph.add_node("assemble_faq_page", instrument_node("assemble_faq_page", assemble_faq_page_node))
 
     # --------------------------------------------------
     # Define edges 
     # --------------------------------------------------
-    graph.set_entry_point("parse_products")
+    graph.set_entry_point("generate_questions")
 
-    graph.add_edge("parse_products", "generate_questions")
     graph.add_edge("generate_questions", "validate_question_count")
 
     # --------------------------------------------------
@@ -58,13 +56,58 @@ def build_graph():
     # --------------------------------------------------
     graph.add_edge("build_faq_context", "generate_faq_answers")
     graph.add_edge("generate_faq_answers", "assemble_faq_page")
-    graph.add_edge("assemble_faq_page", "assemble_product_page")
-    graph.add_edge("assemble_product_page", "generate_comparison")
-    graph.add_edge("generate_comparison", "validate_final_output")
+    graph.add_edge("assemble_faq_page", END)
+
+    return graph.compile()
+
+
+def build_graph(checkpointer=None):
+    """
+    Builds and returns the LangGraph execution graph.
+
+    Pass a checkpointer (see graph/checkpointing.py) to persist state
+    after every step; runs then need a thread id in their config.
+    The FAQ subgraph inherits it, so a resumed run also skips the
+    FAQ steps that already finished.
+
+    After parsing, three independent branches run concurrently:
+    - FAQ branch (compiled subgraph, see build_faq_graph)
+    - Product page
+    - Comparison page
+    They join at validate_final_output.
+    """
+
+    graph = StateGraph(AgentState)
+
+    # --------------------------------------------------
+    # Register nodes (each timed when a tracer is active)
+    # --------------------------------------------------
+    graph.add_node("parse_products", instrument_node("parse_products", parse_products_node))
+    graph.add_node("faq_branch", instrument_node("faq_branch", make_faq_branch_node(build_faq_graph())))
+    graph.add_node("assemble_product_page", instrument_node("assemble_product_page", assemble_product_page_node))
+    graph.add_node("generate_comparison", instrument_node("generate_comparison", generate_comparison_node))
+    graph.add_node("validate_final_output", instrument_node("validate_final_output", validate_final_output_node))
+
+    # --------------------------------------------------
+    # Fan out after parsing
+    # --------------------------------------------------
+    graph.set_entry_point("parse_products")
+
+    graph.add_edge("parse_products", "faq_branch")
+    graph.add_edge("parse_products", "assemble_product_page")
+    graph.add_edge("parse_products", "generate_comparison")
+
+    # --------------------------------------------------
+    # Join: waits for all three branches
+    # --------------------------------------------------
+    graph.add_edge(
+        ["faq_branch", "assemble_product_page", "generate_comparison"],
+        "validate_final_output"
+    )
 
     # --------------------------------------------------
     # Terminal
     # --------------------------------------------------
     graph.add_edge("validate_final_output", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
@@ -1,9 +1,12 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.template_agent import TemplateAgent
 
 
-def assemble_faq_page_node(state: AgentState) -> AgentState:
+def assemble_faq_page_node(state: AgentState) -> Dict:
     agent = TemplateAgent()
-    state.faq_page = agent.build_faq_page(state.faq_answers)
-    state.execution_log.append("FAQ page assembled")
-    return state
+    return {
+        "faq_page": agent.build_faq_page(state.faq_answers),
+        "execution_log": ["FAQ page assembled"],
+    }
@@ -1,11 +1,14 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.template_agent import TemplateAgent
 
 
-def assemble_product_page_node(state: AgentState) -> AgentState:
+def assemble_product_page_node(state: AgentState) -> Dict:
     agent = TemplateAgent()
-    state.product_page = agent.build_product_page(
-        state.normalized_product_a
-    )
-    state.execution_log.append("Product page assembled")
-    return state
+    return {
+        "product_page": agent.build_product_page(
+            state.normalized_product_a
+        ),
+        "execution_log": ["Product page assembled"],
+    }
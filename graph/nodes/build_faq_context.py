@@ -1,8 +1,10 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.content_logic_agent import ContentLogicAgent
 
 
-def build_faq_context_node(state: AgentState) -> AgentState:
+def build_faq_context_node(state: AgentState) -> Dict:
     agent = ContentLogicAgent()
 
     context_map = {}
@@ -13,7 +15,7 @@ def build_faq_context_node(state: AgentState) -> AgentState:
             category=q["category"]
         )
 
-    state.faq_context_map = context_map
-    state.execution_log.append("FAQ context built")
-
-    return state
+    return {
+        "faq_context_map": context_map,
+        "execution_log": ["FAQ context built"],
+    }
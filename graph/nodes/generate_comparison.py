@@ -1,20 +1,63 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.comparison_agent import ComparisonAgent
 from agents.template_agent import TemplateAgent
+from utils.generation_manifest import content_hash, field_values
+
+
+def _section_hash(state: AgentState, section_name: str) -> str:
+    fields = ComparisonAgent.SECTION_FIELDS[section_name]
+    return content_hash(
+        section_name,
+        field_values(state.normalized_product_a, fields),
+        field_values(state.normalized_product_b, fields)
+    )
 
 
-def generate_comparison_node(state: AgentState) -> AgentState:
+def generate_comparison_node(state: AgentState) -> Dict:
     comparison_agent = ComparisonAgent()
     template_agent = TemplateAgent()
 
+    # Reuse sections whose inputs are unchanged since the previous run
+    previous = state.previous_manifest.get("comparison", {})
+    hashes = {
+        section_name: _section_hash(state, section_name)
+        for section_name in ComparisonAgent.SECTION_FIELDS
+    }
+    reuse = {
+        section_name: previous[section_name]["value"]
+        for section_name, input_hash in hashes.items()
+        if previous.get(section_name, {}).get("input_hash") == input_hash
+    }
+
     comparison_blocks = comparison_agent.compare(
         state.normalized_product_a,
-        state.normalized_product_b
+        state.normalized_product_b,
+        reuse=reuse
     )
 
-    state.comparison_page = template_agent.build_comparison_page(
-        comparison_blocks
-    )
+    # Fallback content is not worth reusing; regenerate it next run
+    manifest = {
+        section_name: {
+            "input_hash": input_hash,
+            "value": comparison_blocks[section_name],
+        }
+        for section_name, input_hash in hashes.items()
+        if section_name not in comparison_agent.fallback_sections
+    }
+    fallbacks = len(comparison_agent.fallback_sections)
 
-    state.execution_log.append("Comparison page generated")
-    return state
+    return {
+        "comparison_page": template_agent.build_comparison_page(
+            comparison_blocks
+        ),
+        "comparison_manifest": manifest,
+        "comparison_fallbacks": list(comparison_agent.fallback_sections),
+        "execution_log": [
+            f"Comparison page generated ({len(reuse)} sections reused, "
+            f"{len(hashes) - len(reuse) - fallbacks} regenerated, "
+            f"{fallbacks} fell back: provider unavailable)",
+            comparison_agent.llm.usage_summary(),
+        ],
+    }
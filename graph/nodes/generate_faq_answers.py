@@ -1,34 +1,223 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
 from graph.state import AgentState
-from agents.answer_generation_agent import AnswerGenerationAgent
+from agents.answer_generation_agent import AnswerGenerationAgent, InvalidAnswerError
+from agents.content_logic_agent import ContentLogicAgent
 from llm.llm_client import LLMClient
+from llm.retry import is_retryable
+from utils.generation_manifest import content_hash, faq_key, field_values
+
+
+def _answer_question(
+    agent: AnswerGenerationAgent,
+    state: AgentState,
+    idx: int,
+    q: Dict,
+    refresh: bool = False
+) -> Dict:
+    result = agent.generate_answer(
+        product=state.normalized_product_a,
+        category=q["category"],
+        question=q["question"],
+        supporting_context=state.faq_context_map.get(idx, {}),
+        refresh=refresh
+    )
+
+    return {
+        "category": q["category"],
+        "question": result["question"],
+        "answer": result["answer"],
+    }
+
+
+def _answer_batch(agent: AnswerGenerationAgent, state: AgentState, indices: List[int]) -> Dict:
+    items = [
+        {
+            "id": str(idx),
+            "category": state.generated_questions[idx]["category"],
+            "question": state.generated_questions[idx]["question"],
+            "supporting_context": state.faq_context_map.get(idx, {}),
+        }
+        for idx in indices
+    ]
+
+    return agent.generate_answers_batch(
+        product=state.normalized_product_a,
+        items=items
+    )
+
 
+def _answer_hash(state: AgentState, q: Dict) -> str:
+    """
+    Hash of everything one answer depends on: the question and the
+    product fields its category reads (all fields if unmapped).
+    """
+    fields = ContentLogicAgent.CATEGORY_FIELDS.get(q["category"].lower())
+    return content_hash(
+        q["category"],
+        q["question"],
+        field_values(state.normalized_product_a, fields)
+    )
 
-def generate_faq_answers_node(state: AgentState) -> AgentState:
+
+def _batch_groups(state: AgentState, indices: List[int]) -> List[List[int]]:
+    """
+    Splits question indices into batches according to faq_answer_batch_mode.
+    """
+    if state.faq_answer_batch_mode == "page":
+        return [indices] if indices else []
+
+    if state.faq_answer_batch_mode == "category":
+        groups = {}
+        for idx in indices:
+            groups.setdefault(state.generated_questions[idx]["category"], []).append(idx)
+        return list(groups.values())
+
+    raise ValueError(f"Unknown faq_answer_batch_mode: {state.faq_answer_batch_mode}")
+
+
+def _worth_requeue(error: Exception) -> bool:
+    """
+    Rejected answers and transient provider errors (which already
+    exhausted the client's own retries) may succeed later; bad requests,
+    auth failures and bugs will not.
+    """
+    return isinstance(error, InvalidAnswerError) or is_retryable(error)
+
+
+def generate_faq_answers_node(state: AgentState) -> Dict:
     llm = LLMClient()
     agent = AnswerGenerationAgent(llm)
 
-    answers = []
+    results = {}
+    failed = {}  # question index -> last error
+    final = set()  # failed questions not worth re-requesting
+    errors = list(state.faq_answer_errors)
+
+    # Reuse answers whose inputs are unchanged since the previous run
+    previous = state.previous_manifest.get("faq", {})
+    hashes = {}
+    pending = []
 
     for idx, q in enumerate(state.generated_questions):
-        try:
-            result = agent.generate_answer(
-                product=state.normalized_product_a,
-                category=q["category"],
-                question=q["question"],
-                supporting_context=state.faq_context_map.get(idx, {})
-            )
-
-            
-            answers.append({
+        hashes[idx] = _answer_hash(state, q)
+        entry = previous.get(faq_key(q["category"], q["question"]))
+
+        if entry and entry.get("input_hash") == hashes[idx]:
+            results[idx] = {
                 "category": q["category"],
-                "question": result["question"],
-                "answer": result["answer"],
-            })
+                "question": q["question"],
+                "answer": entry["answer"],
+            }
+        else:
+            pending.append(idx)
+
+    reused = len(results)
+
+    # Questions (or batches) are independent, so calls run in parallel.
+    # Results are collected in question order, not completion order.
+    if state.faq_answer_batch_mode == "off":
+        tasks = [[idx] for idx in pending]
+    else:
+        tasks = _batch_groups(state, pending)
+
+    workers = max(1, min(state.max_faq_answer_workers, len(tasks)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if state.faq_answer_batch_mode == "off":
+            futures = [
+                pool.submit(_answer_question, agent, state, idx, state.generated_questions[idx])
+                for [idx] in tasks
+            ]
+        else:
+            futures = [
+                pool.submit(_answer_batch, agent, state, indices)
+                for indices in tasks
+            ]
+
+    for indices, future in zip(tasks, futures):
+        try:
+            outcome = future.result()
 
         except Exception as e:
-            state.faq_answer_errors.append(str(e))
+            for idx in indices:
+                failed[idx] = str(e)
+                if not _worth_requeue(e):
+                    final.add(idx)
+            continue
+
+        if state.faq_answer_batch_mode == "off":
+            results[indices[0]] = outcome
+            continue
+
+        for idx in indices:
+            q = state.generated_questions[idx]
+            if str(idx) in outcome["answers"]:
+                results[idx] = {
+                    "category": q["category"],
+                    "question": outcome["answers"][str(idx)]["question"],
+                    "answer": outcome["answers"][str(idx)]["answer"],
+                }
+            elif str(idx) in outcome["errors"]:
+                error = outcome["errors"][str(idx)]
+                failed[idx] = str(error)
+                if not _worth_requeue(error):
+                    final.add(idx)
+
+    # Requeue only the failed questions (answers rejected by
+    # validate_answer and transient errors), bypassing the cached
+    # response, until the retry budget is spent. By now the rest of the
+    # page is done, so a provider hiccup has had time to clear.
+    # The page is built from whatever survives.
+    budget = state.faq_answer_retry_budget
+    retried = 0
+
+    while budget > 0:
+        retry = sorted(idx for idx in failed if idx not in final)[:budget]
+        if not retry:
+            break
+        budget -= len(retry)
+        retried += len(retry)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(state.max_faq_answer_workers, len(retry)))) as pool:
+            futures = {
+                idx: pool.submit(
+                    _answer_question, agent, state, idx, state.generated_questions[idx], refresh=True
+                )
+                for idx in retry
+            }
+
+        for idx, future in futures.items():
+            try:
+                results[idx] = future.result()
+                del failed[idx]
+            except Exception as e:
+                failed[idx] = str(e)
+                if not _worth_requeue(e):
+                    final.add(idx)
+
+    errors.extend(failed[idx] for idx in sorted(failed))
+
+    answers = [results[idx] for idx in sorted(results)]
 
-    state.faq_answers = answers
-    state.execution_log.append("FAQ answers generated")
+    manifest = {
+        faq_key(results[idx]["category"], state.generated_questions[idx]["question"]): {
+            "input_hash": hashes[idx],
+            "answer": results[idx]["answer"],
+        }
+        for idx in sorted(results)
+    }
 
-    return state
+    return {
+        "faq_answers": answers,
+        "faq_answer_errors": errors,
+        "faq_manifest": manifest,
+        "execution_log": [
+            f"FAQ answers generated ({workers} workers, "
+            f"batch mode: {state.faq_answer_batch_mode}, "
+            f"{reused} reused, {len(results) - reused} regenerated, "
+            f"{retried} re-requested, {len(failed)} dropped)",
+            llm.usage_summary(),
+        ],
+    }
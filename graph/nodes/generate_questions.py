@@ -1,19 +1,47 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.question_generation_agent import QuestionGenerationAgent
+from llm.llm_client import LLMClient
+
 
+def generate_questions_node(state: AgentState) -> Dict:
+    attempts = state.question_generation_attempts + 1
 
-def generate_questions_node(state: AgentState) -> AgentState:
-    agent = QuestionGenerationAgent()
+    # First attempt: deterministic rule-based set
+    if not state.generated_questions:
+        questions = QuestionGenerationAgent().generate(state.normalized_product_a)
 
-    questions = agent.generate(state.normalized_product_a)
+        return {
+            "generated_questions": questions,
+            "question_count": len(questions),
+            "question_generation_attempts": attempts,
+            "question_generation_stalled": False,
+            "execution_log": [
+                f"Generated {len(questions)} questions "
+                f"(attempt {attempts})"
+            ],
+        }
 
-    state.generated_questions = questions
-    state.question_count = len(questions)
-    state.question_generation_attempts += 1
+    # Retry: top up only the short categories, keep what we have
+    llm = LLMClient() if state.question_expansion_enabled else None
+    agent = QuestionGenerationAgent(llm_client=llm)
 
-    state.execution_log.append(
-        f"Generated {state.question_count} questions "
-        f"(attempt {state.question_generation_attempts})"
+    questions = agent.top_up(
+        state.normalized_product_a,
+        state.generated_questions,
+        state.min_required_questions
     )
+    added = len(questions) - len(state.generated_questions)
+
+    log = [f"Topped up {added} questions, {len(questions)} total (attempt {attempts})"]
+    if llm is not None:
+        log.append(llm.usage_summary())
 
-    return state
+    return {
+        "generated_questions": questions,
+        "question_count": len(questions),
+        "question_generation_attempts": attempts,
+        "question_generation_stalled": added <= 0,
+        "execution_log": log,
+    }
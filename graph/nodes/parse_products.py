@@ -1,16 +1,20 @@
+from typing import Dict
+
 from graph.state import AgentState
 from agents.parser_agent import ParserAgent
 
 
-def parse_products_node(state: AgentState) -> AgentState:
+def parse_products_node(state: AgentState) -> Dict:
     parser = ParserAgent()
 
     try:
-        state.normalized_product_a = parser.parse(state.raw_product_a)
-        state.normalized_product_b = parser.parse(state.raw_product_b)
-        state.execution_log.append("Products parsed successfully")
+        return {
+            "normalized_product_a": parser.parse(state.raw_product_a),
+            "normalized_product_b": parser.parse(state.raw_product_b),
+            "execution_log": ["Products parsed successfully"],
+        }
     except Exception as e:
-        state.parse_errors.append(str(e))
-        state.execution_log.append("Parsing failed")
-
-    return state
+        return {
+            "parse_errors": state.parse_errors + [str(e)],
+            "execution_log": ["Parsing failed"],
+        }
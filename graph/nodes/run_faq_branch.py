@@ -0,0 +1,42 @@
+from typing import Callable, Dict
+
+from graph.state import AgentState
+
+
+# Fields owned by the FAQ branch. Only these are written back to
+# the parent graph, so the branch never collides with the
+# product-page or comparison branches running beside it.
+FAQ_BRANCH_FIELDS = (
+    "generated_questions",
+    "question_count",
+    "question_generation_attempts",
+    "faq_context_map",
+    "faq_answers",
+    "faq_answer_errors",
+    "faq_manifest",
+    "faq_page",
+    "retry_flags",
+    "schema_validation_errors",
+)
+
+
+def make_faq_branch_node(faq_graph) -> Callable[[AgentState], Dict]:
+    """
+    Wraps the compiled FAQ subgraph as a single parent-graph node.
+
+    Running the whole branch inside one node lets it overlap with the
+    comparison branch for its full duration, instead of being held
+    back at every superstep boundary.
+    """
+
+    def run_faq_branch_node(state: AgentState) -> Dict:
+        result = faq_graph.invoke(state)
+
+        update = {field: result[field] for field in FAQ_BRANCH_FIELDS}
+
+        # The subgraph's log starts from the parent's log; keep only new entries
+        update["execution_log"] = result["execution_log"][len(state.execution_log):]
+
+        return update
+
+    return run_faq_branch_node
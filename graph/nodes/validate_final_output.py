@@ -1,44 +1,30 @@
+from typing import Dict
+
 from graph.state import AgentState
-from schemas.faq_schema import FAQPageSchema
-from schemas.product_schema import ProductPageSchema
-from schemas.comparison_schema import ComparisonPageSchema
-from pydantic import ValidationError
+from utils.validators import validate_page
 
 
-def validate_final_output_node(state: AgentState) -> AgentState:
+def validate_final_output_node(state: AgentState) -> Dict:
     errors = {}
 
-    # -------------------------
-    # FAQ validation
-    # -------------------------
-    try:
-        FAQPageSchema(**state.faq_page)
-    except ValidationError as e:
-        errors["faq"] = e.errors()
-
-    # -------------------------
-    # Product page validation
-    # -------------------------
-    try:
-        ProductPageSchema(**state.product_page)
-    except ValidationError as e:
-        errors["product"] = e.errors()
-
-    # -------------------------
-    # Comparison page validation
-    # -------------------------
-    try:
-        ComparisonPageSchema(**state.comparison_page)
-    except ValidationError as e:
-        errors["comparison"] = e.errors()
+    # Compiled schema + template contracts (utils/validators.py)
+    pages = {
+        "faq": state.faq_page,
+        "product": state.product_page,
+        "comparison": state.comparison_page,
+    }
 
-    state.schema_validation_errors = errors
+    for page_type, page in pages.items():
+        page_errors = validate_page(page_type, page or {})
+        if page_errors:
+            errors[page_type] = page_errors
 
     if errors:
-        state.execution_log.append(
-            f"Schema validation failed: {list(errors.keys())}"
-        )
+        log_entry = f"Schema validation failed: {list(errors.keys())}"
     else:
-        state.execution_log.append("All output schemas validated successfully")
+        log_entry = "All output schemas validated successfully"
 
-    return state
+    return {
+        "schema_validation_errors": errors,
+        "execution_log": [log_entry],
+    }
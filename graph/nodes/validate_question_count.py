@@ -1,28 +1,48 @@
+from typing import Dict
+
 from graph.state import AgentState
 
 
-def validate_question_count_node(state: AgentState) -> AgentState:
+def validate_question_count_node(state: AgentState) -> Dict:
+    retry_flags = dict(state.retry_flags)
+    schema_validation_errors = dict(state.schema_validation_errors)
+
     if state.question_count < state.min_required_questions:
         if state.question_generation_attempts >= state.max_question_generation_attempts:
-            state.retry_flags["questions"] = False
-            state.schema_validation_errors["questions"] = (
+            retry_flags["questions"] = False
+            schema_validation_errors["questions"] = (
                 f"Failed to generate >=15 questions after "
                 f"{state.question_generation_attempts} attempts"
             )
-            state.execution_log.append(
-                "Max question generation retries reached — aborting retry"
+            log_entry = "Max question generation retries reached — aborting retry"
+        elif state.question_generation_stalled or not state.question_expansion_enabled:
+            # Rule-based generation is deterministic: without LLM expansion
+            # (or after an attempt that added nothing) a retry cannot help
+            retry_flags["questions"] = False
+            schema_validation_errors["questions"] = (
+                f"Only {state.question_count} questions after "
+                f"{state.question_generation_attempts} attempts; "
+                f"a retry cannot add more"
+            )
+            log_entry = (
+                "Question generation made no progress — stopping retries "
+                f"(attempt {state.question_generation_attempts})"
             )
         else:
-            state.retry_flags["questions"] = True
-            state.execution_log.append(
+            retry_flags["questions"] = True
+            log_entry = (
                 f"FAQ count < 15, retrying "
                 f"(attempt {state.question_generation_attempts})"
             )
     else:
-        state.retry_flags["questions"] = False
-        state.execution_log.append("FAQ count validated")
+        retry_flags["questions"] = False
+        log_entry = "FAQ count validated"
 
-    return state
+    return {
+        "retry_flags": retry_flags,
+        "schema_validation_errors": schema_validation_errors,
+        "execution_log": [log_entry],
+    }
 
 
 def route_after_question_validation(state: AgentState) -> str:
@@ -1,8 +1,19 @@
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional
+import operator
+
 from pydantic import BaseModel, Field
 
 
 class AgentState(BaseModel):
+    """
+    Shared graph state.
+
+    Nodes return partial updates (dicts) rather than the full state,
+    because the FAQ, product-page and comparison branches run in
+    parallel. Each branch writes only its own fields; execution_log
+    is the one shared field and uses an append reducer.
+    """
+
     # ------------------
     # Input
     # ------------------
@@ -24,6 +35,10 @@ class AgentState(BaseModel):
     question_generation_attempts: int = 0
     max_question_generation_attempts: int = 5
     min_required_questions: int = 15
+    # Retries top up short categories via the LLM; without it a retry
+    # cannot add questions, so validation stops instead of looping
+    question_expansion_enabled: bool = False
+    question_generation_stalled: bool = False
 
 
     # ------------------
@@ -32,6 +47,18 @@ class AgentState(BaseModel):
     faq_context_map: Dict = Field(default_factory=dict)
     faq_answers: List[Dict] = Field(default_factory=list)
     faq_answer_errors: List[str] = Field(default_factory=list)
+    max_faq_answer_workers: int = 4  # 1 = sequential
+    faq_answer_batch_mode: str = "off"  # "off" | "category" | "page"
+    # Extra single-question calls allowed per page to re-request answers
+    # that errored or failed AnswerGenerationAgent.validate_answer
+    faq_answer_retry_budget: int = 6
+
+    # ------------------
+    # Incremental regeneration (see utils/generation_manifest.py)
+    # ------------------
+    previous_manifest: Dict = Field(default_factory=dict)  # from the last run
+    faq_manifest: Dict = Field(default_factory=dict)
+    comparison_manifest: Dict = Field(default_factory=dict)
 
     # ------------------
     # Pages
@@ -39,10 +66,12 @@ class AgentState(BaseModel):
     faq_page: Optional[Dict] = None
     product_page: Optional[Dict] = None
     comparison_page: Optional[Dict] = None
+    # Comparison sections built from fallback content (provider down)
+    comparison_fallbacks: List[str] = Field(default_factory=list)
 
     # ------------------
     # Validation & Control
     # ------------------
     schema_validation_errors: Dict = Field(default_factory=dict)
     retry_flags: Dict = Field(default_factory=dict)
-    execution_log: List[str] = Field(default_factory=list)
+    execution_log: Annotated[List[str], operator.add] = Field(default_factory=list)
@@ -0,0 +1,121 @@
+# llm/backends.py
+"""
+Pluggable LLM backend interface.
+
+A backend performs exactly one provider round trip:
+    complete(request: LLMRequest) -> LLMResponse
+
+Clients (LLMClient, ComparisonClient) layer caching, rate limiting,
+retries and accounting on top of whichever backend they are given:
+- Live SDK backends (AnthropicBackend, GroqBackend)
+- FakeLLMBackend for offline tests and load benchmarks
+- RecordingBackend / ReplayBackend for captured production traffic
+
+Backend selection, in priority order:
+1. `backend=` passed to the client
+2. A process-wide override set with `set_default_backend()`
+3. LLM_BACKEND in config ("live", "fake", "record" or "replay")
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+from config.system_config import (
+    LLM_BACKEND,
+    FAKE_LLM_SETTINGS,
+    LLM_CASSETTE_PATH,
+    LLM_CASSETTE_LATENCY_SCALE,
+)
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    """
+    One generation request, as seen by a backend.
+    """
+    provider: str
+    model: str
+    prompt: str
+    temperature: float
+    max_tokens: Optional[int] = None
+    system: Optional[str] = None
+    # Seconds one attempt may take (None = SDK default)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class LLMResponse:
+    """
+    Raw provider output plus token accounting.
+    """
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    headers: Optional[Mapping] = None
+
+
+class LLMBackend:
+    """
+    Interface implemented by every backend.
+    """
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
+        raise NotImplementedError
+
+
+# ----------------------------------------------------------------------
+# Selection
+# ----------------------------------------------------------------------
+
+_default_backend: Optional[LLMBackend] = None
+
+
+def set_default_backend(backend: Optional[LLMBackend]) -> None:
+    """
+    Routes every client created afterwards (in this process) to `backend`.
+    Pass None to restore config-based selection.
+    """
+    global _default_backend
+    _default_backend = backend
+
+
+def resolve_backend(live_factory: Callable[[], LLMBackend]) -> LLMBackend:
+    """
+    Picks the backend for a new client. `live_factory` builds the real
+    SDK backend and is only called when a live backend is needed, so
+    offline runs never require API keys.
+    """
+    if _default_backend is not None:
+        return _default_backend
+
+    if LLM_BACKEND == "fake":
+        from llm.fake_backend import FakeLLMBackend
+        return FakeLLMBackend(**FAKE_LLM_SETTINGS)
+
+    if LLM_BACKEND == "replay":
+        from llm.cassette import Cassette, ReplayBackend
+        return _shared_backend(
+            "replay",
+            lambda: ReplayBackend(Cassette(LLM_CASSETTE_PATH), LLM_CASSETTE_LATENCY_SCALE)
+        )
+
+    if LLM_BACKEND == "record":
+        from llm.cassette import Cassette, RecordingBackend
+        return RecordingBackend(live_factory(), Cassette(LLM_CASSETTE_PATH))
+
+    if LLM_BACKEND != "live":
+        raise ValueError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
+
+    return live_factory()
+
+
+_shared_backends: Dict[str, LLMBackend] = {}
+
+
+def _shared_backend(name: str, factory: Callable[[], LLMBackend]) -> LLMBackend:
+    # Loading a cassette is not free; every client in the process shares one
+    if name not in _shared_backends:
+        _shared_backends[name] = factory()
+    return _shared_backends[name]
@@ -0,0 +1,296 @@
+# llm/base_client.py
+
+from typing import Callable, Dict, Optional, Tuple
+import threading
+
+from llm.backends import LLMBackend, LLMRequest, LLMResponse
+from llm.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from llm.hedging import Hedger, get_hedger
+from llm.rate_limiter import RateLimiter, error_headers, get_rate_limiter, is_throttle_error
+from llm.response_cache import ResponseCache, get_default_cache
+from llm.retry import RetryPolicy, get_retry_policy
+from utils.instrumentation import span
+
+
+class BaseLLMClient:
+    """
+    Shared request path for provider clients.
+
+    The provider round trip itself is delegated to an LLMBackend
+    (live SDK or fake, see llm/backends.py).
+    This class owns everything that is provider-agnostic:
+    - Response caching
+    - Token usage counters (including provider prompt-cache reads/writes)
+    - Process-wide rate limiting per provider
+    - Retries of transient failures with jittered backoff, a per-attempt
+      timeout and a per-provider retry budget (llm/retry.py)
+    - Optional hedging of slow calls, to the same or the other
+      provider (llm/hedging.py)
+    - A per-provider circuit breaker that fails fast with
+      CircuitOpenError while the provider is down (llm/circuit_breaker.py)
+    - An "llm" instrumentation span per generate() call
+    """
+
+    provider: str = "unknown"
+
+    # Provider header names for remaining budget: {"requests": ..., "tokens": ...}
+    rate_limit_headers: Dict[str, str] = {}
+
+    # Output budget assumed for rate limiting when max_tokens is unset
+    DEFAULT_OUTPUT_TOKEN_ESTIMATE = 500
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedger: Optional[Hedger] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        self.backend = backend
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+        # Fall back to process-wide instances (None when disabled / unconfigured)
+        self.cache = cache if cache is not None else get_default_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter(self.provider)
+        self.retry_policy = retry_policy if retry_policy is not None else get_retry_policy(self.provider)
+        self.hedger = hedger if hedger is not None else get_hedger(self.provider)
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else get_circuit_breaker(self.provider)
+        )
+
+        self._usage_lock = threading.Lock()
+        self.usage = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+            "rate_limit_wait_seconds": 0.0,
+            "retries": 0,
+            "retry_wait_seconds": 0.0,
+            "hedges_won": 0,
+            "hedged_calls": 0,
+            "hedged_input_tokens": 0,
+            "hedged_output_tokens": 0,
+        }
+
+    def generate(
+        self,
+        prompt: str,
+        use_cache: bool = True,
+        max_tokens: Optional[int] = None,
+        system: Optional[str] = None,
+        refresh_cache: bool = False,
+        cache_if: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Sends a prompt to the provider and returns raw text output.
+
+        Parameters:
+        - prompt (str): The prompt to send to the LLM
+        - use_cache (bool): Set False to bypass the response cache
+        - max_tokens (int, optional): Per-call override of the output budget
+        - system (str, optional): Stable instructions/data sent ahead of the
+          prompt. Providers that support prefix caching cache this block.
+        - refresh_cache (bool): Skip the cached response but store the new
+          one, replacing a response the caller rejected
+        - cache_if (callable, optional): Only responses it accepts are
+          stored; a cached response it rejects is treated as a miss
+
+        Returns:
+        - str: Raw response text
+        """
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+        cache = self.cache if use_cache else None
+        key = None
+
+        with span(self.provider, "llm", model=self.model) as call:
+            if cache is not None:
+                key = cache.make_key(
+                    provider=self.provider,
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=max_tokens,
+                    prompt=prompt,
+                    system=system
+                )
+                cached = None if refresh_cache else cache.get(key)
+                if cached is not None and (cache_if is None or cache_if(cached)):
+                    call.set(cache_hit=True)
+                    return cached
+
+            # Each attempt takes its own rate-limiter slot; backoff
+            # sleeps happen outside the slot
+            outcome = self.retry_policy.call(
+                lambda: self._attempt(prompt, max_tokens, system)
+            )
+            response, waited, source = outcome.value
+            self._record_usage(response, outcome.retries, outcome.waited)
+
+            call.set(
+                cache_hit=False,
+                input_tokens=response.input_tokens,
+                output_tokens=response.output_tokens,
+                cache_read_tokens=response.cache_read_tokens,
+                rate_limit_wait_ms=round(waited * 1000.0, 3),
+                retries=outcome.retries,
+                retry_wait_ms=round(outcome.waited * 1000.0, 3),
+                hedge_won=source is not None,
+                hedge_provider=source,
+            )
+
+            # Empty output is almost always a failure; never pin it, nor
+            # output the caller rejects.
+            # Another provider's answer is not cached under this key.
+            if (
+                cache is not None
+                and response.text
+                and source in (None, self.provider)
+                and (cache_if is None or cache_if(response.text))
+            ):
+                cache.set(key, response.text)
+
+            return response.text
+
+    def usage_stats(self) -> Dict:
+        with self._usage_lock:
+            return dict(self.usage)
+
+    def usage_summary(self) -> str:
+        """
+        One-line usage report for the execution log.
+        """
+        usage = self.usage_stats()
+        return (
+            f"{self.provider} usage: {usage['calls']} calls, "
+            f"{usage['input_tokens']} input tokens "
+            f"(prompt cache read {usage['cache_read_tokens']} / "
+            f"write {usage['cache_write_tokens']}), "
+            f"{usage['output_tokens']} output tokens, "
+            f"{usage['rate_limit_wait_seconds']:.2f}s rate-limit wait, "
+            f"{usage['retries']} retries ({usage['retry_wait_seconds']:.2f}s backoff)"
+            + (
+                f", {usage['hedges_won']} hedges won, {usage['hedged_calls']} discarded "
+                f"({usage['hedged_input_tokens']} input / {usage['hedged_output_tokens']} output tokens)"
+                if self.hedger is not None else ""
+            )
+        )
+
+    def _record_usage(self, response: LLMResponse, retries: int = 0, retry_wait: float = 0.0) -> None:
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            self.usage["retries"] += retries
+            self.usage["retry_wait_seconds"] += retry_wait
+            self.usage["input_tokens"] += response.input_tokens
+            self.usage["output_tokens"] += response.output_tokens
+            self.usage["cache_read_tokens"] += response.cache_read_tokens
+            self.usage["cache_write_tokens"] += response.cache_write_tokens
+
+    def _record_discarded(self, response: LLMResponse) -> None:
+        """
+        Counts a hedge loser that still completed. Kept apart from
+        "calls" so that stays one per logical request.
+        """
+        with self._usage_lock:
+            self.usage["hedged_calls"] += 1
+            self.usage["hedged_input_tokens"] += response.input_tokens
+            self.usage["hedged_output_tokens"] += response.output_tokens
+
+    def _attempt(
+        self, prompt: str, max_tokens: Optional[int], system: Optional[str]
+    ) -> Tuple[LLMResponse, float, Optional[str]]:
+        """
+        One provider call, hedged if a hedger is configured.
+        Returns the response, the rate-limit wait and, when a hedge won,
+        the provider that answered (None if the primary did).
+        """
+        if self.hedger is None:
+            return (*self._call_provider(prompt, max_tokens, system), None)
+
+        target = self.hedger.alternate_client() or self
+        # Some providers require an output budget (Anthropic); fall back
+        # to the target's own when this client leaves it unset
+        hedge_tokens = max_tokens if max_tokens is not None else target.max_tokens
+
+        (response, waited), hedge_won = self.hedger.run(
+            lambda: self._call_provider(prompt, max_tokens, system),
+            lambda: target._call_provider(prompt, hedge_tokens, system),
+            # The loser's tokens were spent on this call too
+            on_discard=lambda result: self._record_discarded(result[0])
+        )
+
+        if not hedge_won:
+            return response, waited, None
+
+        with self._usage_lock:
+            self.usage["hedges_won"] += 1
+        return response, waited, target.provider
+
+    def _call_provider(
+        self, prompt: str, max_tokens: Optional[int], system: Optional[str]
+    ) -> Tuple[LLMResponse, float]:
+        """
+        Runs one provider call behind the circuit breaker (if configured),
+        which raises CircuitOpenError before queueing for a rate-limit slot.
+        """
+        if self.circuit_breaker is None:
+            return self._call_limited(prompt, max_tokens, system)
+
+        with self.circuit_breaker.guard():
+            return self._call_limited(prompt, max_tokens, system)
+
+    def _call_limited(
+        self, prompt: str, max_tokens: Optional[int], system: Optional[str]
+    ) -> Tuple[LLMResponse, float]:
+        """
+        Runs one provider call inside a rate-limiter slot (if configured)
+        and feeds the outcome back to the limiter.
+        Returns the response and the seconds spent waiting for the slot.
+        """
+        if self.rate_limiter is None:
+            return self._complete(prompt, max_tokens, system), 0.0
+
+        with self.rate_limiter.slot(self._estimate_tokens(prompt, max_tokens, system)) as ticket:
+            try:
+                response = self._complete(prompt, max_tokens, system)
+            except Exception as e:
+                ticket.throttled = is_throttle_error(e)
+                ticket.observe_headers(error_headers(e), self.rate_limit_headers)
+                raise
+
+            if response.input_tokens or response.output_tokens:
+                ticket.actual_tokens = response.input_tokens + response.output_tokens
+            ticket.observe_headers(response.headers, self.rate_limit_headers)
+
+        with self._usage_lock:
+            self.usage["rate_limit_wait_seconds"] += ticket.waited
+
+        return response, ticket.waited
+
+    def _estimate_tokens(self, prompt: str, max_tokens: Optional[int], system: Optional[str]) -> int:
+        """
+        Rough pre-call estimate (~4 characters per token) plus the output budget.
+        """
+        input_chars = len(prompt) + len(system or "")
+        output_tokens = max_tokens if max_tokens is not None else self.DEFAULT_OUTPUT_TOKEN_ESTIMATE
+        return input_chars // 4 + output_tokens
+
+    def _complete(self, prompt: str, max_tokens: Optional[int], system: Optional[str]) -> LLMResponse:
+        return self.backend.complete(
+            LLMRequest(
+                provider=self.provider,
+                model=self.model,
+                prompt=prompt,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                system=system,
+                timeout=self.retry_policy.timeout
+            )
+        )
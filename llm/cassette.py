@@ -0,0 +1,252 @@
+# llm/cassette.py
+"""
+Record / replay of real LLM traffic.
+
+RecordingBackend wraps a live backend. Each successful round trip is
+appended to a cassette: prompt, response text, token usage and the
+measured latency.
+ReplayBackend serves those responses back with no network access,
+optionally sleeping for the recorded latency. Graph changes can then be
+benchmarked against realistic response sizes and timings.
+
+Cassette format: one JSON object per line. A ".gz" path writes every
+line as its own gzip member, which keeps the file compact, crash-safe
+and appendable by several processes at once.
+
+Lookup order on replay:
+1. Exact request key (provider, model, temperature, max_tokens, prompt, system)
+2. Prompt hash (prompt + system only), so settings tweaks still replay
+Repeated requests are served in recorded order; the last recording
+repeats once they run out.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from llm.backends import LLMBackend, LLMRequest, LLMResponse
+from llm.response_cache import ResponseCache
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised on replay when a request was never recorded.
+    """
+
+
+def prompt_hash(prompt: str, system: Optional[str] = None) -> str:
+    payload = f"{system or ''}\x00{prompt}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def request_key(request: LLMRequest) -> str:
+    return ResponseCache.make_key(
+        provider=request.provider,
+        model=request.model,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+        prompt=request.prompt,
+        system=request.system
+    )
+
+
+class Cassette:
+    """
+    Append-only JSONL file of recorded responses.
+    """
+
+    def __init__(self, path: str):
+        cassette_path = Path(path)
+        if not cassette_path.is_absolute():
+            cassette_path = PROJECT_ROOT / cassette_path
+
+        self.path = cassette_path
+        self.compressed = cassette_path.suffix == ".gz"
+
+    def append(self, entry: Dict) -> None:
+        """
+        Writes one entry with a single O_APPEND write, so concurrent
+        threads and processes never interleave partial lines.
+        """
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        if self.compressed:
+            line = gzip.compress(line)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def load(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+
+        raw = self.path.read_bytes()
+        if self.compressed:
+            raw = _decompress_members(raw)
+
+        entries = []
+        for line in raw.decode("utf-8").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Partial trailing line from an interrupted recording
+                continue
+        return entries
+
+
+class RecordingBackend(LLMBackend):
+    """
+    Passes requests to `inner` and records every successful response.
+    """
+
+    def __init__(self, inner: LLMBackend, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
+        started = time.perf_counter()
+        response = self.inner.complete(request)
+        latency_ms = (time.perf_counter() - started) * 1000.0
+
+        self.cassette.append({
+            "key": request_key(request),
+            "prompt_hash": prompt_hash(request.prompt, request.system),
+            "provider": request.provider,
+            "model": request.model,
+            "prompt": request.prompt,
+            "text": response.text,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+            "cache_read_tokens": response.cache_read_tokens,
+            "cache_write_tokens": response.cache_write_tokens,
+            "latency_ms": round(latency_ms, 1),
+        })
+
+        with self._lock:
+            self.recorded += 1
+
+        return response
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Serves recorded responses. Unknown requests go to `fallback` if
+    given, otherwise raise CassetteMissError.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_scale: float = 0.0,
+        fallback: Optional[LLMBackend] = None
+    ):
+        """
+        Parameters
+        ----------
+        cassette : Cassette
+            Recorded traffic to serve.
+        latency_scale : float
+            Multiplier applied to recorded latencies (0 = no sleep,
+            1 = recorded timings).
+        fallback : LLMBackend, optional
+            Backend used for requests missing from the cassette.
+        """
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+
+        self._by_key: Dict[str, List[Dict]] = defaultdict(list)
+        self._by_prompt: Dict[str, List[Dict]] = defaultdict(list)
+        for entry in cassette.load():
+            self._by_key[entry["key"]].append(entry)
+            self._by_prompt[entry["prompt_hash"]].append(entry)
+
+        self._lock = threading.Lock()
+        self._served: Dict[str, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
+        entry = self._lookup(request)
+
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            if self.fallback is not None:
+                return self.fallback.complete(request)
+            raise CassetteMissError(
+                f"No recorded response for {request.provider}/{request.model} "
+                f"prompt {prompt_hash(request.prompt, request.system)[:12]}"
+            )
+
+        if self.latency_scale > 0:
+            time.sleep(entry.get("latency_ms", 0.0) / 1000.0 * self.latency_scale)
+
+        return LLMResponse(
+            text=entry["text"],
+            input_tokens=entry.get("input_tokens", 0),
+            output_tokens=entry.get("output_tokens", 0),
+            cache_read_tokens=entry.get("cache_read_tokens", 0),
+            cache_write_tokens=entry.get("cache_write_tokens", 0)
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "recorded_keys": len(self._by_key),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _lookup(self, request: LLMRequest) -> Optional[Dict]:
+        for index, digest in (
+            (self._by_key, request_key(request)),
+            (self._by_prompt, prompt_hash(request.prompt, request.system)),
+        ):
+            entries = index.get(digest)
+            if not entries:
+                continue
+
+            with self._lock:
+                position = self._served[digest]
+                self._served[digest] = position + 1
+                self.hits += 1
+
+            return entries[min(position, len(entries) - 1)]
+
+        return None
+
+
+def _decompress_members(raw: bytes) -> bytes:
+    """
+    Decodes concatenated gzip members, stopping quietly at a
+    truncated final member.
+    """
+    out = []
+    while raw:
+        decoder = zlib.decompressobj(wbits=31)
+        try:
+            out.append(decoder.decompress(raw))
+        except zlib.error:
+            break
+        if not decoder.eof:
+            break
+        raw = decoder.unused_data
+    return b"".join(out)
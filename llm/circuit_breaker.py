@@ -0,0 +1,224 @@
+# llm/circuit_breaker.py
+"""
+Process-wide, per-provider circuit breakers for LLM calls.
+
+States:
+- closed     calls go through; outcomes fill a sliding window
+- open       tripped when provider failures in the window reach
+             failure_rate (with at least min_calls outcomes).
+             Calls fail immediately with CircuitOpenError for
+             open_seconds
+- half_open  after open_seconds, up to half_open_probes calls are let
+             through as probes. probe_successes successes close the
+             circuit; any failure reopens it
+
+Only provider-side failures count (throttling, 5xx, timeouts, dropped
+connections; see llm/retry.py). A bad request says nothing about
+provider health.
+
+CircuitOpenError is not retryable, so a dead endpoint costs callers
+one exception instead of a full timeout per call. Callers with
+deterministic content to fall back on (ComparisonAgent) use it.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import threading
+import time
+
+from config.system_config import CIRCUIT_BREAKER
+from llm.retry import is_retryable
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling a provider whose circuit is open.
+    """
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"{provider} circuit is open (provider failing); "
+            f"next probe in {retry_in:.1f}s"
+        )
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Thread-safe breaker for one provider.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        probe_successes: int = 2,
+        clock=time.monotonic
+    ):
+        self.provider = provider
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.probe_successes = probe_successes
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True = failure
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.opened = 0
+        self.rejected = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(self._clock())
+            return self._state
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Wraps one provider call. Raises CircuitOpenError without
+        running the body if the circuit is open (or its probe slots
+        are taken), otherwise records the outcome.
+        """
+        probe = self._admit()
+
+        try:
+            yield
+        except BaseException as e:
+            self._record(probe, failed=isinstance(e, Exception) and is_retryable(e))
+            raise
+
+        self._record(probe, failed=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._advance(self._clock())
+            failures = sum(self._outcomes)
+            return {
+                "provider": self.provider,
+                "state": self._state,
+                "window_calls": len(self._outcomes),
+                "window_failures": failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _admit(self) -> bool:
+        """
+        Returns True if the call is a half-open probe.
+        """
+        with self._lock:
+            now = self._clock()
+            self._advance(now)
+
+            if self._state == "closed":
+                return False
+
+            if self._state == "half_open" and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.open_seconds - now)
+
+        raise CircuitOpenError(self.provider, retry_in)
+
+    def _record(self, probe: bool, failed: bool) -> None:
+        with self._lock:
+            if probe:
+                self._probes_in_flight -= 1
+
+                if failed:
+                    self._open(self._clock())
+                    return
+
+                self._probe_successes += 1
+                if self._probe_successes >= self.probe_successes:
+                    self._state = "closed"
+                    self._outcomes.clear()
+                return
+
+            if self._state != "closed":
+                # A call admitted before the circuit opened
+                return
+
+            self._outcomes.append(failed)
+            failures = sum(self._outcomes)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures >= self.failure_rate * len(self._outcomes)
+            ):
+                self._open(self._clock())
+
+    def _open(self, now: float) -> None:
+        self._state = "open"
+        self._opened_at = now
+        self._probe_successes = 0
+        self.opened += 1
+
+    def _advance(self, now: float) -> None:
+        if self._state == "open" and now - self._opened_at >= self.open_seconds:
+            self._state = "half_open"
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_enabled = CIRCUIT_BREAKER["enabled"]
+
+
+def set_circuit_breakers_enabled(enabled: bool) -> None:
+    """
+    Turns breakers on or off for clients created afterwards and
+    forgets existing breaker state.
+    """
+    global _enabled
+
+    with _breakers_lock:
+        _enabled = enabled
+        _breakers.clear()
+
+
+def get_circuit_breaker(provider: str) -> Optional[CircuitBreaker]:
+    """
+    Returns the shared breaker for a provider, or None if disabled.
+    """
+    with _breakers_lock:
+        if not _enabled:
+            return None
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(
+                provider=provider,
+                failure_rate=CIRCUIT_BREAKER["failure_rate"],
+                min_calls=CIRCUIT_BREAKER["min_calls"],
+                window=CIRCUIT_BREAKER["window"],
+                open_seconds=CIRCUIT_BREAKER["open_seconds"],
+                half_open_probes=CIRCUIT_BREAKER["half_open_probes"],
+                probe_successes=CIRCUIT_BREAKER["probe_successes"],
+            )
+        return _breakers[provider]
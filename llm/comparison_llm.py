@@ -1,40 +1,109 @@
 # llm/groq_client.py
+from typing import Optional
 from dotenv import load_dotenv
 import os
-from groq import Groq
+
+from llm.backends import LLMBackend, LLMRequest, LLMResponse, resolve_backend
+from llm.base_client import BaseLLMClient
+from llm.circuit_breaker import CircuitBreaker
+from llm.hedging import Hedger
+from llm.rate_limiter import RateLimiter
+from llm.response_cache import ResponseCache
+from llm.retry import RetryPolicy
 
 load_dotenv()
 
-class ComparisonClient:
+
+class GroqBackend(LLMBackend):
     """
-    Wrapper around Groq API for fast LLM inference.
+    Live backend: one Groq chat completion per request.
     """
-    def __init__(
-        self,
-        model: str = "llama-3.3-70b-versatile",  # Best model
-        temperature: float = 0.3
-    ):
+
+    def __init__(self):
+        from groq import Groq
+
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment")
-        
-        self.model_name = model
-        self.temperature = temperature
-        self.client = Groq(api_key=api_key)
-    
-    def generate(self, prompt: str) -> str:
+
+        # Retries are handled by BaseLLMClient (llm/retry.py)
+        self.client = Groq(api_key=api_key, max_retries=0)
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
         """
         Sends a prompt to Groq and returns raw text output.
+
+        The system message is sent first so that prompts sharing it
+        also share a prefix (Groq caches prefixes automatically on
+        models that support it).
+
+        SDK errors propagate unchanged, so BaseLLMClient can classify
+        them (status code, retry-after) for rate limiting and retries.
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature
-            )
-            return response.choices[0].message.content.strip()
-        
-        except Exception as e:
-            raise Exception(f"Error generating content: {str(e)}") from e
\ No newline at end of file
+        messages = []
+        if request.system:
+            messages.append({"role": "system", "content": request.system})
+        messages.append({"role": "user", "content": request.prompt})
+
+        options = {}
+        if request.max_tokens is not None:
+            options["max_tokens"] = request.max_tokens
+        if request.timeout is not None:
+            options["timeout"] = request.timeout
+
+        raw = self.client.chat.completions.with_raw_response.create(
+            model=request.model,
+            messages=messages,
+            temperature=request.temperature,
+            **options
+        )
+
+        response = raw.parse()
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None)
+
+        return LLMResponse(
+            text=response.choices[0].message.content.strip(),
+            input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cache_read_tokens=getattr(details, "cached_tokens", 0) or 0,
+            headers=raw.headers
+        )
+
+
+class ComparisonClient(BaseLLMClient):
+    """
+    Wrapper around Groq API for fast LLM inference.
+    """
+
+    provider = "groq"
+    rate_limit_headers = {
+        "requests": "x-ratelimit-remaining-requests",
+        "tokens": "x-ratelimit-remaining-tokens",
+    }
+
+    def __init__(
+        self,
+        model: str = "llama-3.3-70b-versatile",  # Best model
+        temperature: float = 0.3,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        backend: Optional[LLMBackend] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedger: Optional[Hedger] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(
+            backend=backend if backend is not None else resolve_backend(GroqBackend),
+            model=model,
+            temperature=temperature,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            hedger=hedger,
+            circuit_breaker=circuit_breaker
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self.model
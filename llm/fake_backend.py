@@ -0,0 +1,219 @@
+# llm/fake_backend.py
+"""
+Deterministic, offline LLM backend for tests and load benchmarks.
+
+- Output text is a pure function of the prompt (same prompt, same text)
+  and is shaped like what the pipeline expects: short answers, JSON
+  arrays for batched FAQ prompts, JSON objects for question expansion.
+- Latency is drawn from a configurable model:
+    "fixed"     latency_ms every call
+    "lognormal" median latency_ms, spread sigma
+    "pareto"    heavy tail, minimum latency_ms, shape alpha
+- Errors (HTTP 500 by default) and rate limits (HTTP 429 with
+  retry-after) are injected at configurable rates, optionally only
+  for some providers.
+- A request timeout is honoured: a draw slower than request.timeout
+  sleeps for the timeout and raises TimeoutError.
+
+Random draws are seeded per (seed, prompt, attempt), so results do not
+depend on thread scheduling.
+"""
+
+from typing import Dict, Iterable, Optional
+import ast
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from llm.backends import LLMBackend, LLMRequest, LLMResponse
+
+
+_SENTENCES = [
+    "It is formulated to deliver the benefits listed in the product data.",
+    "Apply it as described in the usage instructions for best results.",
+    "It suits the skin types listed in the product data.",
+    "Mild, temporary side effects are possible for sensitive skin.",
+    "Its key ingredients work together to support the stated benefits.",
+    "The price reflects its concentration and ingredient profile.",
+    "Patch testing is recommended before first use.",
+    "Results depend on consistent use over several weeks.",
+]
+
+
+class FakeAPIResponse:
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+
+
+class FakeAPIError(Exception):
+    """
+    Mirrors the SDK error shape (status_code, response.headers) so
+    rate limiting and retry classification treat it like a real one.
+    """
+
+    def __init__(self, message: str, status_code: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = FakeAPIResponse(headers or {})
+
+
+class FakeLLMBackend(LLMBackend):
+
+    def __init__(
+        self,
+        latency: str = "fixed",
+        latency_ms: float = 0.0,
+        sigma: float = 0.5,
+        alpha: float = 1.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_s: float = 1.0,
+        seed: int = 0,
+        error_status: int = 500,
+        error_providers: Optional[Iterable[str]] = None
+    ):
+        """
+        error_status: HTTP status of injected errors (500 is retryable,
+        a 4xx is not). error_providers: inject errors and rate limits
+        only for these providers (None = all).
+        """
+        if latency not in ("fixed", "lognormal", "pareto"):
+            raise ValueError(f"Unknown latency model: {latency}")
+
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.alpha = alpha
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_s = retry_after_s
+        self.seed = seed
+        self.error_status = error_status
+        self.error_providers = set(error_providers) if error_providers is not None else None
+
+        self._lock = threading.Lock()
+        self._attempts: Dict[str, int] = {}
+        self.calls = 0
+        self.calls_by_provider: Dict[str, int] = {}
+        self.errors = 0
+        self.rate_limited = 0
+        self.timeouts = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
+        digest = self._digest(request)
+
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+            self.calls += 1
+            self.calls_by_provider[request.provider] = self.calls_by_provider.get(request.provider, 0) + 1
+
+        rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+
+        latency = self._draw_latency(rng)
+        if request.timeout is not None and latency > request.timeout:
+            time.sleep(request.timeout)
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Fake request timed out after {request.timeout}s")
+
+        time.sleep(latency)
+
+        roll = rng.random()
+        if self.error_providers is not None and request.provider not in self.error_providers:
+            roll = 1.0
+
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.rate_limited += 1
+            raise FakeAPIError(
+                "Fake rate limit exceeded",
+                status_code=429,
+                headers={"retry-after": str(self.retry_after_s)}
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.errors += 1
+            raise FakeAPIError(f"Fake provider error (HTTP {self.error_status})", status_code=self.error_status)
+
+        text = self._render(request.prompt, digest)
+
+        return LLMResponse(
+            text=text,
+            input_tokens=(len(request.prompt) + len(request.system or "")) // 4,
+            output_tokens=len(text) // 4
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "calls_by_provider": dict(self.calls_by_provider),
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "timeouts": self.timeouts,
+            }
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _digest(self, request: LLMRequest) -> str:
+        payload = f"{request.system or ''}\x00{request.prompt}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _draw_latency(self, rng: random.Random) -> float:
+        base = self.latency_ms / 1000.0
+
+        if self.latency == "lognormal":
+            return rng.lognormvariate(0.0, self.sigma) * base
+        if self.latency == "pareto":
+            return rng.paretovariate(self.alpha) * base
+        return base
+
+    def _render(self, prompt: str, digest: str) -> str:
+        # Batched FAQ prompt: JSON array keyed by question id
+        if "Answer EVERY question" in prompt:
+            questions = self._extract_json(prompt[prompt.find("Questions:"):], "[")
+            if isinstance(questions, list):
+                return json.dumps([
+                    {"id": q.get("id"), "answer": self._sentences(f"{digest}:{q.get('id')}")}
+                    for q in questions if isinstance(q, dict)
+                ])
+
+        # Question expansion prompt: JSON object keyed by category
+        match = re.search(r"Keys must be exactly:\s*(\[.*?\])", prompt)
+        if match:
+            try:
+                keys = ast.literal_eval(match.group(1))
+            except (ValueError, SyntaxError):
+                keys = []
+            return json.dumps({
+                key: [f"What else should I know about {key} ({digest[:6]})?"]
+                for key in keys
+            })
+
+        return self._sentences(digest)
+
+    def _sentences(self, seed: str) -> str:
+        value = int(hashlib.sha256(seed.encode("utf-8")).hexdigest(), 16)
+        first = _SENTENCES[value % len(_SENTENCES)]
+        second = _SENTENCES[(value // len(_SENTENCES)) % len(_SENTENCES)]
+        return first if first == second else f"{first} {second}"
+
+    def _extract_json(self, text: str, opener: str):
+        start = text.find(opener)
+        while start != -1:
+            try:
+                value, _ = json.JSONDecoder().raw_decode(text[start:])
+                return value
+            except json.JSONDecodeError:
+                start = text.find(opener, start + 1)
+        return None
@@ -0,0 +1,286 @@
+# llm/hedging.py
+"""
+Hedged requests for LLM calls (tail latency).
+
+A hedged call starts the primary request and, if it has not returned
+after the provider's recent p<percentile> latency, fires one duplicate.
+The duplicate goes either to the same provider or to the other one
+(LLMClient <-> ComparisonClient). The first success wins.
+
+Extra spend is capped: at most max_hedge_ratio hedges per primary call
+(5% by default, roughly what a p95 delay fires anyway). When the
+provider as a whole slows down, the cap stops hedges from doubling load.
+
+The losing request cannot be interrupted mid-flight (SDK calls are
+blocking). It is cancelled if it has not started yet; otherwise it
+finishes in the background and its result is discarded. Its tokens are
+still reported through on_discard so spend stays visible.
+
+Hedging is off by default; see LLM_HEDGING in config/system_config.py.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+import threading
+import time
+
+from config.system_config import LLM_HEDGING
+
+
+T = TypeVar("T")
+
+# Provider a cross-provider hedge goes to
+HEDGE_ALTERNATES = {"anthropic": "groq", "groq": "anthropic"}
+
+
+class LatencyTracker:
+    """
+    Sliding window of successful call latencies. Thread-safe.
+    """
+
+    def __init__(self, window: int):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float, min_samples: int) -> Optional[float]:
+        """
+        Nearest-rank percentile, or None with fewer than min_samples.
+        """
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+
+        rank = int(round(percentile / 100.0 * (len(ordered) - 1)))
+        return ordered[min(len(ordered) - 1, max(0, rank))]
+
+
+class Hedger:
+    """
+    Per-provider hedging state: latency window, spend cap and counters.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        percentile: float = 95,
+        initial_delay: float = 5.0,
+        min_delay: float = 0.25,
+        min_samples: int = 20,
+        window: int = 500,
+        max_hedge_ratio: float = 0.05,
+        cross_provider: bool = False,
+        alternate=None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        alternate: client for cross-provider hedges; by default the
+        HEDGE_ALTERNATES client is built on first use.
+        """
+        self.provider = provider
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.cross_provider = cross_provider
+
+        self.latency = LatencyTracker(window)
+        self._executor = executor
+
+        self._lock = threading.Lock()
+        self._alternate = alternate
+        self._alternate_failed = False
+
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.capped = 0
+        self.discarded = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def delay(self) -> float:
+        """
+        Seconds to wait for the primary before hedging.
+        """
+        observed = self.latency.percentile(self.percentile, self.min_samples)
+        if observed is None:
+            return self.initial_delay
+        return max(self.min_delay, observed)
+
+    def alternate_client(self):
+        """
+        Client for cross-provider hedges, built on first use. None if
+        cross-provider hedging is off or the other provider is not
+        configured (e.g. no API key); hedges then reuse the primary.
+        """
+        if not self.cross_provider or self.provider not in HEDGE_ALTERNATES:
+            return None
+
+        with self._lock:
+            if self._alternate is None and not self._alternate_failed:
+                try:
+                    self._alternate = _build_client(HEDGE_ALTERNATES[self.provider])
+                except Exception:
+                    self._alternate_failed = True
+            return self._alternate
+
+    def run(
+        self,
+        primary: Callable[[], T],
+        hedge: Callable[[], T],
+        on_discard: Optional[Callable[[T], None]] = None
+    ) -> Tuple[T, bool]:
+        """
+        Runs `primary`, hedging with `hedge` if it is slow.
+        Returns (value, hedge_won). If both fail, the primary's error
+        is raised. `on_discard` receives the loser's value if it
+        completes after the winner.
+        """
+        with self._lock:
+            self.calls += 1
+
+        started = time.monotonic()
+        first = self._pool().submit(primary)
+
+        # Primary latency is sampled even when the hedge wins, so slow
+        # calls stay in the window
+        first.add_done_callback(
+            lambda f: f.exception() is None and self.latency.observe(time.monotonic() - started)
+        )
+
+        done, _ = wait([first], timeout=self.delay())
+
+        if not done and not self._reserve_hedge():
+            done = {first}  # over the spend cap: wait for the primary
+
+        if done:
+            return first.result(), False
+
+        second = self._pool().submit(hedge)
+        pending = {first: False, second: True}
+        errors = {}
+
+        while pending:
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                is_hedge = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    errors[is_hedge] = e
+                    continue
+
+                for loser in pending:
+                    self._discard(loser, on_discard)
+
+                if is_hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return value, is_hedge
+
+        raise errors.get(False) or errors[True]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "capped": self.capped,
+                "discarded": self.discarded,
+                "delay_seconds": round(self.delay(), 3),
+            }
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_hedge_ratio * self.calls:
+                self.capped += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _discard(self, future: Future, on_discard: Optional[Callable]) -> None:
+        with self._lock:
+            self.discarded += 1
+
+        if future.cancel() or on_discard is None:
+            return
+
+        def report(done: Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                on_discard(done.result())
+
+        future.add_done_callback(report)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        return self._executor if self._executor is not None else _shared_executor()
+
+
+def _build_client(provider: str):
+    # Imported lazily: both clients import this module
+    if provider == "anthropic":
+        from llm.llm_client import LLMClient
+        return LLMClient()
+    if provider == "groq":
+        from llm.comparison_llm import ComparisonClient
+        return ComparisonClient()
+    raise ValueError(f"No client for provider: {provider}")
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_hedgers: Dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _hedgers_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=LLM_HEDGING["max_threads"],
+                thread_name_prefix="llm-hedge"
+            )
+        return _executor
+
+
+def get_hedger(provider: str) -> Optional[Hedger]:
+    """
+    Returns the shared hedger for a provider, or None if hedging is
+    disabled in config/system_config.py.
+    """
+    if not LLM_HEDGING["enabled"]:
+        return None
+
+    with _hedgers_lock:
+        if provider not in _hedgers:
+            _hedgers[provider] = Hedger(
+                provider=provider,
+                percentile=LLM_HEDGING["percentile"],
+                initial_delay=LLM_HEDGING["initial_delay_seconds"],
+                min_delay=LLM_HEDGING["min_delay_seconds"],
+                min_samples=LLM_HEDGING["min_samples"],
+                window=LLM_HEDGING["window"],
+                max_hedge_ratio=LLM_HEDGING["max_hedge_ratio"],
+                cross_provider=LLM_HEDGING["cross_provider"],
+            )
+        return _hedgers[provider]
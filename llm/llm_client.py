@@ -3,28 +3,29 @@
 from typing import Optional
 import os
 
-import anthropic
 from dotenv import load_dotenv
 
+from llm.backends import LLMBackend, LLMRequest, LLMResponse, resolve_backend
+from llm.base_client import BaseLLMClient
+from llm.circuit_breaker import CircuitBreaker
+from llm.hedging import Hedger
+from llm.rate_limiter import RateLimiter
+from llm.response_cache import ResponseCache
+from llm.retry import RetryPolicy
+
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-class LLMClient:
+class AnthropicBackend(LLMBackend):
     """
-    Thin wrapper around Anthropic Claude.
-    Responsible ONLY for:
-    - Sending prompts
-    - Returning raw text output
+    Live backend: one Anthropic Messages API call per request.
     """
 
-    def __init__(
-        self,
-        model: str = "claude-3-5-haiku-20241022",
-        temperature: float = 0.3,
-        max_tokens: int = 500
-    ):
+    def __init__(self):
+        import anthropic
+
         api_key = os.getenv("ANTHROPIC_API_KEY")
 
         if not api_key:
@@ -33,33 +34,94 @@ class LLMClient:
                 "Make sure it is set in your .env file."
             )
 
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.model = model
-        self.temperature = temperature
-        self.max_tokens = max_tokens
+        # Retries are handled by BaseLLMClient (llm/retry.py)
+        self.client = anthropic.Anthropic(api_key=api_key, max_retries=0)
 
-    def generate(self, prompt: str) -> str:
+    def complete(self, request: LLMRequest) -> LLMResponse:
         """
         Sends a prompt to Claude and returns raw text output.
 
-        Parameters:
-        - prompt (str): The prompt to send to the LLM
-
-        Returns:
-        - str: Raw response text
+        The system block is marked with cache_control so repeated calls
+        sharing it (e.g. every FAQ answer for one product) read it from
+        Anthropic's prompt cache. Prefixes shorter than the model's
+        minimum cacheable length are simply not cached.
         """
 
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
+        options = {}
+        if request.timeout is not None:
+            options["timeout"] = request.timeout
+        if request.system:
+            options["system"] = [
+                {
+                    "type": "text",
+                    "text": request.system,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+
+        raw = self.client.messages.with_raw_response.create(
+            model=request.model,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
             messages=[
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": request.prompt
                 }
-            ]
+            ],
+            **options
         )
 
+        message = raw.parse()
+        usage = message.usage
+
         # Claude responses are returned as content blocks
-        return message.content[0].text.strip()
+        return LLMResponse(
+            text=message.content[0].text.strip(),
+            input_tokens=usage.input_tokens or 0,
+            output_tokens=usage.output_tokens or 0,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+            headers=raw.headers
+        )
+
+
+class LLMClient(BaseLLMClient):
+    """
+    Thin wrapper around Anthropic Claude.
+    Responsible ONLY for:
+    - Sending prompts
+    - Returning raw text output
+
+    Caching, rate limiting, retries and accounting are handled by BaseLLMClient.
+    """
+
+    provider = "anthropic"
+    rate_limit_headers = {
+        "requests": "anthropic-ratelimit-requests-remaining",
+        "tokens": "anthropic-ratelimit-tokens-remaining",
+    }
+
+    def __init__(
+        self,
+        model: str = "claude-3-5-haiku-20241022",
+        temperature: float = 0.3,
+        max_tokens: int = 500,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        backend: Optional[LLMBackend] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedger: Optional[Hedger] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(
+            backend=backend if backend is not None else resolve_backend(AnthropicBackend),
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            hedger=hedger,
+            circuit_breaker=circuit_breaker
+        )
@@ -0,0 +1,311 @@
+# llm/rate_limiter.py
+"""
+Process-wide, per-provider rate limiting for LLM calls.
+
+Each provider gets one RateLimiter shared by every client instance
+in the process. It enforces:
+- Requests per minute (token bucket)
+- Tokens per minute (token bucket, charged with an estimate up front
+  and corrected with actual usage afterwards)
+- An adaptive concurrency cap (AIMD): +1/limit per success,
+  halved on 429 / overload responses
+
+Rate-limit headers returned by the provider, when present, clamp the
+local buckets so we never believe we have more budget than the server.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import threading
+import time
+
+from config.system_config import RATE_LIMITS
+
+
+class RateLimiter:
+    """
+    Blocking limiter. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        min_concurrency: int = 1
+    ):
+        self.provider = provider
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+
+        self._cond = threading.Condition()
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.acquired = 0
+        self.throttled = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def slot(self, estimated_tokens: int) -> Iterator["RateLimitTicket"]:
+        """
+        Holds one request slot for the duration of a provider call.
+        The caller reports the outcome on the yielded ticket.
+        """
+        ticket = RateLimitTicket(estimated_tokens)
+        ticket.waited = self.acquire(estimated_tokens)
+
+        try:
+            yield ticket
+        except BaseException:
+            self.release(ticket, throttled=ticket.throttled)
+            raise
+
+        self.release(ticket, throttled=ticket.throttled)
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """
+        Blocks until a request can be sent. Returns seconds waited.
+        """
+        started = time.monotonic()
+
+        # A single request larger than the whole budget waits for a full bucket
+        needed_tokens = min(float(estimated_tokens), float(self.tokens_per_minute))
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = 0.0
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.in_flight >= int(self.concurrency_limit):
+                    wait = None  # woken by release()
+                elif self._request_budget < 1:
+                    wait = (1 - self._request_budget) * 60.0 / self.requests_per_minute
+                elif self._token_budget < needed_tokens:
+                    wait = (needed_tokens - self._token_budget) * 60.0 / self.tokens_per_minute
+                else:
+                    self._request_budget -= 1
+                    self._token_budget -= needed_tokens
+                    self.in_flight += 1
+                    break
+
+                self._cond.wait(timeout=wait)
+
+            waited = time.monotonic() - started
+            self.acquired += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            return waited
+
+    def release(self, ticket: "RateLimitTicket", throttled: bool = False) -> None:
+        """
+        Returns the slot and applies AIMD plus header/usage feedback.
+        """
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            if throttled:
+                self.throttled += 1
+                self.concurrency_limit = max(
+                    float(self.min_concurrency), self.concurrency_limit / 2
+                )
+            else:
+                self.concurrency_limit = min(
+                    float(self.max_concurrency),
+                    self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0)
+                )
+
+            # Refund (or charge) the difference between estimate and actual usage
+            if ticket.actual_tokens is not None:
+                self._token_budget = min(
+                    float(self.tokens_per_minute),
+                    self._token_budget
+                    + min(ticket.estimated_tokens, self.tokens_per_minute)
+                    - ticket.actual_tokens
+                )
+
+            if ticket.remaining_requests is not None:
+                self._request_budget = min(self._request_budget, float(ticket.remaining_requests))
+            if ticket.remaining_tokens is not None:
+                self._token_budget = min(self._token_budget, float(ticket.remaining_tokens))
+            if ticket.retry_after is not None:
+                self._blocked_until = max(
+                    self._blocked_until, time.monotonic() + ticket.retry_after
+                )
+
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "provider": self.provider,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "in_flight": self.in_flight,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+            }
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self._request_budget = min(
+            float(self.requests_per_minute),
+            self._request_budget + elapsed * self.requests_per_minute / 60.0
+        )
+        self._token_budget = min(
+            float(self.tokens_per_minute),
+            self._token_budget + elapsed * self.tokens_per_minute / 60.0
+        )
+
+
+class RateLimitTicket:
+    """
+    Per-call feedback filled in by the client before the slot is released.
+    """
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.waited = 0.0
+        self.throttled = False
+        self.actual_tokens: Optional[int] = None
+        self.remaining_requests: Optional[float] = None
+        self.remaining_tokens: Optional[float] = None
+        self.retry_after: Optional[float] = None
+
+    def observe_headers(self, headers, header_names: Dict[str, str]) -> None:
+        """
+        Reads remaining-budget and retry-after headers, if present.
+        header_names maps "requests" / "tokens" to provider header names.
+        """
+        if not headers:
+            return
+
+        self.remaining_requests = header_float(headers.get(header_names.get("requests", "")))
+        self.remaining_tokens = header_float(headers.get(header_names.get("tokens", "")))
+        self.retry_after = header_float(headers.get("retry-after"))
+
+
+# 429 = rate limited, 503 / 529 = provider overloaded
+THROTTLE_STATUS_CODES = {429, 503, 529}
+
+
+def iter_causes(exc: BaseException) -> Iterator[BaseException]:
+    """
+    Yields an error and everything it wraps (__cause__ / __context__).
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """
+    True if the error (or anything it wraps) is a 429 / overload response.
+    """
+    return any(
+        getattr(e, "status_code", None) in THROTTLE_STATUS_CODES
+        for e in iter_causes(exc)
+    )
+
+
+def error_headers(exc: BaseException):
+    """
+    Response headers attached to an SDK error (or anything it wraps), if any.
+    """
+    for e in iter_causes(exc):
+        response = getattr(e, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            return headers
+    return None
+
+
+def header_float(value) -> Optional[float]:
+    """
+    Numeric header value, or None if missing or malformed.
+    """
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+_budget_share = 1.0
+_enabled = True
+
+
+def set_rate_limit_share(share: float) -> None:
+    """
+    Scales every provider budget to `share` of the configured limits.
+
+    Limiters are per process, so batch workers call this with
+    1 / workers to keep the whole pool within one account's limits.
+    """
+    global _budget_share
+
+    with _limiters_lock:
+        _budget_share = share
+        _limiters.clear()
+
+
+def set_rate_limiting_enabled(enabled: bool) -> None:
+    """
+    Turns limiting off for clients created afterwards (e.g. offline
+    benchmarks against the fake backend).
+    """
+    global _enabled
+
+    with _limiters_lock:
+        _enabled = enabled
+
+
+def get_rate_limiter(provider: str) -> Optional[RateLimiter]:
+    """
+    Returns the shared limiter for a provider, or None if limiting is
+    disabled or no limits are configured for it in config/system_config.py.
+    """
+    with _limiters_lock:
+        if not _enabled:
+            return None
+        if provider not in _limiters:
+            limits = RATE_LIMITS.get(provider)
+            if limits is None:
+                return None
+            _limiters[provider] = RateLimiter(
+                provider=provider,
+                requests_per_minute=limits["requests_per_minute"] * _budget_share,
+                tokens_per_minute=limits["tokens_per_minute"] * _budget_share,
+                max_concurrency=max(1, round(limits["max_concurrency"] * _budget_share)),
+            )
+        return _limiters[provider]
@@ -0,0 +1,297 @@
+# llm/response_cache.py
+"""
+Content-addressed cache for raw LLM responses.
+
+Two tiers:
+- In-process LRU (bounded entry count, no I/O)
+- On-disk SQLite store in WAL mode (shared across runs and processes)
+
+Entries are keyed on a SHA-256 digest of
+(provider, model, temperature, max_tokens, prompt[, system]), so any
+change to generation settings is a miss rather than a stale hit.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config.system_config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Disk eviction runs every N writes instead of on every write
+_EVICTION_INTERVAL = 64
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) response cache.
+
+    Thread-safe. Each process owns its own SQLite connection;
+    WAL mode lets concurrent processes read while one writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = LLM_CACHE_PATH,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = LLM_CACHE_TTL_SECONDS
+    ):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            SQLite file. Relative paths resolve against the project root.
+            None keeps the cache memory-only.
+        memory_entries : int
+            Maximum entries held in the in-process LRU.
+        max_entries : int
+            Maximum entries kept on disk (least recently used evicted).
+        ttl_seconds : float, optional
+            Entries older than this are treated as misses. None disables TTL.
+        """
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = None
+        if path is not None:
+            self._conn = self._open(path)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        prompt: str,
+        system: Optional[str] = None
+    ) -> str:
+        """
+        Builds the content address for one generation request.
+        """
+        parts = [provider, model, temperature, max_tokens, prompt]
+        if system is not None:
+            parts.append(system)
+
+        payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response, or None on a miss.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at, now):
+                        self._conn.execute(
+                            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                            (now, key)
+                        )
+                        self._remember(key, value, created_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key = ?", (key,)
+                    )
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Stores a response in both tiers.
+        """
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, value, now)
+
+            if self._conn is None:
+                return
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= _EVICTION_INTERVAL:
+                self._evict_disk(now)
+
+    def stats(self) -> Dict:
+        """
+        Returns hit/miss counters for reporting.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._evict_disk(time.time())
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        db_path = Path(path)
+        if not db_path.is_absolute():
+            db_path = PROJECT_ROOT / db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode: every statement is its own transaction
+        conn = sqlite3.connect(
+            str(db_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed "
+            "ON responses (accessed_at)"
+        )
+        return conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        """
+        Drops expired rows, then trims least recently used rows
+        down to max_entries. Caller must hold the lock.
+        """
+        self._writes_since_eviction = 0
+
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()
+
+        overflow = count - self.max_entries
+        if overflow > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+
+# ----------------------------------------------------------------------
+# Process-wide default cache
+# ----------------------------------------------------------------------
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_pid: Optional[int] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    Returns the shared cache used by LLM clients, or None when
+    caching is disabled in config.
+
+    The cache is re-created after a fork so worker processes never
+    share a SQLite connection with their parent.
+    """
+    global _default_cache, _default_cache_pid
+
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache_pid != os.getpid():
+            _default_cache = ResponseCache()
+            _default_cache_pid = os.getpid()
+        return _default_cache
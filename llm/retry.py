@@ -0,0 +1,212 @@
+# llm/retry.py
+"""
+Retry policy shared by every LLM client.
+
+A failed provider call is classified before anything is retried:
+- "throttle"   429 / overload responses (503, 529)
+- "transient"  5xx, request timeouts, dropped connections
+- "fatal"      everything else (bad request, auth, bugs) - never retried
+
+Retryable calls back off exponentially with full jitter, never sooner
+than a retry-after header asks. Every attempt carries a per-call
+timeout that live backends pass to their SDK.
+
+Retries are also capped process-wide per provider by a RetryBudget:
+each first attempt earns a fraction of a retry, so when a provider is
+down the pipeline degrades to roughly one call per request instead of
+multiplying its load by max_attempts.
+"""
+
+from typing import Callable, Dict, Optional, TypeVar
+import random
+import threading
+import time
+
+from config.system_config import LLM_RETRY
+from llm.rate_limiter import THROTTLE_STATUS_CODES, error_headers, header_float, iter_causes
+
+
+T = TypeVar("T")
+
+# 408 = request timeout, 409 = conflict (lock contention), 5xx = server side
+TRANSIENT_STATUS_CODES = {408, 409, 500, 502, 503, 504}
+
+# SDK errors raised without a status code (no response was received).
+# Matched by class name so the SDKs stay optional imports.
+TRANSIENT_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Returns "throttle", "transient" or "fatal" for a failed call,
+    looking through wrapped causes.
+    """
+    for e in iter_causes(exc):
+        status = getattr(e, "status_code", None)
+        if status in THROTTLE_STATUS_CODES:
+            return "throttle"
+        if status in TRANSIENT_STATUS_CODES:
+            return "transient"
+        if status is not None:
+            return "fatal"
+
+        if isinstance(e, (TimeoutError, ConnectionError)):
+            return "transient"
+        if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(e).__mro__):
+            return "transient"
+
+    return "fatal"
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return classify_error(exc) != "fatal"
+
+
+class RetryBudget:
+    """
+    Token bucket of retries, refilled by first attempts. Thread-safe.
+
+    Each first attempt deposits `ratio` tokens (capped at `max_tokens`);
+    each retry withdraws one. Starts full so a cold process can still
+    ride out a short burst of errors.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = float(max_tokens)
+
+        self._lock = threading.Lock()
+        self._tokens = float(max_tokens)
+
+        self.retries = 0
+        self.denied = 0
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tokens": round(self._tokens, 2),
+                "retries": self.retries,
+                "denied": self.denied,
+            }
+
+
+class RetryPolicy:
+    """
+    How a client retries one logical call.
+
+    `budget` is shared; pass None to retry without a process-wide cap.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        timeout: Optional[float] = 60.0,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.budget = budget
+        self.sleep = sleep
+        self._rng = rng or random.Random()
+
+    def call(self, attempt: Callable[[], T]) -> "RetryResult":
+        """
+        Runs `attempt` until it succeeds, fails fatally, runs out of
+        attempts or the budget refuses a retry. The last error is raised.
+        """
+        if self.budget is not None:
+            self.budget.record_attempt()
+
+        retries = 0
+        waited = 0.0
+
+        while True:
+            try:
+                return RetryResult(attempt(), retries, waited)
+            except Exception as e:
+                kind = classify_error(e)
+
+                if kind == "fatal" or retries + 1 >= self.max_attempts:
+                    raise
+                if self.budget is not None and not self.budget.try_spend():
+                    raise
+
+                delay = self.backoff(retries, e)
+                self.sleep(delay)
+                waited += delay
+                retries += 1
+
+    def backoff(self, retries: int, exc: Optional[BaseException] = None) -> float:
+        """
+        Full jitter: uniform in [0, min(max_delay, base_delay * 2**retries)],
+        raised to the provider's retry-after when it sent one.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retries))
+        delay = self._rng.uniform(0.0, ceiling)
+
+        headers = error_headers(exc) if exc is not None else None
+        retry_after = header_float(headers.get("retry-after")) if headers else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+
+        return delay
+
+
+class RetryResult:
+    """
+    Outcome of RetryPolicy.call: the value plus retry accounting.
+    """
+
+    def __init__(self, value, retries: int, waited: float):
+        self.value = value
+        self.retries = retries
+        self.waited = waited
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_policy(provider: str) -> RetryPolicy:
+    """
+    Returns a policy configured from LLM_RETRY in config/system_config.py,
+    sharing one RetryBudget per provider across the process.
+    """
+    with _budgets_lock:
+        if provider not in _budgets:
+            _budgets[provider] = RetryBudget(
+                ratio=LLM_RETRY["budget_ratio"],
+                max_tokens=LLM_RETRY["budget_max_retries"],
+            )
+        budget = _budgets[provider]
+
+    return RetryPolicy(
+        max_attempts=LLM_RETRY["max_attempts"],
+        base_delay=LLM_RETRY["base_delay_seconds"],
+        max_delay=LLM_RETRY["max_delay_seconds"],
+        timeout=LLM_RETRY["timeout_seconds"],
+        budget=budget,
+    )
@@ -1,8 +1,22 @@
 # Comparison-specific logic and prompt block.
+#
+# Prompt layout: COMPARISON_SYSTEM_PROMPT is identical for every
+# comparison call and is sent first (as the system message), so it
+# forms a shared prefix the provider can cache. The builders below
+# produce only the call-specific tail.
+
+COMPARISON_SYSTEM_PROMPT = """
+You are comparing two skincare products.
+
+Rules:
+- Use ONLY the provided data
+- Do NOT add assumptions
+""".strip()
+
 
 def build_field_comparison_prompt( section_name: str, field: str,name_a: str, name_b: str, values_a, values_b) -> str:
     """
-    Builds a field-specific comparison prompt for Gemini.
+    Builds the field-specific tail of a comparison prompt.
     """
 
     section_instructions = {
@@ -28,15 +42,9 @@ def build_field_comparison_prompt( section_name: str, field: str,name_a: str, na
     )
 
     return f"""
-                You are comparing two skincare products.
-
                 Task:
                 {instruction}
-
-                Rules:
-                - Use ONLY the provided data
-                - Do NOT add assumptions
-                - Be concise (1–2 sentences)
+                Be concise (1–2 sentences).
 
                 {name_a} ({field}):
                 {values_a}
@@ -48,20 +56,14 @@ def build_field_comparison_prompt( section_name: str, field: str,name_a: str, na
 
 def build_overall_summary_prompt(product_a: dict, product_b: dict) -> str:
     """
-    Builds a prompt for generating an overall product comparison summary.
+    Builds the tail of a prompt for an overall product comparison summary.
     """
 
     return f"""
-                You are given full details of two skincare products.
-
                 Task:
                 Provide a short overall comparison summary highlighting
                 key differences and which type of user each product suits best.
-
-                Rules:
-                - Use ONLY the provided data
-                - No assumptions
-                - 2 to 3 sentences maximum
+                2 to 3 sentences maximum.
 
                 Product A:
                 {product_a}
@@ -1,9 +1,16 @@
 from pathlib import Path
+from typing import Dict, Optional
+import argparse
 import json
 
 from graph.graph import build_graph
+from graph.checkpointing import invoke_checkpointed, open_checkpointer, run_id_for
 from graph.state import AgentState
-from agents.serialization_agent import SerializationAgent
+from agents.serialization_agent import SerializationAgent, atomic_write, is_unchanged
+from llm.response_cache import get_default_cache
+from config.system_config import CHECKPOINT_ENABLED, OUTPUT_COMPACT_JSON, TRACE_ENABLED, TRACE_MEMORY
+from utils.instrumentation import Tracer, tracing
+from utils.generation_manifest import MANIFEST_PAGE, build_manifest, load_manifest, write_manifest
 
 
 def load_json(path: Path) -> dict:
@@ -13,46 +20,171 @@ def load_json(path: Path) -> dict:
         return json.load(f)
 
 
-def main():
-    project_root = Path(__file__).resolve().parent
-    data_dir = project_root / "data"
+def new_tracer() -> Optional[Tracer]:
+    """
+    Tracer for one run, or None when instrumentation is disabled in config.
+    """
+    return Tracer(trace_memory=TRACE_MEMORY) if TRACE_ENABLED else None
 
-    raw_product_a = load_json(data_dir / "input" / "product_data.json")
-    raw_product_b = load_json(data_dir / "input" / "fictitious_product.json")
 
-    # -------------------------
-    # Initialize state
-    # -------------------------
+def build_pipeline_graph():
+    """
+    Compiles the graph, with the SQLite checkpointer when enabled in config.
+    """
+    return build_graph(open_checkpointer() if CHECKPOINT_ENABLED else None)
+
+
+def run_pipeline(
+    graph,
+    raw_product_a: Dict,
+    raw_product_b: Dict,
+    tracer: Optional[Tracer] = None,
+    resume: bool = False,
+    previous_manifest: Optional[Dict] = None
+) -> Dict:
+    """
+    Runs one compiled graph over a product pair and returns the final state.
+    Node and LLM spans are recorded on `tracer`, if given.
+
+    On a checkpointed graph the run id is derived from the inputs, and
+    resume=True picks up an interrupted run where it stopped.
+
+    previous_manifest (see utils/generation_manifest.py) lets the run
+    reuse answers and verdicts whose inputs have not changed.
+    """
     initial_state = AgentState(
         raw_product_a=raw_product_a,
         raw_product_b=raw_product_b,
+        previous_manifest=previous_manifest or {},
     )
 
-    # -------------------------
-    # Run LangGraph
-    # -------------------------
-    graph = build_graph()
-    final_state = graph.invoke(initial_state)
-
-    # -------------------------
-    # Serialize outputs (post-graph)
-    # -------------------------
-    serializer = SerializationAgent(output_dir=data_dir / "output")
+    def invoke() -> Dict:
+        if graph.checkpointer is None:
+            return graph.invoke(initial_state)
+
+        final_state, _ = invoke_checkpointed(
+            graph,
+            initial_state,
+            run_id_for(raw_product_a, raw_product_b),
+            resume=resume
+        )
+        return final_state
+
+    if tracer is None:
+        return invoke()
+
+    with tracing(tracer):
+        return invoke()
+
+
+def write_outputs(
+    final_state: Dict,
+    output_dir: Path,
+    tracer: Optional[Tracer] = None,
+    serializer: Optional[SerializationAgent] = None
+) -> Optional[Path]:
+    """
+    Writes the three pages, the generation manifest and the execution
+    log, plus trace_events.jsonl and trace.json (Chrome / Perfetto) when
+    a tracer is given. Returns the log path (None with a page store).
+
+    Pages go through `serializer` (default: synchronous files in
+    output_dir), which also counts written vs unchanged pages. Pass one
+    configured with a BackgroundWriter or PageStore to change the sink.
+
+    The manifest and log are only rewritten when their content changed.
+    With a page store, they and the Chrome trace are stored under the
+    serializer's page id ("generation_manifest", "execution_log",
+    "trace") and nothing is written to output_dir; returns None.
+    """
+    if serializer is None:
+        serializer = SerializationAgent(output_dir=output_dir, compact=OUTPUT_COMPACT_JSON)
 
     serializer.write_faq_page(final_state["faq_page"])
     serializer.write_product_page(final_state["product_page"])
     serializer.write_comparison_page(final_state["comparison_page"])
 
+    faq_manifest = final_state.get("faq_manifest", {})
+    comparison_manifest = final_state.get("comparison_manifest", {})
+
+    if serializer.page_store is not None:
+        store, page_id = serializer.page_store, serializer.page_id
+        store.put(page_id, MANIFEST_PAGE, build_manifest(faq_manifest, comparison_manifest), if_changed=True)
+        store.put(page_id, "execution_log", {"entries": final_state["execution_log"]}, if_changed=True)
+        if tracer is not None:
+            store.put(page_id, "trace", tracer.chrome_trace())
+        return None
+
+    write_manifest(output_dir, faq=faq_manifest, comparison=comparison_manifest)
+
+    log_path = Path(output_dir) / "execution_log.txt"
+    log = "".join(entry + "\n" for entry in final_state["execution_log"]).encode("utf-8")
+    if not is_unchanged(log_path, log):
+        atomic_write(log_path, log)
+
+    if tracer is not None:
+        tracer.write_jsonl(Path(output_dir) / "trace_events.jsonl")
+        tracer.write_chrome_trace(Path(output_dir) / "trace.json")
+
+    return log_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the content generation pipeline")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last interrupted run for these inputs")
+    parser.add_argument("--full", action="store_true",
+                        help="Regenerate everything instead of reusing unchanged output")
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent
+    data_dir = project_root / "data"
+
+    raw_product_a = load_json(data_dir / "input" / "product_data.json")
+    raw_product_b = load_json(data_dir / "input" / "fictitious_product.json")
+
     # -------------------------
-    # Save execution log
+    # Run LangGraph
     # -------------------------
-    log_path = data_dir / "output" / "execution_log.txt"
+    graph = build_pipeline_graph()
+    tracer = new_tracer()
+    output_dir = data_dir / "output"
+    final_state = run_pipeline(
+        graph,
+        raw_product_a,
+        raw_product_b,
+        tracer,
+        resume=args.resume,
+        previous_manifest=None if args.full else load_manifest(output_dir)
+    )
 
-    with log_path.open("w", encoding="utf-8") as f:
-        for entry in final_state["execution_log"]:
-            f.write(entry + "\n")
+    # -------------------------
+    # Serialize outputs (post-graph)
+    # -------------------------
+    serializer = SerializationAgent(output_dir=output_dir, compact=OUTPUT_COMPACT_JSON)
+    log_path = write_outputs(final_state, output_dir, tracer, serializer)
 
     print(f"\n Execution log saved to: {log_path}")
+    print(f" Pages: {serializer.pages_written} written, {serializer.pages_skipped} unchanged")
+
+    if tracer is not None:
+        print(f" Trace saved to: {log_path.parent / 'trace.json'}")
+        for name, totals in tracer.summary().items():
+            print(
+                f"   {name:<36} {totals['count']:>3}x "
+                f"{totals['wall_ms']:>9.1f} ms wall "
+                f"{totals['cpu_ms']:>8.1f} ms cpu "
+                f"{totals['input_tokens'] + totals['output_tokens']:>7} tokens"
+            )
+
+    cache = get_default_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f" LLM cache: {stats['hits']} hits "
+            f"({stats['memory_hits']} memory, {stats['disk_hits']} disk), "
+            f"{stats['misses']} misses"
+        )
 
 
 
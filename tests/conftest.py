@@ -3,6 +3,10 @@ import json
 from pathlib import Path
 from graph.graph import build_graph
 from graph.state import AgentState
+from llm.backends import set_default_backend
+from llm.fake_backend import FakeLLMBackend
+from llm.circuit_breaker import set_circuit_breakers_enabled
+from llm.rate_limiter import set_rate_limiting_enabled
 
 
 @pytest.fixture
@@ -41,3 +45,21 @@ def final_graph_state(sample_product_data, sample_fictional_product):
         raw_product_b=sample_fictional_product,
     )
     return graph.invoke(state)
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """
+    Offline run: every LLM call goes to FakeLLMBackend, with no
+    on-disk response cache, no provider rate limits and no circuit
+    breaker state carried between tests.
+    """
+    monkeypatch.setattr("llm.response_cache.LLM_CACHE_ENABLED", False)
+    set_rate_limiting_enabled(False)
+    set_circuit_breakers_enabled(False)
+    backend = FakeLLMBackend()
+    set_default_backend(backend)
+    yield backend
+    set_default_backend(None)
+    set_rate_limiting_enabled(True)
+    set_circuit_breakers_enabled(True)
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from agents.answer_generation_agent import AnswerGenerationAgent, InvalidAnswerError
+from graph.graph import build_graph
+from graph.state import AgentState
+from llm.backends import LLMResponse, set_default_backend
+from llm.fake_backend import FakeLLMBackend
+from llm.llm_client import LLMClient
+from llm.response_cache import ResponseCache
+
+
+class BadAnswerBackend(FakeLLMBackend):
+    """
+    Safety answers leak their category on the first attempt only;
+    pricing answers are always empty.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.attempts = {}
+
+    def complete(self, request):
+        prompt = request.prompt
+        if "Question:" in prompt:
+            self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+            if "Category:\n                safety" in prompt and self.attempts[prompt] == 1:
+                return LLMResponse(text="Safety: mild tingling is possible.")
+            if "Category:\n                pricing" in prompt:
+                return LLMResponse(text="")
+        return super().complete(request)
+
+
+def test_only_failing_answers_are_re_requested(fake_backend, sample_product_data, sample_fictional_product):
+    backend = BadAnswerBackend()
+    set_default_backend(backend)
+
+    final_state = build_graph().invoke(
+        AgentState(
+            raw_product_a=sample_product_data,
+            raw_product_b=sample_fictional_product,
+            faq_answer_retry_budget=9,
+        )
+    )
+
+    categories = [q["category"] for q in final_state["faq_page"]["questions"]]
+    assert categories.count("safety") == 3
+    assert "pricing" not in categories
+    assert final_state["faq_page"]["total_questions"] == 15
+    assert len(final_state["faq_answer_errors"]) == 3
+    assert all("empty answer" in e for e in final_state["faq_answer_errors"])
+
+    # Round 1 retries 3 safety + 3 pricing, round 2 the 3 pricing questions
+    answer_calls = sorted(backend.attempts.values())
+    assert answer_calls == [1] * 12 + [2] * 3 + [3] * 3
+    assert any("9 re-requested, 3 dropped" in entry for entry in final_state["execution_log"])
+
+
+def test_validation_accepts_short_and_plain_prose_answers():
+    agent = AnswerGenerationAgent(llm_client=None)
+
+    assert agent.validate_answer("pricing", "It costs ₹699.") is None
+    assert agent.validate_answer("safety", "Safety-wise, it is gentle on most skin types.") is None
+    assert agent.validate_answer("comparison", "It sits in the same category as other serums.") is None
+
+    assert agent.validate_answer("safety", "Safety: mild tingling is possible.") == "starts with its category label"
+    assert agent.validate_answer("Usage", "  usage : apply twice daily.") == "starts with its category label"
+    assert agent.validate_answer("pricing", "") == "empty answer"
+
+
+class GappyBatchBackend(FakeLLMBackend):
+    """
+    Batched responses blank their first answer while `gappy` is set.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.gappy = True
+        self.batch_calls = 0
+
+    def complete(self, request):
+        response = super().complete(request)
+        if "Answer EVERY question" not in request.prompt:
+            return response
+
+        self.batch_calls += 1
+        if not self.gappy:
+            return response
+
+        answers = json.loads(response.text)
+        answers[0]["answer"] = ""
+        return LLMResponse(text=json.dumps(answers))
+
+
+def test_batch_with_invalid_items_is_not_cached(fake_backend, sample_product_data):
+    backend = GappyBatchBackend()
+    agent = AnswerGenerationAgent(LLMClient(backend=backend, cache=ResponseCache(path=None)))
+    items = [
+        {"id": f"q{i}", "category": "usage", "question": f"How do I use it ({i})?",
+         "supporting_context": {}}
+        for i in range(3)
+    ]
+
+    result = agent.generate_answers_batch(sample_product_data, items)
+    assert sorted(result["answers"]) == ["q0", "q1", "q2"] and result["errors"] == {}
+
+    # The gap is asked again rather than replayed from the cache
+    agent.generate_answers_batch(sample_product_data, items)
+    assert backend.batch_calls == 2
+
+    # A complete batch is cached as usual
+    backend.gappy = False
+    agent.generate_answers_batch(sample_product_data, items)
+    agent.generate_answers_batch(sample_product_data, items)
+    assert backend.batch_calls == 3
+
+
+def test_rejected_single_answer_is_not_cached(fake_backend, sample_product_data):
+    backend = BadAnswerBackend()
+    agent = AnswerGenerationAgent(LLMClient(backend=backend, cache=ResponseCache(path=None)))
+    question = dict(product=sample_product_data, category="safety",
+                    question="Is it safe for sensitive skin?", supporting_context={})
+
+    with pytest.raises(InvalidAnswerError):
+        agent.generate_answer(**question)
+
+    # The next run asks the provider again instead of replaying the bad answer
+    assert agent.generate_answer(**question)["answer"]
+    assert list(backend.attempts.values()) == [2]
+
+    # A valid answer is cached as usual
+    agent.generate_answer(**question)
+    assert list(backend.attempts.values()) == [2]
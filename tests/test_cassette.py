@@ -0,0 +1,44 @@
+import pytest
+
+from llm.backends import LLMRequest
+from llm.cassette import Cassette, CassetteMissError, RecordingBackend, ReplayBackend
+from llm.fake_backend import FakeLLMBackend
+
+
+def _request(prompt, temperature=0.0):
+    return LLMRequest(provider="fake", model="m", prompt=prompt, temperature=temperature, system="sys")
+
+
+@pytest.mark.parametrize("name", ["traffic.jsonl", "traffic.jsonl.gz"])
+def test_recorded_traffic_replays_offline(tmp_path, name):
+    cassette = Cassette(str(tmp_path / name))
+    recorder = RecordingBackend(FakeLLMBackend(latency_ms=5), cassette)
+
+    live = recorder.complete(_request("What is the price?"))
+    assert recorder.recorded == 1
+
+    entry = cassette.load()[0]
+    assert entry["prompt"] == "What is the price?"
+    assert entry["latency_ms"] >= 5
+
+    replay = ReplayBackend(Cassette(str(tmp_path / name)))
+    replayed = replay.complete(_request("What is the price?"))
+
+    assert replayed.text == live.text
+    assert replayed.output_tokens == live.output_tokens
+
+    # Settings changed: falls back to the prompt hash
+    assert replay.complete(_request("What is the price?", temperature=0.7)).text == live.text
+    assert replay.stats()["hits"] == 2
+
+
+def test_replay_miss_raises_or_falls_back(tmp_path):
+    replay = ReplayBackend(Cassette(str(tmp_path / "empty.jsonl")))
+
+    with pytest.raises(CassetteMissError):
+        replay.complete(_request("never recorded"))
+
+    fallback = FakeLLMBackend()
+    replay = ReplayBackend(Cassette(str(tmp_path / "empty.jsonl")), fallback=fallback)
+    assert replay.complete(_request("never recorded")).text
+    assert fallback.stats()["calls"] == 1
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from agents.parser_agent import ParserAgent
+from batch_runner import _store_product, iter_catalog
+from utils.catalog_store import CatalogStore, CatalogStoreWriter, to_raw_product
+
+
+def test_store_round_trips_products_by_id(tmp_path, sample_product_data, sample_fictional_product):
+    parser = ParserAgent()
+    products = {
+        "sku-b": parser.parse(sample_fictional_product),
+        "sku-a": parser.parse(sample_product_data),
+        "sku-ü": parser.parse(dict(sample_product_data, skin_type="", benefits=[])),
+    }
+
+    with CatalogStoreWriter(tmp_path / "catalog.store") as writer:
+        for product_id, product in products.items():
+            writer.add(product_id, product)
+        with pytest.raises(ValueError):
+            writer.add("sku-a", products["sku-a"])
+
+    with CatalogStore(tmp_path / "catalog.store") as store:
+        assert len(store) == 3
+        assert list(store.ids()) == list(products)
+        for product_id, product in products.items():
+            assert store.get(product_id) == product
+            assert parser.parse(to_raw_product(store.get(product_id))) == product
+        assert "sku-c" not in store
+        with pytest.raises(KeyError):
+            store.get("sku-c")
+
+
+def test_catalog_items_reference_the_store(tmp_path, sample_product_data, sample_fictional_product):
+    feed = tmp_path / "feed.ndjson"
+    records = [
+        dict(sample_product_data, id="sku-1"),
+        {"id": "sku-bad"},
+        dict(sample_fictional_product, id="sku-1"),
+        dict(sample_fictional_product, id="sku-1-1"),
+    ]
+    feed.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+    competitor = tmp_path / "competitor.json"
+    store = tmp_path / "catalog.store"
+
+    items = list(iter_catalog(feed, competitor, store))
+
+    assert [item["id"] for item in items] == ["sku-bad", "sku-1", "sku-1-1", "sku-1-1-1"]
+    assert "error" in items[0]
+    assert all(set(item) == {"id", "store", "competitor"} for item in items[1:])
+
+    parser = ParserAgent()
+    assert parser.parse(_store_product(str(store), "sku-1-1")) == parser.parse(sample_fictional_product)
+
+
+def test_out_of_range_price_fails_only_its_record(tmp_path, sample_product_data):
+    feed = tmp_path / "feed.ndjson"
+    records = [
+        dict(sample_product_data, id="sku-huge", price="1e20"),
+        dict(sample_product_data, id="sku-ok"),
+    ]
+    feed.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+    store = tmp_path / "catalog.store"
+
+    items = list(iter_catalog(feed, tmp_path / "competitor.json", store))
+
+    assert [item["id"] for item in items] == ["sku-huge", "sku-ok"]
+    assert "out of range" in items[0]["error"]
+    with CatalogStore(store) as catalog:
+        assert list(catalog.ids()) == ["sku-ok"]
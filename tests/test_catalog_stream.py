@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+from agents.parser_agent import ParserAgent
+from utils.catalog_stream import chunked, iter_records
+
+
+TRICKY = {
+    "id": "sku-2",
+    "product_name": 'Serum "Brace {[" \\ edition',
+    "concentration": "5%",
+    "skin_type": "Dry, Oily",
+    "key_ingredients": ["Niacinamide"],
+    "benefits": ["Glow"],
+    "how_to_use": "Apply } at night ]",
+    "side_effects": "None",
+    "price": "₹1,299",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_json_array_streams_across_chunk_boundaries(tmp_path, sample_product_data, chunk_size):
+    feed = tmp_path / "feed.json"
+    feed.write_text(json.dumps([sample_product_data, TRICKY, [1, 2]], ensure_ascii=False), encoding="utf-8")
+
+    records = list(iter_records(feed, chunk_size=chunk_size))
+
+    assert [r.data for r in records] == [sample_product_data, TRICKY, [1, 2]]
+
+
+def test_parse_stream_isolates_bad_records(tmp_path, sample_product_data):
+    feed = tmp_path / "feed.ndjson.gz"
+    lines = [
+        json.dumps(sample_product_data, ensure_ascii=False),
+        "{not json",
+        json.dumps({"product_name": "Missing fields"}),
+        "",
+        json.dumps(TRICKY, ensure_ascii=False),
+    ]
+    with gzip.open(feed, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+    parsed = list(ParserAgent().parse_stream(iter_records(feed)))
+
+    assert [p.ok for p in parsed] == [True, False, False, True]
+    assert parsed[1].error.startswith("Invalid JSON")
+    assert "Missing required fields" in parsed[2].error
+    assert parsed[3].product_id == "sku-2"
+    assert parsed[3].product["price"] == 1299
+    assert parsed[3].product["skin_type"] == ["Dry", "Oily"]
+
+    assert [len(c) for c in chunked(parsed, 3)] == [3, 1]
+
+
+
+def test_parse_stream_isolates_overflowing_prices(sample_product_data):
+    records = [sample_product_data, dict(sample_product_data, price=float("inf"))]
+
+    parsed = list(ParserAgent().parse_stream(records))
+
+    assert [p.ok for p in parsed] == [True, False]
+    assert parsed[1].error.startswith("OverflowError")
+
+
+def test_parse_batch_matches_parse(sample_product_data):
+    parser = ParserAgent()
+    records = [sample_product_data, TRICKY]
+
+    assert parser.parse_batch(records) == [parser.parse(r) for r in records]
+    with pytest.raises(ValueError):
+        parser.parse_batch([TRICKY, {"id": "sku-bad"}])
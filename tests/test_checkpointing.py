@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from graph.checkpointing import open_checkpointer, run_id_for, run_status
+from graph.graph import build_graph
+from llm.fake_backend import FakeAPIError
+from runner import run_pipeline
+
+
+@pytest.fixture
+def flaky_backend(fake_backend):
+    """
+    The offline fake backend with every Groq (comparison) call failing
+    with a non-retryable error until healed (error_rate = 0).
+    """
+    fake_backend.error_rate = 1.0
+    fake_backend.error_status = 400
+    fake_backend.error_providers = {"groq"}
+    return fake_backend
+
+
+def test_resume_skips_completed_nodes(flaky_backend, tmp_path, sample_product_data, sample_fictional_product):
+    graph = build_graph(open_checkpointer(str(tmp_path / "checkpoints.sqlite")))
+    run_id = run_id_for(sample_product_data, sample_fictional_product)
+
+    with pytest.raises(FakeAPIError):
+        run_pipeline(graph, sample_product_data, sample_fictional_product)
+
+    assert run_status(graph, run_id) == "interrupted"
+    faq_calls = flaky_backend.stats()["calls_by_provider"]["anthropic"]
+    assert faq_calls > 0
+
+    flaky_backend.error_rate = 0.0
+    final_state = run_pipeline(graph, sample_product_data, sample_fictional_product, resume=True)
+
+    # FAQ answers came from the checkpoint, not new Claude calls
+    assert flaky_backend.stats()["calls_by_provider"]["anthropic"] == faq_calls
+    assert final_state["faq_page"]["total_questions"] == 18
+    assert final_state["comparison_page"]
+    assert run_status(graph, run_id) == "completed"
+
+    # A completed run resumes without any provider calls
+    total = flaky_backend.stats()["calls"]
+    again = run_pipeline(graph, sample_product_data, sample_fictional_product, resume=True)
+    assert flaky_backend.stats()["calls"] == total
+    assert again["faq_page"] == final_state["faq_page"]
+
+
+def test_unused_runs_are_pruned(fake_backend, tmp_path, sample_product_data, sample_fictional_product):
+    checkpointer = open_checkpointer(str(tmp_path / "checkpoints.sqlite"))
+    graph = build_graph(checkpointer)
+    edited = dict(sample_product_data, price="₹799")
+
+    run_pipeline(graph, sample_product_data, sample_fictional_product)
+    checkpointer.touch_run(run_id_for(sample_product_data, sample_fictional_product), now=time.time() - 7200)
+    run_pipeline(graph, edited, sample_fictional_product)
+
+    # Only the run left unused for longer than max_age is removed
+    assert checkpointer.prune(max_age_seconds=3600) == 1
+    assert run_status(graph, run_id_for(sample_product_data, sample_fictional_product)) == "new"
+    assert run_status(graph, run_id_for(edited, sample_fictional_product)) == "completed"
+
+    with checkpointer.cursor() as cur:
+        threads = {row[0] for row in cur.execute("SELECT DISTINCT thread_id FROM checkpoints")}
+    assert threads == {run_id_for(edited, sample_fictional_product)}
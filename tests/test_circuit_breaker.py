@@ -0,0 +1,136 @@
+import pytest
+
+from agents.comparison_agent import ComparisonAgent
+from graph.graph import build_graph
+from graph.state import AgentState
+from llm.backends import set_default_backend
+from llm.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker, set_circuit_breakers_enabled
+from llm.fake_backend import FakeAPIError, FakeLLMBackend
+from llm.llm_client import LLMClient
+from llm.retry import LLM_RETRY, RetryPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail(breaker, status_code=500):
+    with pytest.raises(FakeAPIError):
+        with breaker.guard():
+            raise FakeAPIError("down", status_code=status_code)
+
+
+def _succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_probes():
+    clock = Clock()
+    breaker = CircuitBreaker("groq", failure_rate=0.5, min_calls=4, window=10,
+                             open_seconds=30, probe_successes=2, clock=clock)
+
+    _succeed(breaker)
+    _succeed(breaker)
+    _fail(breaker)
+    assert breaker.state == "closed"
+    _fail(breaker)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        _succeed(breaker)
+    assert breaker.stats()["rejected"] == 1
+
+    # A failed probe reopens the circuit
+    clock.now = 30
+    assert breaker.state == "half_open"
+    _fail(breaker)
+    assert breaker.state == "open"
+
+    clock.now = 60
+    _succeed(breaker)
+    assert breaker.state == "half_open"
+    _succeed(breaker)
+    assert breaker.state == "closed"
+    assert breaker.stats()["opened"] == 2
+
+
+def test_caller_errors_do_not_open_the_breaker():
+    breaker = CircuitBreaker("groq", failure_rate=0.5, min_calls=2)
+
+    for _ in range(5):
+        _fail(breaker, status_code=400)
+
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_skips_the_backend(fake_backend):
+    class DeadBackend(FakeLLMBackend):
+        def complete(self, request):
+            self.calls += 1
+            raise FakeAPIError("down", status_code=503)
+
+    backend = DeadBackend()
+    breaker = CircuitBreaker("anthropic", min_calls=2)
+    client = LLMClient(backend=backend, circuit_breaker=breaker,
+                       retry_policy=RetryPolicy(max_attempts=1))
+
+    for _ in range(2):
+        with pytest.raises(FakeAPIError):
+            client.generate("p", use_cache=False)
+    with pytest.raises(CircuitOpenError):
+        client.generate("p", use_cache=False)
+
+    assert backend.calls == 2
+
+
+class GroqDownBackend(FakeLLMBackend):
+    """
+    Groq answers every call with 503; other providers work.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.groq_calls = 0
+
+    def complete(self, request):
+        if request.provider == "groq":
+            with self._lock:
+                self.groq_calls += 1
+            raise FakeAPIError("Fake service unavailable", status_code=503)
+        return super().complete(request)
+
+
+def test_comparison_falls_back_when_provider_is_down(fake_backend, monkeypatch,
+                                                     sample_product_data, sample_fictional_product):
+    monkeypatch.setitem(LLM_RETRY, "base_delay_seconds", 0.0)
+    monkeypatch.setattr("llm.retry._budgets", {})
+    monkeypatch.setattr("llm.circuit_breaker.CIRCUIT_BREAKER",
+                        dict(enabled=True, failure_rate=0.5, min_calls=3, window=10,
+                             open_seconds=60, half_open_probes=1, probe_successes=1))
+    set_circuit_breakers_enabled(True)
+
+    backend = GroqDownBackend()
+    set_default_backend(backend)
+
+    final_state = build_graph().invoke(
+        AgentState(raw_product_a=sample_product_data, raw_product_b=sample_fictional_product)
+    )
+
+    page = final_state["comparison_page"]["comparison"]
+    assert final_state["schema_validation_errors"] == {}
+    assert all(
+        page[section]["verdict"] == ComparisonAgent.NEUTRAL_VERDICT
+        for section in ComparisonAgent.LLM_FIELDS
+    )
+    assert page["ingredients_comparison"]["GlowBoost Vitamin C Serum"] == ["Vitamin C", "Hyaluronic Acid"]
+
+    # Fallback sections are reported and not recorded for reuse
+    assert sorted(final_state["comparison_fallbacks"]) == sorted(ComparisonAgent.SECTION_FIELDS)
+    assert final_state["comparison_manifest"] == {}
+    assert get_circuit_breaker("groq").stats()["state"] == "open"
+    assert backend.groq_calls < len(ComparisonAgent.SECTION_FIELDS) * LLM_RETRY["max_attempts"]
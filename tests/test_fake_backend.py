@@ -0,0 +1,42 @@
+import pytest
+
+from graph.graph import build_graph
+from graph.state import AgentState
+from llm.backends import LLMRequest
+from llm.fake_backend import FakeAPIError, FakeLLMBackend
+from llm.rate_limiter import is_throttle_error
+
+
+def _request(prompt):
+    return LLMRequest(provider="fake", model="m", prompt=prompt, temperature=0.0)
+
+
+def test_fake_backend_is_deterministic():
+    a = FakeLLMBackend(latency="lognormal", latency_ms=1, seed=7)
+    b = FakeLLMBackend(latency="lognormal", latency_ms=1, seed=7)
+
+    assert a.complete(_request("same prompt")).text == b.complete(_request("same prompt")).text
+
+
+def test_fake_backend_injects_rate_limits():
+    backend = FakeLLMBackend(rate_limit_rate=1.0, retry_after_s=2)
+
+    with pytest.raises(FakeAPIError) as exc_info:
+        backend.complete(_request("p"))
+
+    assert is_throttle_error(exc_info.value)
+    assert exc_info.value.response.headers["retry-after"] == "2"
+
+
+def test_graph_runs_offline_with_fake_backend(fake_backend, sample_product_data, sample_fictional_product):
+    final_state = build_graph().invoke(
+        AgentState(
+            raw_product_a=sample_product_data,
+            raw_product_b=sample_fictional_product,
+            faq_answer_batch_mode="category",
+        )
+    )
+
+    assert final_state["schema_validation_errors"] == {}
+    assert final_state["faq_page"]["total_questions"] == 18
+    assert fake_backend.stats()["calls"] > 0
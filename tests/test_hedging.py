@@ -0,0 +1,118 @@
+import threading
+import time
+
+from llm.backends import LLMResponse
+from llm.comparison_llm import ComparisonClient
+from llm.fake_backend import FakeLLMBackend
+from llm.hedging import Hedger, LatencyTracker
+from llm.llm_client import LLMClient
+from llm.response_cache import ResponseCache
+
+
+class StragglerBackend(FakeLLMBackend):
+    """
+    The first call (or every call to `slow_provider`) takes `slow_s`;
+    everything else answers immediately.
+    """
+
+    def __init__(self, slow_s=0.5, slow_provider=None):
+        super().__init__()
+        self.slow_s = slow_s
+        self.slow_provider = slow_provider
+        self.finished = threading.Event()
+        self.max_tokens_seen = []
+
+    def complete(self, request):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+
+        self.max_tokens_seen.append((request.provider, request.max_tokens))
+        slow = request.provider == self.slow_provider if self.slow_provider else first
+        if slow:
+            time.sleep(self.slow_s)
+            self.finished.set()
+
+        return LLMResponse(
+            text=f"Answered by {request.provider}.",
+            input_tokens=10,
+            output_tokens=5
+        )
+
+
+def _hedger(**kwargs):
+    options = {"initial_delay": 0.05, "max_hedge_ratio": 1.0}
+    options.update(kwargs)
+    return Hedger("anthropic", **options)
+
+
+def test_latency_percentile_sets_the_hedge_delay():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95, min_samples=5) is None
+
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000.0)
+    assert tracker.percentile(95, min_samples=5) == 0.095
+
+    hedger = _hedger(min_samples=5, min_delay=0.2)
+    assert hedger.delay() == 0.05
+    hedger.latency = tracker
+    assert hedger.delay() == 0.2
+
+
+def test_slow_primary_is_hedged_and_loser_is_accounted(fake_backend):
+    backend = StragglerBackend(slow_s=0.5)
+    hedger = _hedger()
+    client = LLMClient(backend=backend, hedger=hedger)
+
+    started = time.monotonic()
+    assert client.generate("p", use_cache=False) == "Answered by anthropic."
+    assert time.monotonic() - started < 0.4
+
+    stats = hedger.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+    assert client.usage_stats()["hedges_won"] == 1
+
+    # The straggler still finishes; its tokens are counted apart from
+    # the logical call, not dropped
+    assert backend.finished.wait(2)
+    time.sleep(0.05)
+    usage = client.usage_stats()
+    assert usage["calls"] == 1
+    assert usage["input_tokens"] == 10 and usage["output_tokens"] == 5
+    assert usage["hedged_calls"] == 1
+    assert usage["hedged_input_tokens"] == 10 and usage["hedged_output_tokens"] == 5
+
+
+def test_spend_cap_limits_hedges(fake_backend):
+    backend = StragglerBackend(slow_s=0.2)
+    hedger = _hedger(max_hedge_ratio=0.0)
+    client = LLMClient(backend=backend, hedger=hedger)
+
+    client.generate("p", use_cache=False)
+
+    assert backend.calls == 1
+    assert hedger.stats()["hedges"] == 0
+    assert hedger.stats()["capped"] == 1
+
+
+def test_cross_provider_hedge_is_not_cached(fake_backend):
+    backend = StragglerBackend(slow_s=0.3, slow_provider="anthropic")
+    hedger = _hedger(cross_provider=True, alternate=ComparisonClient(backend=backend))
+    client = LLMClient(backend=backend, hedger=hedger, cache=ResponseCache(path=None))
+
+    assert client.generate("p") == "Answered by groq."
+    assert client.generate("p") == "Answered by groq."
+    assert client.cache.stats()["hits"] == 0
+
+
+def test_hedge_to_anthropic_gets_an_output_budget(fake_backend):
+    backend = StragglerBackend(slow_s=0.3, slow_provider="groq")
+    alternate = LLMClient(backend=backend, max_tokens=321)
+    hedger = Hedger("groq", initial_delay=0.05, max_hedge_ratio=1.0,
+                    cross_provider=True, alternate=alternate)
+    client = ComparisonClient(backend=backend, hedger=hedger)
+
+    assert client.generate("p", use_cache=False) == "Answered by anthropic."
+    assert ("groq", None) in backend.max_tokens_seen
+    assert ("anthropic", 321) in backend.max_tokens_seen
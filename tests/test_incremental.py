@@ -0,0 +1,30 @@
+from graph.graph import build_graph
+from runner import run_pipeline, write_outputs
+from utils.generation_manifest import load_manifest
+
+
+def test_price_change_regenerates_only_dependent_artifacts(
+    fake_backend, tmp_path, sample_product_data, sample_fictional_product
+):
+    graph = build_graph()
+
+    first = run_pipeline(graph, sample_product_data, sample_fictional_product)
+    write_outputs(first, tmp_path)
+    manifest = load_manifest(tmp_path)
+
+    # Unchanged inputs: everything is reused
+    calls = fake_backend.stats()["calls"]
+    same = run_pipeline(graph, sample_product_data, sample_fictional_product, previous_manifest=manifest)
+    assert fake_backend.stats()["calls"] == calls
+    assert same["faq_page"] == first["faq_page"]
+    assert same["comparison_page"] == first["comparison_page"]
+
+    # Price edit: only price-dependent answers and the summary are regenerated
+    repriced = dict(sample_product_data, price="₹799")
+    second = run_pipeline(graph, repriced, sample_fictional_product, previous_manifest=manifest)
+
+    price_questions = sum(
+        1 for q in second["faq_answers"] if q["category"].lower() in ("pricing", "comparison")
+    )
+    assert 0 < price_questions < len(second["faq_answers"])
+    assert fake_backend.stats()["calls"] == calls + price_questions + 1
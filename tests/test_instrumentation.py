@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from graph.graph import build_graph
+from runner import run_pipeline, write_outputs
+from utils.instrumentation import Tracer
+
+
+def test_nodes_and_llm_calls_are_traced(fake_backend, tmp_path, sample_product_data, sample_fictional_product):
+    tracer = Tracer(trace_memory=True)
+    final_state = run_pipeline(build_graph(), sample_product_data, sample_fictional_product, tracer)
+
+    nodes = {e["name"] for e in tracer.events if e["cat"] == "node"}
+    assert {"parse_products", "faq_branch", "generate_questions", "generate_faq_answers",
+            "generate_comparison", "validate_final_output"} <= nodes
+
+    llm_events = [e for e in tracer.events if e["cat"] == "llm"]
+    assert len(llm_events) == fake_backend.stats()["calls"]
+    assert all(e["output_tokens"] > 0 and "mem_peak_delta_bytes" in e for e in llm_events)
+
+    write_outputs(final_state, tmp_path, tracer)
+
+    trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert len(complete) == len(tracer.events)
+
+    lines = (tmp_path / "trace_events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(tracer.events)
+
+
+def test_span_records_errors():
+    tracer = Tracer()
+
+    with pytest.raises(ValueError):
+        with tracer.span("boom", "node"):
+            raise ValueError("bad input")
+
+    assert tracer.events[0]["error"] == "ValueError: bad input"
+    assert tracer.summary()["node:boom"]["errors"] == 1
@@ -0,0 +1,185 @@
+import random
+
+import pytest
+
+from graph.graph import build_graph
+from graph.state import AgentState
+from llm.backends import LLMResponse, set_default_backend
+from llm.fake_backend import FakeAPIError, FakeLLMBackend
+from llm.llm_client import LLMClient
+from llm.retry import LLM_RETRY, RetryBudget, RetryPolicy, classify_error
+
+
+class FlakyBackend(FakeLLMBackend):
+    """
+    Fails the first `failures` calls with `status_code`, then answers.
+    """
+
+    def __init__(self, failures, status_code=500, headers=None):
+        super().__init__()
+        self.failures = failures
+        self.status_code = status_code
+        self.headers = headers
+
+    def complete(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise FakeAPIError("flaky", status_code=self.status_code, headers=self.headers)
+        return LLMResponse(text="It works as described in the product data.")
+
+
+def _client(backend, policy):
+    return LLMClient(backend=backend, retry_policy=policy)
+
+
+def _policy(sleeps, **kwargs):
+    return RetryPolicy(sleep=sleeps.append, rng=random.Random(0), **kwargs)
+
+
+def test_errors_are_classified(fake_backend):
+    assert classify_error(FakeAPIError("x", status_code=429)) == "throttle"
+    assert classify_error(FakeAPIError("x", status_code=502)) == "transient"
+    assert classify_error(FakeAPIError("x", status_code=401)) == "fatal"
+    assert classify_error(TimeoutError("x")) == "transient"
+    assert classify_error(RuntimeError("x")) == "fatal"
+
+    # Wrapped errors are classified by their cause
+    try:
+        try:
+            raise FakeAPIError("x", status_code=503)
+        except FakeAPIError as e:
+            raise Exception("wrapped") from e
+    except Exception as wrapped:
+        assert classify_error(wrapped) == "throttle"
+
+
+def test_transient_errors_are_retried_with_jittered_backoff(fake_backend):
+    sleeps = []
+    client = _client(FlakyBackend(failures=2), _policy(sleeps, base_delay=1.0))
+
+    assert client.generate("p", use_cache=False)
+    assert client.usage_stats()["retries"] == 2
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+
+def test_retry_after_sets_the_minimum_delay(fake_backend):
+    sleeps = []
+    backend = FlakyBackend(failures=1, status_code=429, headers={"retry-after": "3"})
+    _client(backend, _policy(sleeps, base_delay=0.1)).generate("p", use_cache=False)
+
+    assert sleeps == [3.0]
+
+
+def test_fatal_errors_and_exhausted_attempts_are_raised(fake_backend):
+    sleeps = []
+
+    backend = FlakyBackend(failures=1, status_code=400)
+    with pytest.raises(FakeAPIError):
+        _client(backend, _policy(sleeps)).generate("p", use_cache=False)
+    assert backend.calls == 1 and sleeps == []
+
+    backend = FlakyBackend(failures=10)
+    with pytest.raises(FakeAPIError):
+        _client(backend, _policy(sleeps, max_attempts=3)).generate("p", use_cache=False)
+    assert backend.calls == 3
+
+
+def test_retry_budget_caps_retries_across_calls(fake_backend):
+    sleeps = []
+    budget = RetryBudget(ratio=0.0, max_tokens=1)
+    backend = FlakyBackend(failures=100)
+    client = _client(backend, _policy(sleeps, budget=budget))
+
+    for _ in range(3):
+        with pytest.raises(FakeAPIError):
+            client.generate("p", use_cache=False)
+
+    # One banked retry, then every retry is refused
+    assert backend.calls == 4
+    assert budget.stats()["retries"] == 1
+    assert budget.stats()["denied"] == 3
+
+
+def test_timeouts_are_passed_to_the_backend(fake_backend):
+    backend = FakeLLMBackend(latency_ms=200)
+    client = _client(backend, RetryPolicy(max_attempts=1, timeout=0.01))
+
+    with pytest.raises(TimeoutError):
+        client.generate("p", use_cache=False)
+    assert backend.stats()["timeouts"] == 1
+
+
+class OutageBackend(FakeLLMBackend):
+    """
+    Usage questions fail with HTTP 500 for the first `failures` attempts.
+    """
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.attempts = {}
+
+    def complete(self, request):
+        prompt = request.prompt
+        if "Category:\n                usage" in prompt:
+            self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+            if self.attempts[prompt] <= self.failures:
+                raise FakeAPIError("Fake internal server error", status_code=500)
+        return super().complete(request)
+
+
+def test_failed_questions_are_requeued_at_the_end(fake_backend, monkeypatch,
+                                                   sample_product_data, sample_fictional_product):
+    monkeypatch.setitem(LLM_RETRY, "max_attempts", 2)
+    monkeypatch.setitem(LLM_RETRY, "base_delay_seconds", 0.0)
+    monkeypatch.setattr("llm.retry._budgets", {})
+
+    # Two client attempts fail; the node's requeue gets through
+    backend = OutageBackend(failures=2)
+    set_default_backend(backend)
+
+    final_state = build_graph().invoke(
+        AgentState(raw_product_a=sample_product_data, raw_product_b=sample_fictional_product)
+    )
+
+    assert final_state["faq_answer_errors"] == []
+    assert final_state["faq_page"]["total_questions"] == 18
+    assert sorted(backend.attempts.values()) == [3, 3, 3]
+    assert any("3 re-requested, 0 dropped" in entry for entry in final_state["execution_log"])
+
+
+class RejectingBackend(FakeLLMBackend):
+    """
+    Batched calls answer nothing; single usage questions get HTTP 400.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.attempts = {}
+
+    def complete(self, request):
+        prompt = request.prompt
+        if "Answer EVERY question" in prompt:
+            return LLMResponse(text="[]")
+        if "Category:\n                usage" in prompt:
+            self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+            raise FakeAPIError("Fake bad request", status_code=400)
+        return super().complete(request)
+
+
+def test_fatal_batch_fallback_errors_are_not_requeued(fake_backend, sample_product_data, sample_fictional_product):
+    backend = RejectingBackend()
+    set_default_backend(backend)
+
+    final_state = build_graph().invoke(
+        AgentState(
+            raw_product_a=sample_product_data,
+            raw_product_b=sample_fictional_product,
+            faq_answer_batch_mode="category",
+        )
+    )
+
+    assert sorted(backend.attempts.values()) == [1, 1, 1]
+    assert len(final_state["faq_answer_errors"]) == 3
+    assert any("0 re-requested, 3 dropped" in entry for entry in final_state["execution_log"])
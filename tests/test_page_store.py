@@ -0,0 +1,76 @@
+import zstandard
+
+import batch_runner
+from agents.serialization_agent import SerializationAgent
+from graph.graph import build_graph
+from utils.page_store import PageStore
+
+
+def test_pages_round_trip_across_shards(tmp_path):
+    page = {"page_type": "faq", "questions": [{"question": "Price?", "answer": "₹699"}]}
+
+    with PageStore(tmp_path, max_shard_bytes=200, writer_id="w1") as store:
+        for i in range(20):
+            agent = SerializationAgent(output_dir=tmp_path / "items", page_store=store, page_id=f"sku-{i}")
+            agent.write_faq_page(dict(page, id=i))
+            agent.write_product_page({"id": i})
+
+        # Readable before flush from the writing instance only
+        assert store.get("sku-3", "faq")["id"] == 3
+        with PageStore(tmp_path) as reader:
+            assert ("sku-3", "faq") not in reader
+
+        store.put("sku-3", "faq", {"id": "rewritten"})
+
+    shards = sorted(tmp_path.glob("pages-w1-*.jsonl.zst"))
+    assert len(shards) > 1
+    assert not (tmp_path / "items").exists()
+
+    with PageStore(tmp_path) as reader:
+        assert len(list(reader.keys())) == 40
+        assert reader.get("sku-19", "product_page") == {"id": 19}
+        assert reader.get("sku-3", "faq") == {"id": "rewritten"}
+
+    # Each shard is a plain multi-frame .jsonl.zst stream
+    with shards[0].open("rb") as f:
+        lines = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read().splitlines()
+    assert lines[0].startswith(b'{"page_type":"faq"')
+
+
+def test_unchanged_pages_are_not_appended(tmp_path):
+    with PageStore(tmp_path) as store:
+        assert store.put("sku-1", "faq", {"a": 1}, if_changed=True)
+        store.flush()
+        size = sum(p.stat().st_size for p in tmp_path.glob("*.zst"))
+
+        agent = SerializationAgent(output_dir=tmp_path / "items", page_store=store, page_id="sku-1")
+        agent.write_faq_page({"a": 1})
+        agent.write_product_page({"a": 1})
+
+        assert (agent.pages_written, agent.pages_skipped) == (1, 1)
+        assert not store.put("sku-1", "product_page", {"a": 1}, if_changed=True)
+        assert sum(p.stat().st_size for p in tmp_path.glob("*.zst")) > size
+
+
+def test_batch_item_keeps_its_run_artifacts_in_the_store(
+    fake_backend, monkeypatch, tmp_path, sample_product_data, sample_fictional_product
+):
+    monkeypatch.setattr(batch_runner, "_graph", build_graph())
+    item = {"id": "sku-1", "product": sample_product_data, "competitor": sample_fictional_product}
+    output_dir = tmp_path / "out"
+
+    with PageStore(tmp_path / "pages") as store:
+        first = batch_runner.run_item(item, str(output_dir), page_store=store)
+        store.flush()
+
+        assert first["status"] == "ok" and first["pages_written"] == 3
+        assert store.get("sku-1", "generation_manifest")["faq"]
+        assert store.get("sku-1", "execution_log")["entries"]
+
+        # The stored manifest is reused: no LLM calls, nothing rewritten
+        calls = fake_backend.stats()["calls"]
+        second = batch_runner.run_item(item, str(output_dir), page_store=store)
+        assert fake_backend.stats()["calls"] == calls
+        assert second["pages_skipped"] == 3
+
+    assert not output_dir.exists()
@@ -0,0 +1,86 @@
+from llm.backends import LLMBackend, LLMResponse
+from llm.base_client import BaseLLMClient
+from llm.response_cache import ResponseCache
+
+
+class CountingBackend(LLMBackend):
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, request):
+        self.calls += 1
+        return LLMResponse(text=f"echo: {request.prompt}")
+
+
+class CountingClient(BaseLLMClient):
+    provider = "test"
+
+    def __init__(self, cache):
+        super().__init__(
+            backend=CountingBackend(), model="m", temperature=0.0, max_tokens=10, cache=cache
+        )
+
+    @property
+    def calls(self):
+        return self.backend.calls
+
+
+def test_cache_serves_repeat_prompts_from_memory_then_disk(tmp_path):
+    path = tmp_path / "cache.sqlite"
+
+    client = CountingClient(ResponseCache(path=str(path)))
+    assert client.generate("hello") == "echo: hello"
+    assert client.generate("hello") == "echo: hello"
+    assert client.calls == 1
+    assert client.cache.stats()["memory_hits"] == 1
+    client.cache.close()
+
+    # Fresh process-equivalent: memory tier is empty, disk tier persists
+    reopened = CountingClient(ResponseCache(path=str(path)))
+    assert reopened.generate("hello") == "echo: hello"
+    assert reopened.calls == 0
+    assert reopened.cache.stats()["disk_hits"] == 1
+
+
+def test_cache_key_covers_generation_settings():
+    base = ResponseCache.make_key("anthropic", "m", 0.3, 500, "p")
+
+    assert base != ResponseCache.make_key("groq", "m", 0.3, 500, "p")
+    assert base != ResponseCache.make_key("anthropic", "m", 0.5, 500, "p")
+    assert base != ResponseCache.make_key("anthropic", "m", 0.3, 100, "p")
+    assert base == ResponseCache.make_key("anthropic", "m", 0.3, 500, "p")
+
+
+def test_cache_opt_out_and_ttl(tmp_path):
+    client = CountingClient(
+        ResponseCache(path=str(tmp_path / "c.sqlite"), ttl_seconds=0)
+    )
+
+    client.generate("a", use_cache=False)
+    client.generate("a", use_cache=False)
+    assert client.calls == 2
+    assert client.cache.stats()["misses"] == 0
+
+    # ttl=0 expires entries immediately
+    client.generate("b")
+    client.generate("b")
+    assert client.calls == 4
+
+
+def test_lru_and_disk_eviction(tmp_path):
+    cache = ResponseCache(
+        path=str(tmp_path / "c.sqlite"),
+        memory_entries=2,
+        max_entries=3,
+        ttl_seconds=None
+    )
+
+    for i in range(5):
+        cache.set(f"k{i}", f"v{i}")
+
+    assert cache.stats()["memory_entries"] == 2
+    cache.close()
+
+    reopened = ResponseCache(path=str(tmp_path / "c.sqlite"))
+    assert reopened.get("k0") is None
+    assert reopened.get("k4") == "v4"
@@ -1,3 +1,6 @@
+from collections import Counter
+
+from agents.question_generation_agent import QuestionGenerationAgent
 from graph.graph import build_graph
 from graph.state import AgentState
 
@@ -18,3 +21,46 @@ def test_question_generation_retry_guard(sample_product_data, sample_fictional_p
         "Max question generation retries reached" in entry
         for entry in final_state["execution_log"]
     )
+
+
+def test_retry_stops_when_no_progress_is_possible(fake_backend, sample_product_data, sample_fictional_product):
+    final_state = build_graph().invoke(
+        AgentState(
+            raw_product_a=sample_product_data,
+            raw_product_b=sample_fictional_product,
+            min_required_questions=100,
+        )
+    )
+
+    # Rule-based generation is deterministic and no expansion is configured
+    assert final_state["question_generation_attempts"] == 1
+    assert any("made no progress" in entry for entry in final_state["execution_log"])
+
+
+def test_retry_tops_up_short_categories(fake_backend, sample_product_data, sample_fictional_product):
+    final_state = build_graph().invoke(
+        AgentState(
+            raw_product_a=sample_product_data,
+            raw_product_b=sample_fictional_product,
+            min_required_questions=24,
+            question_expansion_enabled=True,
+        )
+    )
+
+    assert final_state["question_generation_attempts"] == 2
+    assert final_state["question_count"] >= 24
+    assert final_state["faq_page"]["total_questions"] == final_state["question_count"]
+
+    # Every category reaches its share of the minimum (ceil(24 / 6))
+    counts = Counter(q["category"] for q in final_state["generated_questions"])
+    assert set(counts) == set(QuestionGenerationAgent.CATEGORIES)
+    assert all(count >= 4 for count in counts.values())
+
+    # The first count check asked for a retry, the top-up ran, and the
+    # re-check after it passed
+    log = final_state["execution_log"]
+    retried = next(i for i, entry in enumerate(log) if entry.startswith("FAQ count < 15, retrying (attempt 1)"))
+    topped_up = next(i for i, entry in enumerate(log) if entry.startswith("Topped up 6 questions, 24 total (attempt 2)"))
+    validated = next(i for i, entry in enumerate(log) if entry == "FAQ count validated")
+    assert retried < topped_up < validated
+    assert final_state["retry_flags"]["questions"] is False
@@ -0,0 +1,55 @@
+import json
+
+from agents.serialization_agent import BackgroundWriter, SerializationAgent, encode_json
+
+
+PAGE = {"page_type": "faq", "questions": [{"question": "Price?", "answer": "₹699 \"net\""}], "meta": {}}
+
+
+def test_encoding_matches_stdlib_json():
+    assert encode_json(PAGE) == json.dumps(PAGE, indent=2, ensure_ascii=False).encode("utf-8")
+    assert encode_json(PAGE, compact=True) == json.dumps(
+        PAGE, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert json.loads(encode_json({"big": 1 << 70})) == {"big": 1 << 70}
+
+
+def test_pages_are_written_atomically(tmp_path):
+    SerializationAgent(output_dir=tmp_path).write_faq_page(PAGE)
+
+    assert json.loads((tmp_path / "faq.json").read_text(encoding="utf-8")) == PAGE
+    assert [p.name for p in tmp_path.iterdir()] == ["faq.json"]
+
+
+def test_background_writer_flushes_and_reports_errors(tmp_path):
+    with BackgroundWriter(max_pending=1) as writer:
+        agent = SerializationAgent(output_dir=tmp_path, compact=True, writer=writer)
+        agent.write_product_page(PAGE)
+        agent.write_comparison_page(PAGE)
+        writer.submit(tmp_path / "missing" / "page.json", b"{}")
+
+        errors = writer.flush()
+
+        assert [path.name for path, _ in errors] == ["page.json"]
+        assert (tmp_path / "product_page.json").read_bytes() == encode_json(PAGE, compact=True)
+        assert json.loads((tmp_path / "comparison_page.json").read_text(encoding="utf-8")) == PAGE
+        assert writer.flush() == []
+
+
+def test_unchanged_pages_are_not_rewritten(tmp_path):
+    SerializationAgent(output_dir=tmp_path).write_faq_page(PAGE)
+    faq = tmp_path / "faq.json"
+    mtime = faq.stat().st_mtime_ns
+
+    agent = SerializationAgent(output_dir=tmp_path)
+    agent.write_faq_page(PAGE)
+    agent.write_product_page(PAGE)
+    agent.write_comparison_page(dict(PAGE, page_type="comparison"))
+
+    assert (agent.pages_written, agent.pages_skipped) == (2, 1)
+    assert faq.stat().st_mtime_ns == mtime
+
+    # Same content, different encoding: rewritten
+    compact = SerializationAgent(output_dir=tmp_path, compact=True)
+    compact.write_faq_page(PAGE)
+    assert (compact.pages_written, compact.pages_skipped) == (1, 0)
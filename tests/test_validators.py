@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+
+from utils.validators import validate_page, validate_pages
+
+
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / "data" / "output"
+
+
+def test_sample_pages_pass_compiled_contracts():
+    for page_type, filename in [("faq", "faq.json"), ("product", "product_page.json"),
+                                ("comparison", "comparison_page.json")]:
+        raw = (OUTPUT_DIR / filename).read_bytes()
+        assert validate_page(page_type, raw) == []
+        assert validate_page(page_type, json.loads(raw)) == []
+
+
+def test_template_structure_is_enforced_per_page():
+    product = json.loads((OUTPUT_DIR / "product_page.json").read_bytes())
+    missing_price = {"page_type": "product", "content": {k: v for k, v in product["content"].items() if k != "price"}}
+    wrong_type = b'{"page_type": "product", "content": ' + json.dumps(dict(product["content"], skin_type="Oily")).encode() + b"}"
+
+    failures = validate_pages("product", [product, missing_price, wrong_type, {"page_type": "faq"}])
+
+    assert sorted(failures) == [1, 2, 3]
+    assert failures[1][0]["loc"] == ("content", "price")
+    assert failures[2][0]["loc"] == ("content", "skin_type")
+    assert {e["loc"][0] for e in failures[3]} == {"page_type", "content"}
@@ -0,0 +1,330 @@
+"""
+Columnar store for normalized products.
+
+Batch runs build one store from the catalog feed and workers read
+products from it by id, so each worker maps the same compact file
+instead of holding its own copies of the product dicts.
+
+Every string (names, skin types, ingredients, ...) is interned once
+in a shared string pool; columns hold uint32 codes into that pool, so
+repetitive values such as skin_type or ingredients cost 4 bytes per
+use. The file is memory-mapped on open and rows are decoded on demand.
+
+Layout (native byte order, recorded in the header):
+    magic     8 bytes   b"KCATLOG1"
+    size      8 bytes   header length, little-endian
+    header    JSON      {"version", "byteorder", "rows", "sections"}
+    sections  8-byte aligned arrays:
+        strings.offsets  Q  pool offsets (n_strings + 1)
+        strings.data     B  UTF-8 pool
+        id               I  product id codes
+        id.sorted        I  row numbers ordered by id (binary search)
+        <scalar column>  I  one code per row
+        <list column>.offsets  Q  row start in .values (rows + 1)
+        <list column>.values   I  codes
+        price            q  integer price
+"""
+
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import json
+import mmap
+import os
+import sys
+
+
+MAGIC = b"KCATLOG1"
+STORE_VERSION = 1
+
+SCALAR_COLUMNS = ("name", "concentration", "usage", "side_effects")
+LIST_COLUMNS = ("skin_type", "ingredients", "benefits")
+
+_ALIGN = 8
+
+# Prices are stored as signed 64-bit integers ("q")
+PRICE_MIN = -(2 ** 63)
+PRICE_MAX = 2 ** 63 - 1
+
+
+class CatalogStoreWriter:
+    """
+    Accumulates products as typed arrays and writes the store file
+    atomically on close(). Memory use is the arrays plus one copy of
+    each distinct string.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._strings: Dict[str, int] = {}
+        self._ids = array("I")
+        self._id_codes = set()
+        self._scalars = {column: array("I") for column in SCALAR_COLUMNS}
+        self._lists = {column: (array("Q", [0]), array("I")) for column in LIST_COLUMNS}
+        self._prices = array("q")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __enter__(self) -> "CatalogStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    def add(self, product_id: str, product: Dict) -> int:
+        """
+        Appends one normalized product (ParserAgent output) and
+        returns its row number.
+
+        Raises ValueError (before anything is stored) for a duplicate
+        id or a price that does not fit the price column.
+        """
+        price = product["price"]
+        if not PRICE_MIN <= price <= PRICE_MAX:
+            raise ValueError(f"Price out of range for the catalog store: {price}")
+
+        id_code = self._intern(product_id)
+        if id_code in self._id_codes:
+            raise ValueError(f"Duplicate product id: {product_id}")
+
+        row = len(self._ids)
+        codes = [self._intern(product[column]) for column in SCALAR_COLUMNS]
+        values = [[self._intern(v) for v in product[column]] for column in LIST_COLUMNS]
+        self._prices.append(price)
+
+        self._id_codes.add(id_code)
+        self._ids.append(id_code)
+        for column, code in zip(SCALAR_COLUMNS, codes):
+            self._scalars[column].append(code)
+        for column, column_values in zip(LIST_COLUMNS, values):
+            offsets, flat = self._lists[column]
+            flat.extend(column_values)
+            offsets.append(len(flat))
+
+        return row
+
+    def close(self) -> Path:
+        pool = [s.encode("utf-8") for s in self._strings]
+        pool_offsets = array("Q", [0])
+        total = 0
+        for encoded in pool:
+            total += len(encoded)
+            pool_offsets.append(total)
+
+        id_strings = list(self._strings)
+        id_sorted = array("I", sorted(range(len(self._ids)), key=lambda row: id_strings[self._ids[row]]))
+
+        sections = {
+            "strings.offsets": pool_offsets,
+            "strings.data": b"".join(pool),
+            "id": self._ids,
+            "id.sorted": id_sorted,
+            **self._scalars,
+            "price": self._prices,
+        }
+        for column, (offsets, flat) in self._lists.items():
+            sections[f"{column}.offsets"] = offsets
+            sections[f"{column}.values"] = flat
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+
+        with tmp_path.open("wb") as f:
+            f.write(self._encode_header(sections))
+            for data in sections.values():
+                payload = data.tobytes() if isinstance(data, array) else data
+                f.write(payload)
+                f.write(b"\0" * _padding(len(payload)))
+
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def _intern(self, value: str) -> int:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a string, got: {type(value).__name__}")
+        code = self._strings.get(value)
+        if code is None:
+            code = self._strings[value] = len(self._strings)
+        return code
+
+    def _encode_header(self, sections: Dict) -> bytes:
+        layout = {}
+        for name, data in sections.items():
+            typecode = data.typecode if isinstance(data, array) else "B"
+            size = len(data) * (data.itemsize if isinstance(data, array) else 1)
+            layout[name] = [size, typecode]
+
+        # Offsets depend on the header length, so settle it first
+        header_size = 0
+        while True:
+            offset = _aligned(len(MAGIC) + 8 + header_size)
+            sections_meta = {}
+            for name, (size, typecode) in layout.items():
+                sections_meta[name] = [offset, size, typecode]
+                offset += _aligned(size)
+
+            header = json.dumps({
+                "version": STORE_VERSION,
+                "byteorder": sys.byteorder,
+                "rows": len(self._ids),
+                "sections": sections_meta,
+            }).encode("utf-8")
+
+            if len(header) == header_size:
+                break
+            header_size = len(header)
+
+        prefix = MAGIC + len(header).to_bytes(8, "little") + header
+        return prefix + b"\0" * _padding(len(prefix))
+
+
+class CatalogStore:
+    """
+    Read-only, memory-mapped view of a store file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            header = self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+        self.rows = header["rows"]
+        self._views: List[memoryview] = []
+        self._sections = {
+            name: self._view(offset, size, typecode)
+            for name, (offset, size, typecode) in header["sections"].items()
+        }
+        self._decoded: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, product_id: str) -> bool:
+        return self.row_of(product_id) is not None
+
+    def __enter__(self) -> "CatalogStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Views must be released before the map can close
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        self._sections = {}
+        self._mmap.close()
+        self._file.close()
+
+    def get(self, product_id: str) -> Dict:
+        """
+        Returns the normalized product with this id.
+        Raises KeyError if the store does not contain it.
+        """
+        row = self.row_of(product_id)
+        if row is None:
+            raise KeyError(product_id)
+        return self.row(row)
+
+    def row(self, index: int) -> Dict:
+        """
+        Decodes one row into the dict ParserAgent.parse produced.
+        """
+        if not 0 <= index < self.rows:
+            raise IndexError(f"Row {index} out of range (store has {self.rows} rows)")
+
+        sections = self._sections
+        product = {column: self._string(sections[column][index]) for column in SCALAR_COLUMNS}
+        for column in LIST_COLUMNS:
+            offsets = sections[f"{column}.offsets"]
+            values = sections[f"{column}.values"][offsets[index]:offsets[index + 1]]
+            product[column] = [self._string(code) for code in values]
+        product["price"] = sections["price"][index]
+
+        # Key order of ParserAgent._normalize
+        return {key: product[key] for key in (
+            "name", "concentration", "skin_type", "ingredients",
+            "benefits", "usage", "side_effects", "price",
+        )}
+
+    def row_of(self, product_id: str) -> Optional[int]:
+        id_codes = self._sections["id"]
+        order = self._sections["id.sorted"]
+
+        position = bisect_left(order, product_id, key=lambda row: self._string(id_codes[row]))
+        if position < self.rows and self._string(id_codes[order[position]]) == product_id:
+            return order[position]
+        return None
+
+    def product_id(self, index: int) -> str:
+        return self._string(self._sections["id"][index])
+
+    def ids(self) -> Iterator[str]:
+        for code in self._sections["id"]:
+            yield self._string(code)
+
+    def _string(self, code: int) -> str:
+        value = self._decoded.get(code)
+        if value is None:
+            offsets = self._sections["strings.offsets"]
+            value = str(self._sections["strings.data"][offsets[code]:offsets[code + 1]], "utf-8")
+            self._decoded[code] = value
+        return value
+
+    def _read_header(self) -> Dict:
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a catalog store: {self.path}")
+
+        start = len(MAGIC) + 8
+        size = int.from_bytes(self._mmap[len(MAGIC):start], "little")
+        header = json.loads(self._mmap[start:start + size])
+
+        if header.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported catalog store version: {header.get('version')}")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Catalog store was written on a {header.get('byteorder')}-endian machine")
+        return header
+
+    def _view(self, offset: int, size: int, typecode: str) -> memoryview:
+        raw = memoryview(self._mmap)[offset:offset + size]
+        self._views.append(raw)
+        if typecode == "B":
+            return raw
+        view = raw.cast(typecode)
+        self._views.append(view)
+        return view
+
+
+def to_raw_product(product: Dict) -> Dict:
+    """
+    Maps a normalized product back to the input schema, such that
+    ParserAgent().parse(to_raw_product(p)) == p.
+    """
+    return {
+        "product_name": product["name"],
+        "concentration": product["concentration"],
+        "skin_type": list(product["skin_type"]),
+        "key_ingredients": list(product["ingredients"]),
+        "benefits": list(product["benefits"]),
+        "how_to_use": product["usage"],
+        "side_effects": product["side_effects"],
+        "price": product["price"],
+    }
+
+
+def _aligned(n: int) -> int:
+    return n + _padding(n)
+
+
+def _padding(n: int) -> int:
+    return -n % _ALIGN
@@ -0,0 +1,158 @@
+"""
+Streaming catalog readers.
+
+Reads product feeds record by record so memory stays flat regardless
+of feed size (bounded by the largest single record plus one read chunk):
+- NDJSON: one JSON object per line
+- JSON array: a top-level array of objects, split incrementally
+Files ending in ".gz" are decompressed on the fly.
+
+Malformed records never stop the stream: they are yielded as
+CatalogRecord entries with `error` set, so callers can report and skip
+them (see ParserAgent.parse_stream).
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional
+import gzip
+import re
+
+import orjson
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# A complete JSON string, a bracket, or a string cut off by the buffer end
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.DOTALL)
+_QUOTE = ord('"')
+_OPENERS = (ord("{"), ord("["))
+
+
+@dataclass
+class CatalogRecord:
+    index: int                  # 0-based position in the feed
+    data: Optional[Any] = None  # decoded record
+    error: Optional[str] = None
+
+
+def iter_records(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[CatalogRecord]:
+    """
+    Streams records from an NDJSON or JSON-array feed (format is
+    detected from the first non-whitespace byte).
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+
+    with opener(path, "rb") as f:
+        first = _peek_first_byte(f)
+        if first == b"[":
+            yield from iter_json_array(f, chunk_size)
+        else:
+            yield from iter_ndjson(f)
+
+
+def iter_ndjson(f: BinaryIO) -> Iterator[CatalogRecord]:
+    index = 0
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield CatalogRecord(index, data=orjson.loads(line))
+        except orjson.JSONDecodeError as e:
+            yield CatalogRecord(index, error=f"Invalid JSON: {e}")
+
+        index += 1
+
+
+def iter_json_array(f: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[CatalogRecord]:
+    """
+    Splits a top-level JSON array into elements without loading the
+    whole document. One regex pass finds brackets and skips whole
+    strings, so the Python loop runs once per string/bracket rather
+    than once per byte; each element is then decoded by orjson.
+
+    Object and array elements are supported; bare scalars at the top
+    level are skipped.
+    """
+    buf = b""
+    pos = 0            # scan position in buf
+    start = None       # start of the element being read
+    depth = 0
+    index = 0
+    eof = False
+
+    while not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+
+        # Drop everything before the current element (or scan position)
+        keep = start if start is not None else pos
+        buf = buf[keep:] + chunk
+        pos -= keep
+        if start is not None:
+            start = 0
+
+        scanned = len(buf)
+        for match in _TOKEN.finditer(buf, pos):
+            first = buf[match.start()]
+
+            if first == _QUOTE:
+                if match.end() - match.start() == 1:
+                    # String continues past the buffer: rescan after the next read
+                    scanned = match.start()
+                    break
+                continue
+
+            if first in _OPENERS:
+                depth += 1
+                if depth == 2:
+                    start = match.start()
+                continue
+
+            depth -= 1
+            if depth == 1 and start is not None:
+                element = buf[start:match.end()]
+                start = None
+                try:
+                    yield CatalogRecord(index, data=orjson.loads(element))
+                except orjson.JSONDecodeError as e:
+                    yield CatalogRecord(index, error=f"Invalid JSON: {e}")
+                index += 1
+            elif depth <= 0:
+                return
+
+        pos = scanned
+
+    if start is not None or depth > 0:
+        yield CatalogRecord(index, error="Truncated feed: unterminated JSON array")
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    Groups an iterable into lists of at most `size` items, lazily.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _peek_first_byte(f: BinaryIO) -> bytes:
+    """
+    Returns the first non-whitespace byte and rewinds the file.
+    """
+    while True:
+        block = f.read(1024)
+        if not block:
+            f.seek(0)
+            return b""
+        stripped = block.lstrip()
+        if stripped:
+            f.seek(0)
+            return stripped[:1]
@@ -0,0 +1,121 @@
+"""
+Generation manifest for incremental regeneration.
+
+Every LLM-generated artifact (one FAQ answer, one comparison verdict,
+the comparison summary) is stored with a hash of the normalized
+product fields it depends on:
+- FAQ answers: ContentLogicAgent.CATEGORY_FIELDS
+- Comparison sections: ComparisonAgent.SECTION_FIELDS
+
+On the next run, artifacts whose input hash is unchanged are reused
+from the manifest instead of being regenerated.
+
+Layout (generation_manifest.json next to the pages, or the
+"generation_manifest" entry of a page store):
+    {
+      "version": 1,
+      "faq": {"<faq key>": {"input_hash": "...", "answer": "..."}},
+      "comparison": {"<section>": {"input_hash": "...", "value": ...}}
+    }
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import hashlib
+import json
+
+
+MANIFEST_FILENAME = "generation_manifest.json"
+MANIFEST_PAGE = "generation_manifest"
+
+# Bump to invalidate every stored artifact (e.g. after a prompt change)
+MANIFEST_VERSION = 1
+
+
+def content_hash(*parts) -> str:
+    """
+    Stable SHA-256 over JSON-serializable parts.
+    """
+    payload = json.dumps(
+        [MANIFEST_VERSION, *parts],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def field_values(product: Dict, fields: Optional[Iterable[str]]) -> Dict:
+    """
+    The slice of a normalized product an artifact depends on.
+    None means "every field" (used for unknown dependencies).
+    """
+    if fields is None:
+        return dict(product)
+    return {field: product.get(field) for field in fields}
+
+
+def faq_key(category: str, question: str) -> str:
+    return f"{category}\x00{question}"
+
+
+def build_manifest(faq: Dict, comparison: Dict) -> Dict:
+    return {"version": MANIFEST_VERSION, "faq": faq, "comparison": comparison}
+
+
+def load_manifest(output_dir: Path) -> Dict:
+    """
+    Returns the manifest from a previous run, or {} if there is none
+    (or it was written by an incompatible version).
+    """
+    path = Path(output_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    return _checked(manifest)
+
+
+def load_stored_manifest(page_store, page_id: str) -> Dict:
+    """
+    load_manifest for runs whose outputs live in a page store
+    (utils/page_store.py).
+    """
+    try:
+        return _checked(page_store.get(page_id, MANIFEST_PAGE))
+    except KeyError:
+        return {}
+
+
+def write_manifest(output_dir: Path, faq: Dict, comparison: Dict) -> Path:
+    """
+    Writes generation_manifest.json, leaving the file untouched when
+    its content has not changed.
+    """
+    path = Path(output_dir) / MANIFEST_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    text = json.dumps(build_manifest(faq, comparison), ensure_ascii=False, indent=2)
+
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return path
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    with path.open("w", encoding="utf-8") as f:
+        f.write(text)
+
+    return path
+
+
+def _checked(manifest) -> Dict:
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
@@ -0,0 +1,270 @@
+"""
+Structured run instrumentation.
+
+Every graph node (see graph/graph.py) and every LLM call
+(see llm/base_client.py) is recorded as a span while a Tracer is
+active. A span carries:
+- Wall time and CPU time of the calling thread
+- Memory growth and peak allocation (tracemalloc, optional)
+- Token usage, rate-limit wait and retry counts (LLM calls)
+- Attempt number (nodes re-entered by a retry edge)
+- The error, if the span raised
+
+Exports:
+- JSON lines: one event per span, for ad-hoc analysis
+- Chrome trace JSON: open in chrome://tracing or ui.perfetto.dev
+
+The active tracer is process-wide, like the default LLM backend.
+Concurrent graph runs in one process therefore share a trace;
+batch workers (separate processes) each have their own.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+
+class Span:
+    """
+    One timed operation. Attributes set while the span is open are
+    exported with it.
+    """
+
+    def __init__(self, name: str, category: str, attrs: Dict):
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Collects spans from any thread. Thread-safe.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Parameters
+        ----------
+        trace_memory : bool
+            Record memory deltas with tracemalloc. Slows allocation-heavy
+            code noticeably, so it is off by default. Concurrent spans
+            share one peak counter, so peaks of overlapping spans are
+            upper bounds.
+        """
+        self.trace_memory = trace_memory
+        self.events: List[Dict] = []
+
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._attempts: Dict[str, int] = defaultdict(int)
+        self._open_spans = 0
+        self._started_tracemalloc = False
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def span(self, name: str, category: str, **attrs) -> Iterator[Span]:
+        span = Span(name, category, attrs)
+
+        with self._lock:
+            if category == "node":
+                self._attempts[name] += 1
+                span.attrs["attempt"] = self._attempts[name]
+            if self.trace_memory and self._open_spans == 0:
+                tracemalloc.reset_peak()
+            self._open_spans += 1
+
+        mem_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall_end = time.perf_counter()
+            cpu_end = time.thread_time()
+
+            event = {
+                "name": name,
+                "cat": category,
+                "start_ms": round((wall_start - self._origin) * 1000.0, 3),
+                "wall_ms": round((wall_end - wall_start) * 1000.0, 3),
+                "cpu_ms": round((cpu_end - cpu_start) * 1000.0, 3),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "thread": threading.current_thread().name,
+            }
+
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                event["mem_delta_bytes"] = current - mem_start
+                event["mem_peak_delta_bytes"] = max(0, peak - mem_start)
+
+            event.update(span.attrs)
+
+            with self._lock:
+                self._open_spans -= 1
+                self.events.append(event)
+
+    def close(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # Reporting / Export
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Per-span-name totals: count, wall/cpu ms, tokens.
+        """
+        totals: Dict[str, Dict] = {}
+
+        with self._lock:
+            events = list(self.events)
+
+        for event in events:
+            key = f"{event['cat']}:{event['name']}"
+            entry = totals.setdefault(key, {
+                "count": 0, "wall_ms": 0.0, "cpu_ms": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "errors": 0,
+            })
+            entry["count"] += 1
+            entry["wall_ms"] += event["wall_ms"]
+            entry["cpu_ms"] += event["cpu_ms"]
+            entry["input_tokens"] += event.get("input_tokens", 0)
+            entry["output_tokens"] += event.get("output_tokens", 0)
+            entry["errors"] += 1 if "error" in event else 0
+
+        return totals
+
+    def write_jsonl(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["start_ms"])
+
+        with path.open("w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+        return path
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """
+        Writes chrome_trace() as JSON.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+        return path
+
+    def chrome_trace(self) -> Dict:
+        """
+        Complete ("X") events in the Trace Event Format, one track per thread.
+        """
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["start_ms"])
+
+        reserved = {"name", "cat", "start_ms", "wall_ms", "pid", "tid", "thread"}
+        trace_events = []
+        threads = {}
+
+        for event in events:
+            threads[(event["pid"], event["tid"])] = event["thread"]
+            trace_events.append({
+                "name": event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": round(event["start_ms"] * 1000.0, 1),
+                "dur": round(event["wall_ms"] * 1000.0, 1),
+                "pid": event["pid"],
+                "tid": event["tid"],
+                "args": {k: v for k, v in event.items() if k not in reserved},
+            })
+
+        for (pid, tid), thread_name in threads.items():
+            trace_events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": thread_name},
+            })
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+# ----------------------------------------------------------------------
+# Process-wide active tracer
+# ----------------------------------------------------------------------
+
+_active_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _active_tracer
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """
+    Makes `tracer` the active tracer for the duration of the block.
+    """
+    global _active_tracer
+
+    previous = _active_tracer
+    _active_tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _active_tracer = previous
+        tracer.close()
+
+
+@contextmanager
+def span(name: str, category: str, **attrs) -> Iterator[Span]:
+    """
+    Records a span on the active tracer; a cheap no-op when none is active.
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        yield Span(name, category, attrs)
+        return
+
+    with tracer.span(name, category, **attrs) as active:
+        yield active
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """
+    Wraps a graph node so each execution is recorded as a "node" span.
+    """
+
+    @functools.wraps(node)
+    def instrumented(state):
+        with span(name, "node"):
+            return node(state)
+
+    return instrumented
@@ -0,0 +1,206 @@
+"""
+Sharded, zstd-compressed page store.
+
+An alternative to one JSON file per page for catalog-scale runs:
+pages are appended to a handful of shard files instead of creating
+millions of small files.
+
+Each page is one compact JSON line compressed as an independent zstd
+frame, and frames are appended back to back. A shard is therefore a
+valid .jsonl.zst stream (`zstd -dc pages-*.jsonl.zst` prints every
+page), while a single page can be read by decompressing just its frame.
+
+Index (index.sqlite, WAL): (product_id, page_type) -> (shard, offset,
+length). Re-writing a page appends a new frame and repoints the index;
+the old frame is left in place as dead bytes. put(..., if_changed=True)
+skips pages whose frame is byte-identical to the indexed one (zstd
+output is deterministic for the same input and level).
+
+Every writer process appends to its own shards
+(pages-<writer>-<seq>.jsonl.zst), rolling over to a new shard at
+`max_shard_bytes`; the index is shared. Index rows are committed on
+flush(), after their frames are on disk, so a crash can leave
+unindexed bytes but never an index entry pointing at a missing frame.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+import os
+import re
+import sqlite3
+import threading
+
+import orjson
+import zstandard
+
+
+INDEX_FILENAME = "index.sqlite"
+DEFAULT_MAX_SHARD_BYTES = 64 * 1024 * 1024
+DEFAULT_LEVEL = 3
+
+_SHARD_PATTERN = re.compile(r"pages-(?P<writer>.+)-(?P<seq>\d{5})\.jsonl\.zst$")
+
+
+class PageStore:
+    """
+    Thread-safe within a process; one instance per process.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_shard_bytes: int = DEFAULT_MAX_SHARD_BYTES,
+        level: int = DEFAULT_LEVEL,
+        writer_id: Optional[str] = None
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_shard_bytes = max_shard_bytes
+        self.writer_id = writer_id or str(os.getpid())
+
+        self._compressor = zstandard.ZstdCompressor(level=level, write_content_size=True)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.directory / INDEX_FILENAME), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                product_id TEXT NOT NULL,
+                page_type  TEXT NOT NULL,
+                shard      TEXT NOT NULL,
+                offset     INTEGER NOT NULL,
+                length     INTEGER NOT NULL,
+                PRIMARY KEY (product_id, page_type)
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._shard = None          # open shard file (unbuffered append)
+        self._shard_name = None
+        self._shard_size = 0
+        self._pending = []          # index rows awaiting flush()
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def put(self, product_id: str, page_type: str, page: Dict, if_changed: bool = False) -> bool:
+        """
+        Appends one page and returns True, or returns False when
+        `if_changed` is set and the stored page is identical. A new page
+        is readable by get() from this instance immediately, and by
+        other processes after flush().
+        """
+        frame = self._compressor.compress(orjson.dumps(page, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+
+        if if_changed:
+            location = self._locate(product_id, page_type)
+            if location is not None and location[2] == len(frame) and self._read_frame(location) == frame:
+                return False
+
+        with self._lock:
+            if self._shard is None or self._shard_size >= self.max_shard_bytes:
+                self._open_next_shard()
+
+            offset = self._shard_size
+            self._shard.write(frame)
+            self._shard_size += len(frame)
+            self._pending.append((product_id, page_type, self._shard_name, offset, len(frame)))
+        return True
+
+    def flush(self) -> None:
+        """
+        Syncs shard data and commits pending index rows.
+        """
+        with self._lock:
+            if self._shard is not None:
+                os.fsync(self._shard.fileno())
+            if self._pending:
+                self._conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)", self._pending)
+                self._conn.commit()
+                self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._shard is not None:
+                self._shard.close()
+                self._shard = None
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, product_id: str, page_type: str) -> Dict:
+        """
+        Reads one page, decompressing only its frame.
+        Raises KeyError if it was never written.
+        """
+        location = self._locate(product_id, page_type)
+        if location is None:
+            raise KeyError((product_id, page_type))
+
+        return orjson.loads(self._decompressor.decompress(self._read_frame(location)))
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return self._locate(*key) is not None
+
+    def keys(self) -> Iterator[Tuple[str, str]]:
+        """
+        (product_id, page_type) for every page. Flushes first.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT product_id, page_type FROM pages ORDER BY product_id, page_type"
+            ).fetchall()
+        yield from rows
+
+    def _locate(self, product_id: str, page_type: str) -> Optional[Tuple[str, int, int]]:
+        with self._lock:
+            for pending in reversed(self._pending):
+                if pending[0] == product_id and pending[1] == page_type:
+                    return pending[2:]
+
+            return self._conn.execute(
+                "SELECT shard, offset, length FROM pages WHERE product_id = ? AND page_type = ?",
+                (product_id, page_type)
+            ).fetchone()
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _read_frame(self, location: Tuple[str, int, int]) -> bytes:
+        shard, offset, length = location
+        with (self.directory / shard).open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def _open_next_shard(self) -> None:
+        # Caller holds the lock; never append to a shard from an earlier run
+        if self._shard is not None:
+            self._shard.close()
+
+        seq = 1 + max(
+            (
+                int(match["seq"])
+                for match in map(_SHARD_PATTERN.match, os.listdir(self.directory))
+                if match and match["writer"] == self.writer_id
+            ),
+            default=-1,
+        )
+        self._shard_name = f"pages-{self.writer_id}-{seq:05d}.jsonl.zst"
+        self._shard = (self.directory / self._shard_name).open("ab", buffering=0)
+        self._shard_size = 0
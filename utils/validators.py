@@ -1,7 +1,147 @@
 """
 Validation helpers.
 
-Validation is currently handled inside
+Record-level validation is handled inside
 ParserAgent and QuestionGenerationAgent.
-This module is reserved for shared validators.
-"""
\ No newline at end of file
+
+Page validation combines two contracts per page type:
+- the pydantic page schema (schemas/*.py)
+- the structural template (templates/*_template.json): required keys,
+  nested objects and JSON types
+
+Both are compiled once, at import, into a single pydantic model per
+page (the schema class, extended with the template's nested fields)
+wrapped in a TypeAdapter. Validation is then one pydantic-core pass,
+either over a dict or directly over JSON bytes, with no per-call
+model building.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import json
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError, create_model
+
+from schemas.comparison_schema import ComparisonPageSchema
+from schemas.faq_schema import FAQPageSchema
+from schemas.product_schema import ProductPageSchema
+
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+# page_type -> (schema, template file)
+PAGE_CONTRACTS = {
+    "faq": (FAQPageSchema, "faq_template.json"),
+    "product": (ProductPageSchema, "product_page_template.json"),
+    "comparison": (ComparisonPageSchema, "comparison_page_template.json"),
+}
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+}
+
+
+# ----------------------------------------------------------------------
+# Template compilation
+# ----------------------------------------------------------------------
+
+def _template_type(name: str, spec: Dict) -> Any:
+    """
+    Python / pydantic type for one template node.
+    """
+    kind = spec.get("type")
+
+    if kind == "object":
+        if not spec.get("properties") and not spec.get("required"):
+            return Dict[str, Any]
+        return _template_model(name, spec)
+
+    if kind == "array":
+        return List[_template_type(f"{name}Item", spec.get("items", {}))]
+
+    return _JSON_TYPES.get(kind, Any)
+
+
+def _template_fields(name: str, spec: Dict) -> Dict:
+    properties = spec.get("properties", {})
+    required = spec.get("required", [])
+
+    fields = {}
+    for key in dict.fromkeys([*required, *properties]):
+        field_type = _template_type(f"{name}_{key}", properties.get(key, {}))
+        fields[key] = (field_type, ...) if key in required else (Optional[field_type], None)
+    return fields
+
+
+def _template_model(name: str, spec: Dict) -> type:
+    # Templates constrain what must be present, not what may be
+    return create_model(name, __config__=ConfigDict(extra="allow"), **_template_fields(name, spec))
+
+
+def _is_untyped(annotation) -> bool:
+    return annotation in (Dict, dict, Any) or getattr(annotation, "__origin__", None) is dict
+
+
+def compile_page_model(schema: type, template: Dict) -> type:
+    """
+    Extends a page schema with its template: fields the schema leaves
+    untyped (Dict / Any) or does not declare at all take the template's
+    structure; fields the schema already types are kept as they are.
+    """
+    overrides = {
+        key: field
+        for key, field in _template_fields(schema.__name__, template).items()
+        if key not in schema.model_fields or _is_untyped(schema.model_fields[key].annotation)
+    }
+    return create_model(f"{schema.__name__}Contract", __base__=schema, **overrides)
+
+
+def _compile_adapters() -> Dict[str, TypeAdapter]:
+    adapters = {}
+    for page_type, (schema, template_file) in PAGE_CONTRACTS.items():
+        template = json.loads((TEMPLATES_DIR / template_file).read_text(encoding="utf-8"))
+        adapters[page_type] = TypeAdapter(compile_page_model(schema, template))
+    return adapters
+
+
+PAGE_ADAPTERS: Dict[str, TypeAdapter] = _compile_adapters()
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+
+def validate_page(page_type: str, page: Union[Dict, bytes, str]) -> List[Dict]:
+    """
+    Validates one page against its compiled contract and returns the
+    pydantic error list (empty when valid). `page` may be a dict or the
+    serialized JSON (bytes / str), which is validated without decoding
+    it into Python objects first.
+    """
+    adapter = PAGE_ADAPTERS[page_type]
+
+    try:
+        if isinstance(page, (bytes, bytearray, str)):
+            adapter.validate_json(page)
+        else:
+            adapter.validate_python(page)
+    except ValidationError as e:
+        return e.errors(include_url=False)
+
+    return []
+
+
+def validate_pages(page_type: str, pages: Iterable[Union[Dict, bytes, str]]) -> Dict[int, List[Dict]]:
+    """
+    Validates many pages of one type. Returns {position: errors}
+    for the pages that failed.
+    """
+    failures = {}
+    for position, page in enumerate(pages):
+        errors = validate_page(page_type, page)
+        if errors:
+            failures[position] = errors
+    return failures